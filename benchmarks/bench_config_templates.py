@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Construction throughput of config helper objects and of template copies (compiled factory vs deepcopy).
+
+    python benchmarks/bench_config_templates.py --count 50000
+"""
+
+import time
+import argparse
+from copy import deepcopy
+from ll_sdk.utils.config_api_helper.bulk_builder import BulkConfigBuilder
+from ll_sdk.utils.config_api_helper.cert import SSLCertObj
+from ll_sdk.utils.config_api_helper.deliver import DeliverServiceInstanceObj
+from ll_sdk.utils.config_api_helper.httpcs import HttpCsServiceInstanceObj
+from ll_sdk.utils.config_api_helper.templates.httpcs_template import (_http_cs_service_instance_template,
+                                                                      _new_http_cs_service_instance)
+
+
+def build_delivery(idx):
+    config = DeliverServiceInstanceObj()
+    config.generate_default('shortname', f'www{idx}.example.com', 'origin.example.com', 'LLNW-Generic',
+                            ['https', 'http'], ['https', 'http'])
+    config.add_option('edge_cache_ttl', ['3600'])
+    return config
+
+
+def build_httpcs(idx):
+    config = HttpCsServiceInstanceObj()
+    config.generate_default('shortname', ['hls', 'dash'], f'www{idx}.example.com', 'origin.example.com',
+                            'LLNW-Generic', 'https', 'https')
+    return config
+
+
+def build_cert(idx):
+    config = SSLCertObj()
+    config.generate_default('shortname', 'CERT', 'KEY', cert_name=f'cert{idx}')
+    return config
+
+
+_builder = BulkConfigBuilder('shortname', profile_name='LLNW-Generic', published_protocol='https|http',
+                             source_protocol='https|http', options='edge_cache_ttl=3600')
+
+
+def build_delivery_row(idx):
+    return _builder.build_row({'published_host': f'www{idx}.example.com', 'source_host': 'origin.example.com'})
+
+
+def measure(name, func, count):
+    started = time.perf_counter()
+    for idx in range(count):
+        func(idx)
+    elapsed = time.perf_counter() - started
+    print(f'{name:<36} {count / elapsed:>10.0f} objects/s')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args()
+
+    measure('httpcs template deepcopy', lambda idx: deepcopy(_http_cs_service_instance_template), args.count)
+    measure('httpcs template compiled factory', lambda idx: _new_http_cs_service_instance(), args.count)
+    measure('DeliverServiceInstanceObj', build_delivery, args.count)
+    measure('BulkConfigBuilder delivery row', build_delivery_row, args.count)
+    measure('HttpCsServiceInstanceObj (2 formats)', build_httpcs, args.count)
+    measure('SSLCertObj', build_cert, args.count)
+
+
+if __name__ == '__main__':
+    main()
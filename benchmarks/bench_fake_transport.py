@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Throughput and tail latency of ConfigApiClient calls on top of in-memory FakeTransport.
+
+    python benchmarks/bench_fake_transport.py --threads 16 --requests 2000 --median 0.02
+"""
+
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes, lognormal_latency
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--median', type=float, default=0.02, help='median latency, seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--payload-size', type=int, default=None)
+    args = parser.parse_args()
+
+    transport = FakeTransport(routes=config_api_routes(payload_size=args.payload_size),
+                              latency=lognormal_latency(args.median), error_rate=args.error_rate, seed=42)
+    client = ConfigApiClient('apis.example.com', 'user', 'ab12', transport=transport)
+
+    def call(_):
+        started = time.perf_counter()
+        client.get_status()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as pool:
+        latencies = sorted(pool.map(call, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    def percentile(p):
+        return latencies[max(int(round(p / 100.0 * len(latencies))) - 1, 0)] * 1000
+
+    print(f'{args.requests} requests, {args.threads} threads: {args.requests / elapsed:.0f} req/s, '
+          f'p50 {percentile(50):.1f}ms p95 {percentile(95):.1f}ms p99 {percentile(99):.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,11 +4,29 @@
 __all__ = ['BaseRestAuthClient', 'BaseRestReportingClient']
 __docformat__ = 'restructuredtext'
 
+import re
 import time
 import hmac
 import hashlib
 import logging
 import requests
+from ll_sdk.utils.client_helper.circuit_breaker import CircuitBreaker, CircuitBreakerOpenException
+from ll_sdk.utils.client_helper.metrics import MetricsRegistry
+from ll_sdk.utils.client_helper.bulk import bulk_map
+from ll_sdk.utils.client_helper.transport import RequestsTransport
+
+# Literal path segments used by Limelight public APIs, any other segment is a path parameter
+_STATIC_SEGMENTS = frozenset([
+    'blocks', 'bytesPerRequest', 'cachecodes', 'check', 'compression-type', 'config', 'configoption',
+    'continents', 'countries', 'customerCertificate', 'delivery', 'directorpolicy', 'dns', 'edgerules',
+    'epdns', 'failover', 'field', 'fileTypes', 'geo', 'health', 'healthcheck', 'httpcs', 'inheritance',
+    'ipaclist', 'job', 'lds', 'live', 'livestats', 'metadata', 'originFileErrors', 'originMissingFiles',
+    'overview', 'policies', 'protocols', 'publish', 'realtimestreaming', 'recording', 'referrerURLs',
+    'requestresponsetype', 'resource', 'retentions', 'rollbackTo', 'rule', 'schedules', 'search',
+    'searchAuto', 'services', 'shortname', 'slots', 'states', 'status', 'statuscodes', 'storage',
+    'storage-location', 'streams', 'svcProf', 'svcinst', 'svcprof', 'traffic', 'urls', 'userAgents',
+    'utils', 'validate', 'versions', 'webrtc', 'withdraw', 'zone'])
+_NAMED_PARAMETERS = {'shortname': '{shortname}', 'zone': '{zone}', 'svcProf': '{profile}'}
 
 
 def get_timestamp():
@@ -40,6 +58,48 @@ def build_base_url(hostname, context="/", port=80, scheme="http"):
                                       None, None, None))
 
 
+def endpoint_template(request_path):
+    """
+    Collapse request path into endpoint template with bounded cardinality,
+    e.g. svcinst/delivery/shortname/test/searchAuto -> svcinst/delivery/shortname/{shortname}/searchAuto
+    """
+    segments = re.split(r'/+', request_path.split('?', 1)[0].strip('/'))
+    template = []
+    previous = None
+    for segment in segments:
+        if segment in _STATIC_SEGMENTS:
+            template.append(segment)
+        else:
+            template.append(_NAMED_PARAMETERS.get(previous, '{id}'))
+        previous = segment
+    return '/'.join(template)
+
+
+def _body_size(data):
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode('utf-8'))
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    return 0
+
+
+def _shortname_from_url(url):
+    segments = url.split('?', 1)[0].split('/')
+    for previous, segment in zip(segments, segments[1:]):
+        if previous == 'shortname':
+            return segment
+    return ''
+
+
+def _response_size(resp):
+    content_length = resp.headers.get('Content-Length')
+    if content_length is not None and content_length.isdigit():
+        return int(content_length)
+    return len(resp.content or b'')
+
+
 class LlnwUserAuth(requests.auth.AuthBase):
     """
     Basic Limelight Auth class for HMAC
@@ -67,39 +127,135 @@ class LlnwUserAuth(requests.auth.AuthBase):
 class BaseRestAuthClient(object):
     """
     Base rest client for Limelight Network public services
+
+        :param circuit_breaker: (optional) CircuitBreaker shared by all endpoints of the client,
+                                True creates one with default thresholds.
+        :param transport: (optional) BaseTransport implementation used to send requests.
+                          Default RequestsTransport based on requests.Session
+        :param metrics: (optional) Default True. Collect per-endpoint request metrics, see metrics().
+                        MetricsRegistry instance can be passed to share metrics between clients.
+        :param tracer: (optional) BaseTracer implementation (e.g. OpenTelemetryTracer) opening span per API call.
+                       Default no tracing.
+        :param rate_limiter: (optional) RateLimiter acquired before every request of the client.
     """
     HEADER_PRINCIPAL = LlnwUserAuth.HEADER_PRINCIPAL
     HEADER_TOKEN = LlnwUserAuth.HEADER_TOKEN
     HEADER_TIMESTAMP = LlnwUserAuth.HEADER_TIMESTAMP
 
-    def __init__(self, hostname, context, username, api_shared_key, schema, port, default_headers=None):
+    def __init__(self, hostname, context, username, api_shared_key, schema, port, default_headers=None,
+                 circuit_breaker=None, transport=None, metrics=True,
+                 tracer=None, rate_limiter=None):
         self.username = username
         self.api_shared_key = api_shared_key
         self.logger = logging.getLogger('ll_sdk.' + self.__class__.__name__)
         self.base = build_base_url(hostname, context, port, schema)
         self.auth = LlnwUserAuth(self.username, self.api_shared_key)
         self.default_headers = default_headers or {}
-        self._session = requests.Session()
+        self.circuit_breaker = CircuitBreaker() if circuit_breaker is True else circuit_breaker
+        self.transport = transport or RequestsTransport()
+        if metrics is True:
+            metrics = MetricsRegistry(labels={'client': self.__class__.__name__})
+        self._metrics = metrics or None
+        self.tracer = tracer
+        self.rate_limiter = rate_limiter
 
     def __del__(self):
-        self._session.close()
-
-    def _make_request(self, method, url, *, timeout=300, **kwargs):
+        self.transport.close()
+
+    def circuit_breaker_state(self):
+        """
+        Circuit breaker state per endpoint template, empty if circuit breaker is not configured
+        """
+        return self.circuit_breaker.snapshot() if self.circuit_breaker is not None else {}
+
+    def metrics(self):
+        """
+        Snapshot of request count, status classes, bytes in/out and latency percentiles per endpoint template.
+        Use metrics().to_prometheus() for Prometheus / OpenMetrics text export.
+        """
+        if self._metrics is None:
+            return MetricsRegistry().snapshot()
+        return self._metrics.snapshot()
+
+    def _make_request(self, method, url, *, timeout=300, endpoint=None, attempt=0, **kwargs):
         req_headers = self.default_headers.copy()
         headers = kwargs.pop('headers', None)
         if headers:
             req_headers.update(headers)
         kwargs.setdefault('auth', self.auth)
+        if endpoint is None:
+            endpoint = endpoint_template(url[len(self.base):] if url.startswith(self.base) else url)
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug(f"Sending {method} request to the {url}\n"
+                              f"Parameters: {kwargs.get('params', '')}\n"
+                              f"Headers: {req_headers}\n"
+                              f"Body: {kwargs.get('data', '')}")
+        if self.tracer is None:
+            resp = self._send(method, url, endpoint, req_headers, timeout, kwargs)
+        else:
+            attributes = {'llnw.endpoint': endpoint,
+                          'llnw.shortname': _shortname_from_url(url),
+                          'llnw.retry_attempt': attempt,
+                          'http.method': method,
+                          'http.url': url,
+                          'http.request_content_length': _body_size(kwargs.get('data'))}
+            with self.tracer.start_span(f'{method} {endpoint}', attributes) as span:
+                self.tracer.inject(req_headers)
+                resp = self._send(method, url, endpoint, req_headers, timeout, kwargs)
+                span.set_attribute('http.status_code', resp.status_code)
+        if debug:
+            self.logger.debug(f"Getting response with URL: {resp.url}\n"
+                              f"Code: {resp.status_code}\nHeaders: {resp.headers}\nBody: {resp.text}")
+        return resp
 
-        self.logger.debug(f"Sending {method} request to the {url}\n"
-                          f"Parameters: {kwargs.get('params', '')}\n"
-                          f"Headers: {req_headers}\n"
-                          f"Body: {kwargs.get('data', '')}")
-        resp = self._session.request(method, url, headers=req_headers, timeout=timeout, **kwargs)
-        self.logger.debug(f"Getting response with URL: {resp.url}\n"
-                          f"Code: {resp.status_code}\nHeaders: {resp.headers}\nBody: {resp.text}")
+    def _send(self, method, url, endpoint, headers, timeout, kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        circuit = self.circuit_breaker.circuit(endpoint) if self.circuit_breaker is not None else None
+        if circuit is not None:
+            try:
+                circuit.before_call()
+            except CircuitBreakerOpenException:
+                if self._metrics is not None:
+                    self._metrics.record(method, endpoint, 'rejected')
+                raise
+        started = time.monotonic()
+        try:
+            resp = self.transport.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except Exception:
+            elapsed = time.monotonic() - started
+            if circuit is not None:
+                circuit.record(False, elapsed)
+            if self._metrics is not None:
+                self._metrics.record(method, endpoint, 'error', _body_size(kwargs.get('data')), 0, elapsed)
+            raise
+        elapsed = time.monotonic() - started
+        if circuit is not None:
+            circuit.record(not self.circuit_breaker.is_failure(resp.status_code), elapsed)
+        if self._metrics is not None:
+            self._metrics.record(method, endpoint, resp.status_code, _body_size(kwargs.get('data')),
+                                 _response_size(resp), elapsed)
         return resp
 
+    def map(self, method, items, concurrency=8, ordered=True):
+        """
+        Call client method for every item concurrently, e.g.
+        client.map('get_delivery_service_instance', [{'uuid': uuid} for uuid in uuids], concurrency=16)
+
+        Yields BulkResult(index, item, result, error) per item in input order (or as completed),
+        reads items lazily with bounded amount of calls in flight and respects configured rate_limiter.
+
+            :param method: method name or callable
+            :param items: iterable of kwargs dicts, args tuples or single arguments
+            :param concurrency: (optional) Default 8. int
+            :param ordered: (optional) Default True. bool
+        """
+        func = getattr(self, method) if isinstance(method, str) else method
+        self.transport.ensure_concurrency(concurrency)
+        return bulk_map(func, items, concurrency=concurrency, ordered=ordered)
+
     def _request(self, method, request_path, **kwargs):
         self.logger.debug(f"Performing request with User = {self.username}")
         headers = kwargs['headers'] or {}
@@ -109,6 +265,7 @@ class BaseRestAuthClient(object):
             headers['content-type'] = 'application/json'
         full_url = f"{self.base}/{request_path}"
         kwargs['headers'] = headers
+        kwargs.setdefault('endpoint', endpoint_template(request_path))
 
         resp = self._make_request(method, full_url, **kwargs)
         return resp
@@ -2,28 +2,82 @@
 # -*- coding: utf-8 -*-
 
 import json
+import math
+from contextlib import closing
 from urllib.parse import parse_qs
 from ll_sdk.base_client import BaseRestAuthClient
 
-__all__ = ['ConfigApiClient']
+__all__ = ['ConfigApiClient', 'ConfigApiBaseException']
 __docformat__ = 'restructuredtext'
 
 
+_PAGE_ITEMS_KEYS = ('content', 'items', 'results', 'data', 'list')
+_TOTAL_PAGES_KEYS = ('totalPages', 'total_pages', 'pageCount')
+_TOTAL_ITEMS_KEYS = ('totalElements', 'totalCount', 'total', 'count')
+_SERVER_ONLY_FIELDS = ('revision', 'shortname', 'status', 'uuid')
+
+
+def _page_items(payload):
+    """
+    Items of a single page of list/search response
+    """
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in _PAGE_ITEMS_KEYS:
+            if isinstance(payload.get(key), list):
+                return payload[key]
+    return []
+
+
+def _clone_config(parent, published_host, source_host):
+    """
+    Config of a new service instance inheriting parent (json of get_*_service_instance) with new hostnames.
+    Only the modified levels are copied, the rest of structure is shared with parent.
+    """
+    config = {key: value for key, value in parent.items() if key not in _SERVER_ONLY_FIELDS}
+    config['body'] = dict(config['body'])
+    if 'httpcsSvcInstance' in config['body']:
+        service = config['body']['httpcsSvcInstance'] = dict(config['body']['httpcsSvcInstance'])
+    else:
+        service = config['body']
+    service['sourceHostname'] = source_host
+    service['publishedHostname'] = published_host
+    return config
+
+
+def _page_count(payload, size):
+    """
+    Total amount of pages if response reveals it, otherwise None
+    """
+    if not isinstance(payload, dict):
+        return None
+    for key in _TOTAL_PAGES_KEYS:
+        if isinstance(payload.get(key), int):
+            return payload[key]
+    for key in _TOTAL_ITEMS_KEYS:
+        if isinstance(payload.get(key), int):
+            return int(math.ceil(payload[key] / float(size)))
+    return None
+
+
 class ConfigApiClient(BaseRestAuthClient):
     """
     Rest client for Limelight Public config-api
     """
 
+    DEFAULT_PAGE_SIZE = 100
+
     def __init__(self, hostname, username, api_shared_key, schema=None, port=None, context=None,
-                 default_headers=None, timeout=None):
+                 default_headers=None, timeout=None, **kwargs):
         context = context or 'config-api/v1'
         schema = schema or 'https'
         port = port or '80'
         self.timeout = timeout or 30
         super(ConfigApiClient, self).__init__(hostname, context, username, api_shared_key, schema,
-                                              port, default_headers)
+                                              port, default_headers, **kwargs)
 
-    def _common_get(self, request_path, timeout=None, **kwargs):
+    def _common_get(self, request_path, timeout=None, headers=None, **kwargs):
         parameters = {}
         timeout = timeout or self.timeout
         if 'size' in kwargs and kwargs['size'] is not None:
@@ -34,7 +88,7 @@ class ConfigApiClient(BaseRestAuthClient):
             parameters["limit"] = str(kwargs['limit'])
         if 'parameters' in kwargs and kwargs['parameters'] is not None:
             parameters.update(parse_qs(kwargs['parameters']))
-        return self.get(request_path=request_path, params=parameters, timeout=timeout)
+        return self.get(request_path=request_path, headers=headers, params=parameters, timeout=timeout)
 
     def _common_post(self, request_path, body=None, timeout=None, **kwargs):
         timeout = timeout or self.timeout
@@ -48,6 +102,92 @@ class ConfigApiClient(BaseRestAuthClient):
         timeout = timeout or self.timeout
         return self.delete(request_path=request_path, data=json.dumps(body), timeout=timeout)
 
+    def _json(self, response):
+        """
+        Decode successful response body or raise ConfigApiBaseException
+        """
+        if not 200 <= response.status_code < 300:
+            raise ConfigApiBaseException(response.status_code, response.text)
+        return response.json() if response.content else None
+
+    def response_json(self, response):
+        """
+        Decode successful response body or raise ConfigApiBaseException
+
+            :param response: requests.models.Response
+        """
+        return self._json(response)
+
+    def page_items(self, response):
+        """
+        Items of a single page of successful list/search response, raises ConfigApiBaseException otherwise
+
+            :param response: requests.models.Response
+        """
+        return _page_items(self._json(response))
+
+    def _iter_pages(self, list_method, size=None, concurrency=4, **kwargs):
+        """
+        Yield items of all pages of paginated list/search method.
+        The first page is fetched alone, when it reveals the total the remaining pages are fetched concurrently,
+        otherwise pages are fetched in concurrent batches until the first incomplete page. Items keep page order.
+        """
+        size = size or self.DEFAULT_PAGE_SIZE
+        payload = self._json(list_method(size=size, page=1, **kwargs))
+        items = _page_items(payload)
+        yield from items
+        total_pages = _page_count(payload, size)
+        if total_pages is not None:
+            pages = [dict(kwargs, size=size, page=page) for page in range(2, total_pages + 1)]
+            with closing(self.map(list_method, pages, concurrency=concurrency)) as results:
+                for result in results:
+                    if result.error is not None:
+                        raise result.error
+                    yield from _page_items(self._json(result.result))
+            return
+
+        page = 2
+        while len(items) >= size:
+            pages = [dict(kwargs, size=size, page=number) for number in range(page, page + concurrency)]
+            page += concurrency
+            with closing(self.map(list_method, pages, concurrency=concurrency)) as results:
+                for result in results:
+                    if result.error is not None:
+                        raise result.error
+                    items = _page_items(self._json(result.result))
+                    yield from items
+                    if len(items) < size:
+                        break
+
+    def _bulk_clone(self, get_method, inherit_method, clones, concurrency):
+        """
+        Fetch unique parents concurrently, then submit inherit calls for all clones concurrently
+        """
+        clones = [tuple(clone) for clone in clones]
+        parents = {}
+        for result in self.map(get_method, list({clone[2]: None for clone in clones}), concurrency=concurrency):
+            try:
+                parents[result.item] = self._json(result.result) if result.error is None else result.error
+            except ConfigApiBaseException as error:
+                parents[result.item] = error
+
+        inherit = getattr(self, inherit_method)
+
+        def clone_one(published_host, source_host, parent_uuid):
+            parent = parents[parent_uuid]
+            if isinstance(parent, BaseException):
+                raise parent
+            config = _clone_config(parent, published_host, source_host)
+            return self._json(inherit(config, parent_uuid=parent_uuid))
+
+        return list(self.map(clone_one, clones, concurrency=concurrency))
+
+    def _iter_limited(self, list_method, size=None, **kwargs):
+        """
+        Yield items of list method supporting only limit (DNS), without pagination
+        """
+        yield from _page_items(self._json(list_method(size=size, **kwargs)))
+
     # -------------------- Config API  -------------------- #
 
     def request(self, **kwargs):
@@ -105,17 +245,18 @@ class ConfigApiClient(BaseRestAuthClient):
 
     # -------------------- Content Delivery - Get Info -------------------- #
 
-    def list_delivery_service_instances(self, shortname, size=None, page=None):
+    def list_delivery_service_instances(self, shortname, size=None, page=None, headers=None):
         """
         Retrieves the delivery configurations for the provided shortname
 
             :param shortname: str
             :param size: (optional) Default 100. int
             :param page: (optional) Default is 1. int
+            :param headers: (optional) extra request headers, e.g. If-None-Match. dict
         """
         self.logger.debug(f"Getting Delivery ServiceInstances for shortname [{shortname}]")
         request_path = f'svcinst/delivery/shortname/{shortname}'
-        return self._common_get(request_path, size=size, page=page)
+        return self._common_get(request_path, size=size, page=page, headers=headers)
 
     def list_delivery_service_profiles(self, shortname, size=None, page=None):
         """
@@ -299,28 +440,35 @@ class ConfigApiClient(BaseRestAuthClient):
         config = self.get_delivery_service_instance(parent_uuid)
         if not config.status_code == 200:
             raise BaseException(config.json())
-        config = config.json()
-        del config['revision']
-        del config['shortname']
-        del config['status']
-        del config['uuid']
-        config['body']['sourceHostname'] = source_host
-        config['body']['publishedHostname'] = published_host
+        config = _clone_config(config.json(), published_host, source_host)
         return self.inherit_delivery_service_instance(config, parent_uuid=parent_uuid)
 
+    def bulk_clone_delivery_service_instances(self, clones, concurrency=8):
+        """
+        Clone delivery service instances concurrently, every parent is fetched only once.
+        Returns list of BulkResult per clone in input order with created config as result
+        or ConfigApiBaseException as error.
+
+            :param clones: iterable of (published_host, source_host, parent_uuid) tuples
+            :param concurrency: (optional) Default 8. int
+        """
+        return self._bulk_clone('get_delivery_service_instance', 'inherit_delivery_service_instance',
+                                clones, concurrency)
+
     # -------------------- HTTP chunk streaming - Make changes -------------------- #
 
-    def list_httpcs_service_instances(self, shortname, size=None, page=None):
+    def list_httpcs_service_instances(self, shortname, size=None, page=None, headers=None):
         """
         Retrieves the httpcs configurations for the provided shortname
 
             :param shortname: str
             :param size: (optional) Default 100. int
             :param page: (optional) Default is 1. int
+            :param headers: (optional) extra request headers, e.g. If-None-Match. dict
         """
         self.logger.debug(f"Getting Delivery ServiceInstances for shortname [{shortname}]")
         request_path = f'svcinst/httpcs/shortname/{shortname}'
-        return self._common_get(request_path, size=size, page=page)
+        return self._common_get(request_path, size=size, page=page, headers=headers)
 
     def list_httpcs_service_profiles(self, shortname, size=None, page=None):
         """
@@ -487,15 +635,21 @@ class ConfigApiClient(BaseRestAuthClient):
         """
         config = self.get_httpcs_service_instance(parent_uuid)
         assert config.status_code == 200, 'An error occurs'
-        config = config.json()
-        del config['revision']
-        del config['shortname']
-        del config['status']
-        del config['uuid']
-        config['body']['httpcsSvcInstance']['sourceHostname'] = source_host
-        config['body']['httpcsSvcInstance']['publishedHostname'] = published_host
+        config = _clone_config(config.json(), published_host, source_host)
         return self.inherit_httpcs_service_instance(config, parent_uuid=parent_uuid)
 
+    def bulk_clone_httpcs_service_instances(self, clones, concurrency=8):
+        """
+        Clone httpcs service instances concurrently, every parent is fetched only once.
+        Returns list of BulkResult per clone in input order with created config as result
+        or ConfigApiBaseException as error.
+
+            :param clones: iterable of (published_host, source_host, parent_uuid) tuples
+            :param concurrency: (optional) Default 8. int
+        """
+        return self._bulk_clone('get_httpcs_service_instance', 'inherit_httpcs_service_instance',
+                                clones, concurrency)
+
     # -------------------- Customer Certificates-------------------- #
 
     def list_customer_certificates(self, shortname, size=None, page=None):
@@ -1103,3 +1257,185 @@ class ConfigApiClient(BaseRestAuthClient):
         self.logger.debug(f'Deleting webrtc video slot [{slot_id}] for [{shortname}]')
         request_path = f'webrtc/shortname/{shortname}/slots/{slot_id}'
         return self._common_delete(request_path)
+
+    # -------------------- Pagination -------------------- #
+
+    def iter_delivery_service_instances(self, shortname, size=None, concurrency=4):
+        """
+        Iterate over all delivery configurations for the provided shortname, pages are fetched concurrently
+
+            :param shortname: str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.list_delivery_service_instances, size, concurrency, shortname=shortname)
+
+    def iter_delivery_service_profiles(self, shortname, size=None, concurrency=4):
+        """
+        Iterate over all delivery service profiles for the provided shortname
+
+            :param shortname: str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.list_delivery_service_profiles, size, concurrency, shortname=shortname)
+
+    def iter_search_delivery_service_profiles(self, shortname, parameters=None, size=None, concurrency=4):
+        """
+        Iterate over all delivery service profiles matching searching criteria
+
+            :param shortname: str
+            :param parameters: (optional) Searching criteria (e.i. body.useCase=DownloadLargeFile) str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.search_delivery_service_profiles, size, concurrency, shortname=shortname,
+                                parameters=parameters)
+
+    def iter_search_delivery_service_instance(self, shortname, parameters=None, size=None, concurrency=4):
+        """
+        Iterate over all delivery service instances matching searching criteria
+
+            :param shortname: str
+            :param parameters: (optional) Searching criteria (e.i. body.useCase=DownloadLargeFile) str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.search_delivery_service_instance, size, concurrency, shortname=shortname,
+                                parameters=parameters)
+
+    def iter_httpcs_service_instances(self, shortname, size=None, concurrency=4):
+        """
+        Iterate over all httpcs configurations for the provided shortname, pages are fetched concurrently
+
+            :param shortname: str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.list_httpcs_service_instances, size, concurrency, shortname=shortname)
+
+    def iter_httpcs_service_profiles(self, shortname, size=None, concurrency=4):
+        """
+        Iterate over all httpcs service profiles for the provided shortname
+
+            :param shortname: str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.list_httpcs_service_profiles, size, concurrency, shortname=shortname)
+
+    def iter_search_httpcs_service_profiles(self, shortname, parameters=None, size=None, concurrency=4):
+        """
+        Iterate over all httpcs service profiles matching searching criteria
+
+            :param shortname: str
+            :param parameters: (optional) Searching criteria (e.i. body.useCase=DownloadLargeFile) str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.search_httpcs_service_profiles, size, concurrency, shortname=shortname,
+                                parameters=parameters)
+
+    def iter_search_httpcs_service_instance(self, shortname, parameters=None, size=None, concurrency=4):
+        """
+        Iterate over all httpcs service instances matching searching criteria
+
+            :param shortname: str
+            :param parameters: (optional) Searching criteria (e.i. body.useCase=DownloadLargeFile) str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.search_httpcs_service_instance, size, concurrency, shortname=shortname,
+                                parameters=parameters)
+
+    def iter_customer_certificates(self, shortname, size=None, concurrency=4):
+        """
+        Iterate over all customer SSL certificates for the provided shortname
+
+            :param shortname: str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.list_customer_certificates, size, concurrency, shortname=shortname)
+
+    def iter_lds(self, shortname, size=None, concurrency=4):
+        """
+        Iterate over all customer lds configs
+
+            :param shortname: str
+            :param size: (optional) Default 100. Page size. int
+            :param concurrency: (optional) Default 4. Pages fetched at once. int
+        """
+        return self._iter_pages(self.list_lds, size, concurrency, shortname=shortname)
+
+    def iter_edgerules(self, shortname):
+        """
+        Iterate over EdgeRules per shortname, EdgeRules are not paginated
+
+            :param shortname: str
+        """
+        yield from _page_items(self._json(self.list_edgerules(shortname)))
+
+    def iter_customer_ipacc(self, shortname):
+        """
+        Iterate over customer IP Access Control Configurations, IPACC lists are not paginated
+
+            :param shortname: str
+        """
+        yield from _page_items(self._json(self.list_customer_ipacc(shortname)))
+
+    def iter_dns_resource(self, shortname, size=None):
+        """
+        Iterate over DNS resources. DNS API supports only limit, so all items come from a single request
+
+            :param shortname: str
+            :param size: (optional) limit. int
+        """
+        return self._iter_limited(self.list_dns_resource, size, shortname=shortname)
+
+    def iter_dns_resource_health_check(self, shortname, resource_id, size=None):
+        """
+        Iterate over DNS resource health checks
+
+            :param shortname: str
+            :param resource_id: str
+            :param size: (optional) limit. int
+        """
+        return self._iter_limited(self.list_dns_resource_health_check, size, shortname=shortname,
+                                  resource_id=resource_id)
+
+    def iter_dns_failover(self, shortname, zone, size=None):
+        """
+        Iterate over DNS failovers of the zone
+
+            :param shortname: str
+            :param zone: str
+            :param size: (optional) limit. int
+        """
+        return self._iter_limited(self.list_dns_failover, size, shortname=shortname, zone=zone)
+
+    def iter_dns_rule(self, shortname, size=None):
+        """
+        Iterate over DNS rules
+
+            :param shortname: str
+            :param size: (optional) limit. int
+        """
+        return self._iter_limited(self.list_dns_rule, size, shortname=shortname)
+
+    def iter_dns_job(self, size=None):
+        """
+        Iterate over DNS jobs
+
+            :param size: (optional) limit. int
+        """
+        return self._iter_limited(self.list_dns_job, size)
+
+
+class ConfigApiBaseException(BaseException):
+    __module__ = 'builtins'
+
+    def __init__(self, status_code, body=None):
+        super(ConfigApiBaseException, self).__init__(f'config-api responded with [{status_code}]: {body}')
+        self.status_code = status_code
+        self.body = body
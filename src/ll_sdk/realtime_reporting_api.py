@@ -121,14 +121,14 @@ class RealtimeReportingClient(BaseRestReportingClient):
                                     REQUESTED_FIELDS_SHORTNAME, REQUESTED_FIELDS_STATUS_CODE]
 
     def __init__(self, hostname, username, api_shared_key, schema=None, port=None, context=None,
-                 default_headers=None, timeout=None, timezone=None):
+                 default_headers=None, timeout=None, timezone=None, **kwargs):
         context = context or 'realtime-reporting-api'
         schema = schema or 'https'
         port = port or '80'
         self.timeout = timeout or 30
         self.timezone = timezone or self.TIMEZONE_DEFAULT
         super(RealtimeReportingClient, self).__init__(hostname, context, username, api_shared_key, schema,
-                                                      port, default_headers)
+                                                      port, default_headers, **kwargs)
 
     def _common_get(self, request_path, timeout=None, **kwargs):
         parameters = kwargs['parameters'] if 'parameters' in kwargs else None
@@ -58,13 +58,13 @@ class ReportingClient(BaseRestReportingClient):
                                     REQUESTED_FIELD_OUT_BYTES, REQUESTED_FIELD_OUT_REQUESTS]
 
     def __init__(self, hostname, username, api_shared_key, schema=None, port=None, context=None,
-                 default_headers=None, timeout=None):
+                 default_headers=None, timeout=None, **kwargs):
         context = context or "reporting-api"
         schema = schema or "https"
         port = port or 80
         self.timeout = timeout or 30
         super(ReportingClient, self).__init__(hostname, context, username, api_shared_key, schema,
-                                              port, default_headers)
+                                              port, default_headers, **kwargs)
 
     def _common_get(self, request_path, timeout=None, **kwargs):
         parameters = kwargs["parameters"] if "parameters" in kwargs else None
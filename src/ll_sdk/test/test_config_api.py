@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from urllib.parse import urlsplit, parse_qs
+from ll_sdk.config_api import ConfigApiClient, ConfigApiBaseException
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+
+shortname = "testname"
+instances = [{"uuid": str(i)} for i in range(23)]
+
+
+def _paged_handler(with_total):
+    def handler(request, path_params):
+        query = parse_qs(urlsplit(request.url).query)
+        size, page = int(query["size"][0]), int(query["page"][0])
+        content = instances[(page - 1) * size:page * size]
+        if not with_total:
+            return content
+        return {"content": content, "totalElements": len(instances)}
+    return handler
+
+
+@pytest.mark.parametrize('with_total', [True, False])
+def test_iter_pages(with_total):
+    """Test: iter_* generator yields all items of all pages in order
+
+    Steps:
+    1. Iterate over delivery service instances with page size 5
+
+    Result:
+    OK: all items are returned in order, no more pages than needed are requested with known total
+    """
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/shortname/{shortname}", handler=_paged_handler(with_total))
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    assert list(client.iter_delivery_service_instances(shortname, size=5, concurrency=2)) == instances
+    if with_total:
+        assert transport.requests_count == 5
+
+
+def test_iter_pages_error():
+    """Test: iter_* generator raises on error response
+
+    Result:
+    OK: ConfigApiBaseException with status code is raised
+    """
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "customerCertificate/shortname/{shortname}", status=403, body={"errors": []})
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    with pytest.raises(ConfigApiBaseException) as error:
+        list(client.iter_customer_certificates(shortname))
+    assert error.value.status_code == 403
+
+
+def test_bulk_clone():
+    """Test: Bulk clone fetches every parent once and reports outcome per hostname
+
+    Steps:
+    1. Clone parent "p1" to 5 hostnames and missing parent "p2" to one hostname
+
+    Result:
+    OK: one GET per parent, 5 inherits, clones of missing parent fail with 404
+    """
+    parent = {"uuid": "p1", "shortname": shortname, "status": {}, "revision": {"versionNumber": 2},
+              "body": {"publishedHostname": "parent.example.com", "sourceHostname": "origin.example.com",
+                       "protocolSets": [{"publishedProtocol": "https", "sourceProtocol": "https", "options": []}]}}
+    transport = FakeTransport(routes=config_api_routes(instances=[parent]), sleep=lambda s: None)
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    clones = [(f"host{i}.example.com", "origin.example.com", "p1") for i in range(5)]
+    clones.append(("orphan.example.com", "origin.example.com", "p2"))
+
+    results = client.bulk_clone_delivery_service_instances(clones, concurrency=3)
+
+    assert [r.item[0] for r in results] == [clone[0] for clone in clones]
+    assert all(r.ok for r in results[:5])
+    assert [r.result["body"]["publishedHostname"] for r in results[:5]] == [clone[0] for clone in clones[:5]]
+    assert results[0].result["uuid"] != "p1"
+    assert results[5].error.status_code == 404
+    assert len([t for m, t, _ in transport.requests if m == "GET" and t.endswith("svcinst/delivery/{id}")]) == 2
+    assert len([t for m, t, _ in transport.requests if t.endswith("svcinst/delivery/inheritance")]) == 5
+    assert parent["body"]["publishedHostname"] == "parent.example.com"
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.bulk import bulk_map
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+
+instances = [{"uuid": f"00000000-0000-0000-0000-{i:012d}", "body": {}} for i in range(20)]
+
+
+@pytest.fixture(scope="function")
+def client():
+    """Fixture for ConfigApiClient on top of fake transport with random latency"""
+    transport = FakeTransport(routes=config_api_routes(instances), latency=lambda rnd: rnd.uniform(0, 0.005),
+                              seed=1)
+    return ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+
+
+def test_client_map_ordered(client):
+    """Test: client.map returns results in input order
+
+    Steps:
+    1. Get 20 instances by uuid concurrently, plus unknown uuid
+
+    Result:
+    OK: results are ordered, every call is reported
+    """
+    uuids = [inst["uuid"] for inst in instances] + ["unknown"]
+    results = list(client.map("get_delivery_service_instance", [{"uuid": u} for u in uuids], concurrency=4))
+    assert [r.index for r in results] == list(range(len(uuids)))
+    assert [r.result.json()["uuid"] for r in results[:-1]] == uuids[:-1]
+    assert results[-1].result.status_code == 404
+
+
+def test_errors_do_not_stop_stream():
+    """Test: Exceptions are reported per item
+
+    Result:
+    OK: failed item has error, others have results
+    """
+    def func(value):
+        if value == 3:
+            raise ValueError("bad value")
+        return value * 2
+
+    results = list(bulk_map(func, range(6), concurrency=3, ordered=False))
+    assert sorted(r.result for r in results if r.ok) == [0, 2, 4, 8, 10]
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 1 and isinstance(failed[0].error, ValueError) and failed[0].item == 3
+
+
+def test_backpressure():
+    """Test: Input is consumed lazily
+
+    Steps:
+    1. Map over infinite generator and stop after 5 results
+
+    Result:
+    OK: only bounded amount of items was pulled from input
+    """
+    pulled = []
+
+    def items():
+        i = 0
+        while True:
+            pulled.append(i)
+            yield i
+            i += 1
+
+    stream = bulk_map(lambda i: time.sleep(random.uniform(0, 0.001)) or i, items(), concurrency=2, prefetch=2)
+    assert [next(stream).result for _ in range(5)] == [0, 1, 2, 3, 4]
+    stream.close()
+    assert len(pulled) <= 5 + 4
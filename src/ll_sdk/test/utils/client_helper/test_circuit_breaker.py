@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.base_client import endpoint_template
+from ll_sdk.utils.client_helper.circuit_breaker import CircuitBreaker, CircuitBreakerOpenException
+
+endpoint = "traffic/geo"
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def clock():
+    """Fixture for manually driven clock"""
+    return FakeClock()
+
+
+@pytest.fixture(scope="function")
+def breaker(clock):
+    """Fixture for circuit breaker with small window"""
+    return CircuitBreaker(error_rate_threshold=0.5, latency_threshold=5, latency_percentile=90,
+                          window_size=4, min_calls=4, reset_timeout=10, clock=clock)
+
+
+def _call(breaker, success, latency=0.1):
+    circuit = breaker.circuit(endpoint)
+    circuit.before_call()
+    circuit.record(success, latency)
+
+
+def test_trip_on_error_rate(breaker):
+    """Test: Circuit trips when error rate exceeds threshold
+
+    Steps:
+    1. Perform 2 successful and 2 failed calls
+    2. Perform one more call
+
+    Result:
+    OK: circuit is open and the call fails fast
+    """
+    for success in (True, True, False, False):
+        _call(breaker, success)
+    assert breaker.state(endpoint) == CircuitBreaker.OPEN
+    with pytest.raises(CircuitBreakerOpenException):
+        _call(breaker, True)
+    assert breaker.snapshot()[endpoint]["rejected"] == 1
+
+
+def test_trip_on_latency_percentile(breaker):
+    """Test: Circuit trips when latency percentile exceeds threshold
+
+    Steps:
+    1. Perform 4 successful but slow calls
+
+    Result:
+    OK: circuit is open
+    """
+    for _ in range(4):
+        _call(breaker, True, latency=30)
+    assert breaker.state(endpoint) == CircuitBreaker.OPEN
+
+
+@pytest.mark.parametrize('probe_success,expected', [(True, CircuitBreaker.CLOSED), (False, CircuitBreaker.OPEN)])
+def test_half_open(breaker, clock, probe_success, expected):
+    """Test: Circuit goes half-open after reset timeout and is decided by probe call
+
+    Steps:
+    1. Trip circuit
+    2. Wait reset timeout and perform probe call
+
+    Result:
+    OK: only one probe is allowed, state after probe is as expected
+    """
+    for _ in range(4):
+        _call(breaker, False)
+    clock.now = 11
+    circuit = breaker.circuit(endpoint)
+    circuit.before_call()
+    assert breaker.state(endpoint) == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitBreakerOpenException):
+        circuit.before_call()
+    circuit.record(probe_success, 0.1)
+    assert breaker.state(endpoint) == expected
+
+
+def test_endpoints_are_isolated(breaker):
+    """Test: Failures of one endpoint do not affect another one
+
+    Result:
+    OK: second endpoint stays closed
+    """
+    for _ in range(4):
+        _call(breaker, False)
+    breaker.circuit("traffic").before_call()
+    assert breaker.state("traffic") == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize('path,expected', [
+    ('svcinst/delivery/shortname/test/searchAuto', 'svcinst/delivery/shortname/{shortname}/searchAuto'),
+    ('svcinst/delivery/2f6f5a0e-2b8e-4a8c-9a52-0c6f0a1e1d2b/versions/3', 'svcinst/delivery/{id}/versions/{id}'),
+    ('svcinst/httpcs/inheritance?parentId=abc', 'svcinst/httpcs/inheritance'),
+    ('epdns/shortname/test/zone/example.com/failover', 'epdns/shortname/{shortname}/zone/{zone}/failover'),
+    ('traffic/geo', 'traffic/geo')])
+def test_endpoint_template(path, expected):
+    """Test: Request path is collapsed into endpoint template
+
+    Result:
+    OK: path parameters are replaced with placeholders
+    """
+    assert endpoint_template(path) == expected
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.utils.client_helper.dag import run_dag, reverse_dependencies
+
+
+def test_run_dag_order_and_failure():
+    """Test: Nodes run after their dependencies, dependents of failed node are not called
+
+    Result:
+    OK: dependency order kept, node depending on failed node is missing in result
+    """
+    graph = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"], "e": [], "f": ["e"]}
+    calls = []
+
+    def func(node):
+        calls.append(node)
+        if node == "e":
+            raise ValueError(node)
+        return node.upper()
+
+    results = run_dag(func, graph, concurrency=3, fail_fast=False)
+    assert calls.index("a") < calls.index("b") < calls.index("d")
+    assert calls.index("c") < calls.index("d")
+    assert results["d"].result == "D"
+    assert isinstance(results["e"].error, ValueError)
+    assert "f" not in results
+
+
+def test_run_dag_cycle_and_reverse():
+    """Test: Cycle is detected, reverse graph keeps only requested nodes
+
+    Result:
+    OK: ValueError on cycle, reverse dependencies point from dependency to dependents
+    """
+    with pytest.raises(ValueError):
+        run_dag(lambda node: node, {"a": ["b"], "b": ["a"]})
+    assert reverse_dependencies({"a": [], "b": ["a"], "c": ["b"]}, ["a", "b"]) == {"a": ["b"], "b": []}
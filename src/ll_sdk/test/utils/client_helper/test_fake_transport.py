@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+import requests
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.realtime_reporting_api import RealtimeReportingClient
+from ll_sdk.utils.client_helper.circuit_breaker import CircuitBreaker, CircuitBreakerOpenException
+from ll_sdk.utils.client_helper.fake_transport import (FakeTransport, config_api_routes, reporting_api_routes,
+                                                       constant_latency)
+
+shortname = "testname"
+instance = {"uuid": "2f6f5a0e-2b8e-4a8c-9a52-0c6f0a1e1d2b", "shortname": shortname,
+            "body": {"publishedHostname": "www.example.com"}}
+
+
+def _config_client(transport, **kwargs):
+    return ConfigApiClient("apis.example.com", "user", "ab12", transport=transport, **kwargs)
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake transport with canned config-api responses"""
+    return FakeTransport(routes=config_api_routes([instance]), seed=1, sleep=lambda s: None)
+
+
+def test_canned_config_api_responses(transport):
+    """Test: Client works on top of fake transport
+
+    Steps:
+    1. List, get and validate delivery service instances
+
+    Result:
+    OK: canned responses are returned, request is signed
+    """
+    client = _config_client(transport)
+    assert client.list_delivery_service_instances(shortname).json() == [instance]
+    assert client.get_delivery_service_instance(instance["uuid"]).json() == instance
+    assert client.get_delivery_service_instance("unknown").status_code == 404
+    assert client.validate_delivery_service_instance({}).json() == {"Success": True}
+    _, template, prepared = transport.requests[-1]
+    assert template.endswith("svcinst/delivery/validate")
+    assert prepared.headers[client.HEADER_TOKEN]
+
+
+def test_reporting_routes():
+    """Test: Reporting canned responses match any report
+
+    Result:
+    OK: traffic_geo returns empty data
+    """
+    client = RealtimeReportingClient("apis.example.com", "user", "ab12",
+                                     transport=FakeTransport(routes=reporting_api_routes()))
+    assert client.traffic_geo(shortname=shortname).json() == {"data": []}
+
+
+def test_payload_size(transport):
+    """Test: Response body is padded up to payload size
+
+    Result:
+    OK: body has requested size
+    """
+    transport.add_route("GET", "utils/status", body={"version": "fake"}, payload_size=4096)
+    assert len(_config_client(transport).get_status().content) == 4096
+
+
+def test_timeout_and_error_injection():
+    """Test: Latency over timeout raises timeout, injected errors trip circuit breaker
+
+    Result:
+    OK: ReadTimeout is raised, circuit opens after injected errors
+    """
+    slow = FakeTransport(routes=config_api_routes(), latency=constant_latency(60), sleep=lambda s: None)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        _config_client(slow).get_status()
+
+    failing = FakeTransport(routes=config_api_routes(), error_rate=1.0, sleep=lambda s: None)
+    client = _config_client(failing, circuit_breaker=CircuitBreaker(window_size=2, min_calls=2))
+    assert client.get_status().status_code == 503
+    assert client.get_status().status_code == 503
+    with pytest.raises(CircuitBreakerOpenException):
+        client.get_status()
+    assert client.circuit_breaker_state()["utils/status"]["state"] == CircuitBreaker.OPEN
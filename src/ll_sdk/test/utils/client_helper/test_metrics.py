@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.metrics import LatencyHistogram, MetricsRegistry
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+
+shortname = "testname"
+
+
+@pytest.fixture(scope="function")
+def client():
+    """Fixture for ConfigApiClient on top of fake transport"""
+    transport = FakeTransport(routes=config_api_routes(), sleep=lambda s: None)
+    return ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+
+
+@pytest.mark.parametrize('percentile', [50, 95, 99])
+def test_histogram_percentile(percentile):
+    """Test: Histogram percentiles are within HDR precision
+
+    Steps:
+    1. Record latencies 1..1000 ms
+    2. Get percentile
+
+    Result:
+    OK: relative error is below 1/16
+    """
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000.0)
+    expected = percentile / 100.0
+    assert abs(histogram.percentile(percentile) - expected) / expected < 1 / 16.0
+
+
+def test_client_metrics(client):
+    """Test: Client records metrics per endpoint template
+
+    Steps:
+    1. Perform requests for different shortnames and uuids
+    2. Take metrics snapshot
+
+    Result:
+    OK: requests are grouped by endpoint template, status classes and bytes are counted
+    """
+    client.list_delivery_service_instances(shortname)
+    client.list_delivery_service_instances("other")
+    client.get_delivery_service_instance("2f6f5a0e-2b8e-4a8c-9a52-0c6f0a1e1d2b")
+    client.validate_delivery_service_instance({"body": {}})
+    snapshot = client.metrics()
+
+    listing = snapshot["GET", "svcinst/delivery/shortname/{shortname}"]
+    assert listing["count"] == 2
+    assert listing["status_classes"] == {"2xx": 2}
+    assert listing["latency_p99"] is not None
+    assert snapshot["GET", "svcinst/delivery/{id}"]["status_classes"] == {"4xx": 1}
+    assert snapshot["POST", "svcinst/delivery/validate"]["bytes_out"] == len('{"body": {}}')
+    assert len(snapshot) == 3
+
+
+def test_prometheus_export():
+    """Test: Metrics are exported in Prometheus text format
+
+    Result:
+    OK: counters, histogram buckets and quantiles are present
+    """
+    registry = MetricsRegistry(labels={"client": "ConfigApiClient"})
+    registry.record("GET", "utils/status", 200, 0, 100, 0.02)
+    registry.record("GET", "utils/status", "error", 0, 0, 0.5)
+    text = registry.snapshot().to_prometheus()
+    labels = 'client="ConfigApiClient",method="GET",endpoint="utils/status"'
+    assert f'llnw_sdk_requests_total{{{labels},status_class="2xx"}} 1' in text
+    assert f'llnw_sdk_requests_total{{{labels},status_class="error"}} 1' in text
+    assert f'llnw_sdk_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'llnw_sdk_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'llnw_sdk_response_bytes_total{{{labels}}} 100' in text
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from ll_sdk.utils.client_helper.rate_limiter import RateLimiter
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_rate_limiter():
+    """Test: Token bucket allows burst and then limits rate
+
+    Steps:
+    1. Acquire 2 tokens of burst, then 10 more
+
+    Result:
+    OK: burst is not delayed, 10 more tokens take 1 second with rate 10/s
+    """
+    clock = FakeClock()
+    limiter = RateLimiter(10, burst=2, clock=clock, sleep=clock.sleep)
+    assert limiter.acquire() == 0 and limiter.acquire() == 0
+    for _ in range(10):
+        limiter.acquire()
+    assert abs(clock.now - 1.0) < 1e-9
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.tracing import BaseTracer, OpenTelemetryTracer
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+
+shortname = "testname"
+
+
+class RecordingSpan(object):
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        pass
+
+
+class RecordingTracer(BaseTracer):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None):
+        self.spans.append(RecordingSpan(name, attributes))
+        return self.spans[-1]
+
+    def inject(self, headers):
+        headers["traceparent"] = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake transport with canned config-api responses"""
+    return FakeTransport(routes=config_api_routes(), sleep=lambda s: None)
+
+
+def test_span_per_call(transport):
+    """Test: Every API call is reported as span with context propagated
+
+    Steps:
+    1. Perform list and validate calls with tracer configured
+
+    Result:
+    OK: spans have endpoint, shortname, payload size and status attributes, traceparent is sent
+    """
+    tracer = RecordingTracer()
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport, tracer=tracer)
+    client.list_delivery_service_instances(shortname)
+    client.validate_delivery_service_instance({"body": {}})
+
+    listing, validate = tracer.spans
+    assert listing.name == "GET svcinst/delivery/shortname/{shortname}"
+    assert listing.attributes["llnw.shortname"] == shortname
+    assert listing.attributes["http.status_code"] == 200
+    assert listing.attributes["llnw.retry_attempt"] == 0
+    assert validate.attributes["http.request_content_length"] == len('{"body": {}}')
+    assert transport.requests[-1][2].headers["traceparent"].startswith("00-")
+
+
+def test_no_tracer(transport):
+    """Test: Client without tracer does not send trace context
+
+    Result:
+    OK: traceparent header is absent
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    client.get_status()
+    assert "traceparent" not in transport.requests[-1][2].headers
+
+
+def test_opentelemetry_tracer(transport):
+    """Test: OpenTelemetry adapter creates child span of current span
+
+    Result:
+    OK: client span shares trace id with parent span
+    """
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport,
+                             tracer=OpenTelemetryTracer(tracer_provider=provider))
+    with provider.get_tracer("test").start_as_current_span("parent"):
+        client.get_status()
+    child, parent = exporter.get_finished_spans()
+    assert child.parent.span_id == parent.context.span_id
+    assert child.attributes["llnw.endpoint"] == "utils/status"
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import gzip
+import itertools
+import json
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+from ll_sdk.utils.config_api_helper.archive import export_account, import_account, read_archive, ImportResult
+
+shortname = "testname"
+
+
+@pytest.fixture(scope="function")
+def source():
+    """Fixture for fake config-api of exported account"""
+    instances = [{"uuid": f"d{idx}", "accounts": [{"shortname": shortname}],
+                  "body": {"publishedHostname": f"www{idx}.example.com"}} for idx in range(3)]
+    transport = FakeTransport(routes=config_api_routes(instances=instances), sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/httpcs/shortname/{shortname}", body=[])
+    transport.add_route("GET", "customerCertificate/shortname/{shortname}", body=[{"uuid": "c1"}])
+    transport.add_route("GET", "customerCertificate/{id}",
+                        body={"uuid": "c1", "body": {"certName": "www", "cert": "PEM", "certKey": "KEY"}})
+    transport.add_route("GET", "epdns/shortname/{shortname}/zone", body=[{"id": 7, "name": "example.com"}])
+    transport.add_route("GET", "epdns/shortname/{shortname}/resource", body=[{"id": "r1", "name": "origin"}])
+    transport.add_route("GET", "epdns/shortname/{shortname}/resource/{id}/healthcheck", body=[{"id": "h1"}])
+    transport.add_route("GET", "epdns/shortname/{shortname}/zone/{zone}/failover", body=[{"id": "f1"}])
+    transport.add_route("GET", "epdns/shortname/{shortname}/zone/{zone}/failover/{id}/resource",
+                        body=[{"id": "m1", "resourceId": "r1"}])
+    for endpoint in ("epdns/shortname/{shortname}/rule", "epdns/shortname/{shortname}/zone/{zone}/directorpolicy",
+                     "live/recording/shortname/{shortname}/schedules", "live/shortname/{shortname}/slots",
+                     "webrtc/shortname/{shortname}/slots"):
+        transport.add_route("GET", endpoint, body=[])
+    return transport
+
+
+@pytest.fixture(scope="function")
+def target():
+    """Fixture for fake config-api of account objects are imported to, every created object gets new id"""
+    counter = itertools.count(1)
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("POST", "{any}", handler=lambda request, params: {"id": f"new-{next(counter)}"})
+    return transport
+
+
+def test_export_import(tmp_path, source, target):
+    """Test: Account exported to chunked archive is replayed in dependency order
+
+    Steps:
+    1. Export account with chunks of 2 objects
+    2. Import archive into another account
+
+    Result:
+    OK: archive consists of several gzip members, every object created after objects it depends on,
+        references point to new ids, read-only families skipped
+    """
+    path = str(tmp_path / "account.jsonl.gz")
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=source)
+    counts = export_account(client, shortname, path, chunk_size=2)
+    assert counts == {"certificate": 1, "delivery": 3, "dns_zone": 1, "dns_resource": 1, "dns_health_check": 1,
+                      "dns_failover": 1, "dns_resource_to_failover": 1}
+    with open(path, "rb") as file:
+        assert file.read().count(b"\x1f\x8b\x08") >= 5
+    records = list(read_archive(path))
+    assert [r["zone"] for r in records if r["family"] == "dns_resource_to_failover"] == ["example.com"]
+
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=target)
+    results = list(import_account(client, "other", path))
+    statuses = {(r.family, r.id): r.status for r in results}
+    assert statuses[("dns_zone", "example.com")] == ImportResult.SKIPPED
+    assert all(status == ImportResult.CREATED for key, status in statuses.items() if key[0] != "dns_zone")
+
+    posts = [(t, json.loads(r.body)) for m, t, r in target.requests if m == "POST"]
+    order = [t for t, _ in posts]
+    assert order.index(next(t for t in order if t.endswith("customerCertificate"))) < \
+        min(idx for idx, t in enumerate(order) if t.endswith("svcinst/delivery"))
+    assert order[-1].endswith("failover/{id}/resource")
+    new_ids = {r.id: r.new_id for r in results}
+    member_url = [r.url for m, t, r in target.requests if t.endswith("failover/{id}/resource")][0]
+    assert member_url.endswith(f"/zone/example.com/failover/{new_ids['f1']}/resource")
+    assert posts[-1][1] == {"resourceId": new_ids["r1"]}
+    assert all(body["accounts"] == [{"shortname": "other"}] and "uuid" not in body
+               for t, body in posts if t.endswith("svcinst/delivery"))
+
+
+def test_failed_parent_skips_children(tmp_path, source, target):
+    """Test: Children of object which failed to import are skipped
+
+    Result:
+    OK: failover members skipped when failover creation failed
+    """
+    path = str(tmp_path / "account.jsonl.gz")
+    export_account(ConfigApiClient("apis.example.com", "user", "ab12", transport=source), shortname, path,
+                   families=["dns_failover", "dns_resource_to_failover"])
+    target.add_route("POST", "epdns/shortname/{shortname}/zone/{zone}/failover", status=400, body={"errors": []})
+    results = list(import_account(ConfigApiClient("apis.example.com", "user", "ab12", transport=target),
+                                  shortname, path))
+    assert [(r.family, r.status) for r in results] == [("dns_failover", ImportResult.FAILED),
+                                                       ("dns_resource_to_failover", ImportResult.SKIPPED)]
+
+
+def test_not_archive(tmp_path):
+    """Test: Reading file which is not an account archive fails"""
+    path = tmp_path / "other.gz"
+    with gzip.open(str(path), "wt") as file:
+        file.write('{"foo": 1}\n')
+    with pytest.raises(ValueError):
+        list(read_archive(str(path)))
+
+
+def test_references_mapped_per_family(tmp_path):
+    """Test: References are remapped within the family they refer to
+
+    Steps:
+    1. Write archive with DNS resource 5, failover 5 and director policy referring to both
+    2. Import archive, resources and failovers get different new ids
+
+    Result:
+    OK: policy is created after failover, resourceId and failoverId point to the new objects of their families
+    """
+    path = str(tmp_path / "account.jsonl.gz")
+    records = [{"format": "ll_sdk-account-archive", "version": 1, "shortname": shortname},
+               {"family": "dns_resource", "id": 5, "parent": None, "zone": None, "object": {"id": 5}},
+               {"family": "dns_failover", "id": 5, "parent": "example.com", "zone": "example.com",
+                "object": {"id": 5, "name": "fo"}},
+               {"family": "dns_director_policy", "id": 9, "parent": "example.com", "zone": "example.com",
+                "object": {"id": 9, "resourceId": 5, "failoverIds": [5], "zoneId": 5}}]
+    with gzip.open(path, "wt") as file:
+        file.writelines(json.dumps(record) + "\n" for record in records)
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("POST", "epdns/shortname/{shortname}/resource", body={"id": 100})
+    transport.add_route("POST", "epdns/shortname/{shortname}/zone/{zone}/failover", body={"id": 200})
+    transport.add_route("POST", "epdns/shortname/{shortname}/zone/{zone}/directorpolicy", body={"id": 300})
+
+    results = list(import_account(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport),
+                                  shortname, path))
+    assert all(r.status == ImportResult.CREATED for r in results)
+    posts = [(t, json.loads(r.body)) for m, t, r in transport.requests if m == "POST"]
+    assert posts[-1][0].endswith("zone/{zone}/directorpolicy")
+    assert posts[-1][1] == {"resourceId": 100, "failoverIds": [200], "zoneId": 5}
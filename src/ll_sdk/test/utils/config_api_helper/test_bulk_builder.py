@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.config_api_helper.bulk_builder import BulkConfigBuilder, parse_options
+from ll_sdk.utils.config_api_helper.deliver import DeliverServiceInstanceObj
+from ll_sdk.utils.config_api_helper.httpcs import HttpCsServiceInstanceObj
+from ll_sdk.utils.config_api_helper.provisioning import BulkProvisioner, ProvisionResult
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+
+shortname = "testname"
+
+
+@pytest.fixture(scope="function")
+def builder():
+    """Fixture for builder with default shortname and profile"""
+    return BulkConfigBuilder(shortname=shortname, profile_name="LLNW-Generic")
+
+
+def test_equal_to_helper_objects(builder):
+    """Test: Payloads are equal to the ones of helper objects
+
+    Steps:
+    1. Build delivery row with two protocol sets and option, httpcs row with two video formats
+    2. Build the same configs with DeliverServiceInstanceObj and HttpCsServiceInstanceObj
+
+    Result:
+    OK: payloads are equal
+    """
+    rows = [{"published_host": "www.example.com", "source_host": "origin.example.com",
+             "published_protocol": "https|http", "source_protocol": "https|http",
+             "options": "edge_cache_ttl=3600"},
+            {"service": "httpcs", "publishedHostname": "live.example.com", "sourceHostname": "origin.example.com",
+             "video_formats": "hls|dash"}]
+    delivery, httpcs = builder.build(rows)
+
+    expected_delivery = DeliverServiceInstanceObj()
+    expected_delivery.generate_default(shortname, "www.example.com", "origin.example.com", "LLNW-Generic",
+                                       ["https", "http"], ["https", "http"])
+    expected_delivery.add_option("edge_cache_ttl", ["3600"])
+    expected_httpcs = HttpCsServiceInstanceObj()
+    expected_httpcs.generate_default(shortname, ["hls", "dash"], "live.example.com", "origin.example.com",
+                                     "LLNW-Generic", "https", "https")
+
+    assert json.loads(json.dumps(delivery)) == json.loads(json.dumps(expected_delivery))
+    assert json.loads(json.dumps(httpcs)) == json.loads(json.dumps(expected_httpcs))
+
+
+def test_shared_parts(builder):
+    """Test: Repeating parts are shared between rows
+
+    Steps:
+    1. Build 3 httpcs rows, two of them with the same protocols and options
+
+    Result:
+    OK: accounts, protocol sets and children are the same objects for equal rows, hostnames are per row
+    """
+    rows = [{"service": "httpcs", "published_host": f"www{idx}.example.com", "source_host": "origin.example.com",
+             "options": options}
+            for idx, options in enumerate(['[{"name": "edge_cache_ttl", "parameters": ["60"]}]',
+                                           {"edge_cache_ttl": "60"}, None])]
+    first, second, third = builder.build(rows)
+
+    assert first["accounts"] is second["accounts"] is third["accounts"]
+    assert first["body"]["httpcsSvcInstance"]["protocolSets"] is second["body"]["httpcsSvcInstance"]["protocolSets"]
+    assert first["body"]["childHttpcsSvcInstances"] is second["body"]["childHttpcsSvcInstances"]
+    assert first["body"]["httpcsSvcInstance"]["protocolSets"] is not third["body"]["httpcsSvcInstance"]["protocolSets"]
+    assert first["body"]["httpcsSvcInstance"] is not second["body"]["httpcsSvcInstance"]
+    assert [c["body"]["httpcsSvcInstance"]["publishedHostname"] for c in (first, second, third)] == \
+        ["www0.example.com", "www1.example.com", "www2.example.com"]
+
+
+def test_parse_options():
+    """Test: Options of all supported formats
+
+    Steps:
+    1. Parse options as text, JSON, dict and list
+
+    Result:
+    OK: options are the same (name, parameters) tuples
+    """
+    expected = (("edge_cache_ttl", ("60",)), ("gzip", ()))
+    assert parse_options("edge_cache_ttl=60; gzip") == expected
+    assert parse_options('{"edge_cache_ttl": ["60"], "gzip": null}') == expected
+    assert parse_options({"edge_cache_ttl": "60", "gzip": []}) == expected
+    assert parse_options([{"name": "edge_cache_ttl", "parameters": ["60"]}, {"name": "gzip"}]) == expected
+    assert parse_options(None) == ()
+
+
+def test_csv_and_errors(builder, tmp_path):
+    """Test: Rows are read from CSV file
+
+    Steps:
+    1. Write CSV with delivery row with update uuid and row without source host
+    2. Build configs lazily
+
+    Result:
+    OK: first config has uuid and paths, second row raises ValueError
+    """
+    path = tmp_path / "inventory.csv"
+    path.write_text("uuid,published_host,source_host,published_path,profile\n"
+                    "abc,www.example.com,origin.example.com,/pub,LLNW-Custom\n"
+                    ",bad.example.com,,,\n")
+    configs = builder.iter_configs(str(path))
+
+    config = next(configs)
+    assert config["uuid"] == "abc"
+    assert config["body"]["publishedUrlPath"] == "/pub"
+    assert config["body"]["sourceUrlPath"] == ""
+    assert config["body"]["serviceProfileName"] == "LLNW-Custom"
+    with pytest.raises(ValueError):
+        next(configs)
+
+
+def test_provision(builder):
+    """Test: Rows are streamed into BulkProvisioner
+
+    Steps:
+    1. Provision 5 delivery rows and one httpcs row through fake transport
+
+    Result:
+    OK: every row is created
+    """
+    transport = FakeTransport(routes=config_api_routes(), sleep=lambda s: None)
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    rows = [{"published_host": f"www{idx}.example.com", "source_host": "origin.example.com"} for idx in range(5)]
+    rows.append({"service": "httpcs", "published_host": "live.example.com", "source_host": "origin.example.com"})
+
+    results = list(builder.provision(BulkProvisioner(client, concurrency=4), iter(rows)))
+
+    assert [r.status for r in results] == [ProvisionResult.CREATED] * 6
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.cert import SSLCertObj
+from ll_sdk.utils.config_api_helper.cert_inventory import CertificateInventory
+
+shortname = "testname"
+now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _cert(uuid, days, sans, fingerprint=None):
+    return {"uuid": uuid, "body": {"certName": uuid, "fingerprints": [fingerprint or f"fp-{uuid}"],
+                                   "expirationDate": (now + timedelta(days=days)).isoformat(),
+                                   "subjectAlternativeNames": sans, "commonName": sans[0]}}
+
+
+@pytest.fixture(scope="function")
+def account():
+    """Fixture for certificates served by fake config-api, listing contains only uuid and fingerprint"""
+    return {"a": _cert("a", 10, ["www.example.com", "example.com"]),
+            "b": _cert("b", 100, ["*.example.com"]),
+            "c": _cert("c", -5, ["old.example.org"])}
+
+
+@pytest.fixture(scope="function")
+def transport(account):
+    """Fixture for fake transport serving account certificates"""
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "customerCertificate/shortname/{shortname}", handler=lambda r, p: [
+        {"uuid": cert["uuid"], "body": {"fingerprints": cert["body"]["fingerprints"]}} for cert in account.values()])
+    transport.add_route("GET", "customerCertificate/{id}", handler=lambda r, p: account[p["id"]])
+    return transport
+
+
+def test_refresh_and_queries(account, transport):
+    """Test: Inventory downloads only new fingerprints and answers expiry and hostname queries
+
+    Steps:
+    1. Refresh, replace certificate "a", delete "c" and refresh again
+
+    Result:
+    OK: only new certificate is downloaded, indexes follow changes
+    """
+    inventory = CertificateInventory(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport),
+                                     shortname)
+    assert inventory.refresh() == 3
+    assert [r.uuid for r in inventory.expired(now)] == ["c"]
+    assert [r.uuid for r in inventory.expiring_before(now + timedelta(days=30))] == ["c", "a"]
+    assert [r.uuid for r in inventory.for_hostname("www.example.com")] == ["a", "b"]
+    assert [r.uuid for r in inventory.for_hostname("img.example.com")] == ["b"]
+    assert inventory.refresh() == 0
+
+    account["a"] = _cert("a", 365, ["www.example.com"], fingerprint="fp-a2")
+    del account["c"]
+    assert inventory.refresh() == 1
+    assert inventory.expired(now) == []
+    assert [r.uuid for r in inventory.expiring_before(now + timedelta(days=30))] == []
+    assert inventory.for_hostname("old.example.org") == []
+    assert inventory.get("a").not_after == now + timedelta(days=365)
+
+
+def test_parse_pem_with_cryptography():
+    """Test: PEM of SSLCertObj is parsed with cryptography
+
+    Result:
+    OK: SANs and expiry come from certificate, fingerprint is computed
+    """
+    pytest.importorskip("cryptography")
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "pem.example.com")])
+    cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+            .serial_number(1).not_valid_before(now).not_valid_after(now + timedelta(days=90))
+            .add_extension(x509.SubjectAlternativeName([x509.DNSName("pem.example.com"),
+                                                        x509.DNSName("Alt.Example.com")]), critical=False)
+            .sign(key, hashes.SHA256()))
+    ssl_cert = SSLCertObj()
+    ssl_cert.generate_default(shortname, cert.public_bytes(serialization.Encoding.PEM).decode(), "key")
+
+    inventory = CertificateInventory()
+    record = inventory.add(ssl_cert, "pem")
+    assert record.sans == ("alt.example.com", "pem.example.com")
+    assert record.not_after == now + timedelta(days=90)
+    assert record.fingerprint
+    assert inventory.for_hostname("alt.example.com") == [record]
+
+
+def test_refresh_by_revision(account, transport):
+    """Test: Listing without fingerprints is synchronized by revision
+
+    Steps:
+    1. Serve listing with uuid and revision only, refresh twice
+    2. Change revision of certificate "b", refresh
+
+    Result:
+    OK: unchanged certificates are not downloaded again, only changed one is
+    """
+    revisions = {uuid: 1 for uuid in account}
+    transport.add_route("GET", "customerCertificate/shortname/{shortname}", handler=lambda r, p: [
+        {"uuid": uuid, "revision": {"versionNumber": revisions[uuid]}} for uuid in account])
+    inventory = CertificateInventory(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport),
+                                     shortname)
+    assert inventory.refresh() == 3
+    assert inventory.refresh() == 0
+
+    revisions["b"] = 2
+    assert inventory.refresh() == 1
+    assert inventory.get("b").revision == 2
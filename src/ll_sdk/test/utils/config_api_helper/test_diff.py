@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+import pytest
+from ll_sdk.config_api import ConfigApiBaseException, ConfigApiClient
+from ll_sdk.utils.config_api_helper.deliver import DeliverServiceInstanceObj
+from ll_sdk.utils.config_api_helper.httpcs import HttpCsServiceInstanceObj
+from ll_sdk.utils.config_api_helper.diff import config_diff, has_changes, update_if_changed
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+
+shortname = "testname"
+
+
+@pytest.fixture(scope="function")
+def delivery():
+    """Fixture for delivery config with two protocol sets and options"""
+    config = DeliverServiceInstanceObj()
+    config.generate_default(shortname, "www.example.com", "origin.example.com", "LLNW-Generic", "https", "https")
+    config.add_protocol_set("http", "http")
+    config.add_option("refresh_absmin", [3600])
+    config.add_option("rewrite_host", ["a.example.com"])
+    return config
+
+
+def _remote(config):
+    remote = copy.deepcopy(dict(config))
+    remote.update({"uuid": "uuid-1", "shortname": shortname, "status": {"state": "COMPLETED"},
+                   "revision": {"versionNumber": 3, "createdBy": "user"}})
+    return remote
+
+
+def test_no_changes_ignores_server_fields_and_order(delivery):
+    """Test: Reordered protocol sets/options and server-only fields are not a change
+
+    Steps:
+    1. Build remote state with server-only fields, reversed protocolSets and options
+
+    Result:
+    OK: no changes
+    """
+    remote = _remote(delivery)
+    remote["body"]["protocolSets"].reverse()
+    for protocol_set in remote["body"]["protocolSets"]:
+        protocol_set["options"].reverse()
+    assert config_diff(delivery, remote) == []
+    assert not has_changes(delivery, remote)
+
+
+def test_changes_detected(delivery):
+    """Test: Changed option parameter and changed hostname are reported with path
+
+    Result:
+    OK: changes contain both paths with local and remote values
+    """
+    remote = _remote(delivery)
+    delivery.modify_options("refresh_absmin", [60])
+    delivery["body"]["sourceHostname"] = "new-origin.example.com"
+    changes = {change.path: change for change in config_diff(delivery, remote)}
+    assert changes["body.sourceHostname"].local == "new-origin.example.com"
+    assert changes["body.sourceHostname"].remote == "origin.example.com"
+    assert any(path.endswith("parameters[0]") and change.local == 60 for path, change in changes.items())
+
+
+def test_httpcs_children_order_insensitive():
+    """Test: Httpcs children are matched by video format and rewrite type
+
+    Result:
+    OK: reversed children are not a change, changed child option is
+    """
+    config = HttpCsServiceInstanceObj()
+    config.generate_default(shortname, ["hls", "hds"], "live.example.com", "origin.example.com", "LLNW-Generic",
+                            "https", "https")
+    remote = _remote(config)
+    remote["body"]["childHttpcsSvcInstances"].reverse()
+    assert not has_changes(config, remote)
+    remote["body"]["childHttpcsSvcInstances"][0]["protocolSets"][0]["options"].append(
+        {"name": "refresh_absmin", "parameters": [1]})
+    assert has_changes(config, remote)
+
+
+def test_update_if_changed(delivery):
+    """Test: Update is sent only when remote state differs
+
+    Steps:
+    1. Fake config-api returns the same config as remote state
+    2. Call update_if_changed, modify config and call it again
+
+    Result:
+    OK: first call makes only GET, second call makes PUT
+    """
+    transport = FakeTransport(routes=config_api_routes(), sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/{id}", body=_remote(delivery))
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+
+    assert update_if_changed(client, "uuid-1", delivery) is None
+    assert [m for m, _, _ in transport.requests] == ["GET"]
+
+    delivery.add_option("refresh_absmin", [1], published_protocol="http", source_protocol="http")
+    response = update_if_changed(client, "uuid-1", delivery)
+    assert response.status_code == 200
+    assert [m for m, _, _ in transport.requests] == ["GET", "GET", "PUT"]
+
+
+def test_update_if_changed_without_remote_state(delivery):
+    """Test: Update is not sent when remote state can't be fetched
+
+    Steps:
+    1. Fake config-api answers GET of service instance with 404
+    2. Call update_if_changed
+
+    Result:
+    OK: ConfigApiBaseException with status code is raised, no PUT is sent
+    """
+    transport = FakeTransport(routes=config_api_routes(), sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/{id}", body={"errors": ["not found"]}, status=404)
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+
+    with pytest.raises(ConfigApiBaseException) as error:
+        update_if_changed(client, "uuid-1", delivery)
+    assert error.value.status_code == 404
+    assert [m for m, _, _ in transport.requests] == ["GET"]
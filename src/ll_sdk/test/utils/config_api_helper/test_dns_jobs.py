@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import pytest
+from ll_sdk.config_api import ConfigApiClient, ConfigApiBaseException
+from ll_sdk.utils.client_helper.circuit_breaker import CircuitBreaker
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.dns_jobs import DnsJobTracker, DnsJobException
+
+
+@pytest.fixture(scope="function")
+def jobs():
+    return {"1": "PENDING", "2": "PENDING", "3": "PENDING"}
+
+
+@pytest.fixture(scope="function")
+def transport(jobs):
+    """Fixture for fake DNS job API, listing contains jobs 1 and 2 only"""
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "epdns/job", handler=lambda r, p: [{"id": i, "status": jobs[i]} for i in ("1", "2")])
+    transport.add_route("GET", "epdns/job/{id}", handler=lambda r, p: {"id": p["id"], "status": jobs[p["id"]]})
+    return transport
+
+
+def _requests(transport):
+    return [t.rsplit("/", 1)[-1] for m, t, r in transport.requests]
+
+
+def test_poll_multiplexes_jobs(jobs, transport):
+    """Test: One listing call per round, single gets only for jobs missing in listing
+
+    Result:
+    OK: futures resolve with job or DnsJobException
+    """
+    tracker = DnsJobTracker(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport),
+                            background=False)
+    futures = {job_id: tracker.track(job_id) for job_id in jobs}
+
+    assert tracker.poll() == 0
+    assert sorted(_requests(transport)) == ["job", "{id}"]
+
+    jobs.update({"1": "COMPLETED", "3": "FAILED"})
+    assert tracker.poll() == 2
+    assert futures["1"].result(0)["status"] == "COMPLETED"
+    assert isinstance(futures["3"].exception(0), DnsJobException)
+    assert tracker.pending() == ["2"]
+
+
+def test_background_poller_and_async(jobs, transport):
+    """Test: Background poller resolves futures and awaitables and stops when nothing is tracked
+
+    Result:
+    OK: awaited job result returned, poller thread ends
+    """
+    for job_id in jobs:
+        jobs[job_id] = "COMPLETED"
+    tracker = DnsJobTracker(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport), interval=0.01)
+
+    async def wait_all():
+        return await asyncio.gather(*(tracker.track_async(job_id) for job_id in ("1", "3")))
+
+    results = asyncio.run(asyncio.wait_for(wait_all(), 5))
+    assert [job["id"] for job in results] == ["1", "3"]
+    assert tracker.track("2").result(5)["status"] == "COMPLETED"
+    tracker.join(5)
+    assert tracker.pending() == []
+
+
+def test_poller_survives_open_circuit(jobs, transport):
+    """Test: Background poller keeps running while circuit of the job API is open
+
+    Steps:
+    1. Job API fails until circuit trips, then returns completed jobs
+
+    Result:
+    OK: job future resolves after circuit closes again
+    """
+    calls = []
+
+    def listing(request, path_params):
+        calls.append(request)
+        if len(calls) <= 2:
+            return 503, {}
+        return [{"id": "1", "status": "COMPLETED"}]
+
+    transport.add_route("GET", "epdns/job", handler=listing)
+    transport.add_route("GET", "epdns/job/{id}", status=503, body={})
+    breaker = CircuitBreaker(window_size=2, min_calls=2, reset_timeout=0.05)
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport, circuit_breaker=breaker)
+    tracker = DnsJobTracker(client, interval=0.01, max_interval=0.02)
+
+    assert tracker.track("1").result(5)["status"] == "COMPLETED"
+    tracker.join(5)
+
+
+def test_job_timeout(transport):
+    """Test: Job which never shows up fails after timeout
+
+    Steps:
+    1. Track job missing in listing and unknown to get_dns_job
+
+    Result:
+    OK: future fails with DnsJobException, poller ends
+    """
+    transport.add_route("GET", "epdns/job/{id}", status=404, body={"errors": ["not found"]})
+    tracker = DnsJobTracker(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport),
+                            interval=0.01, timeout=0.05)
+    with pytest.raises(DnsJobException):
+        tracker.track("9").result(5)
+    tracker.join(5)
+    assert tracker.pending() == []
+
+
+def test_permanent_polling_failure(transport):
+    """Test: Pending jobs fail after max_failures consecutive failed rounds
+
+    Steps:
+    1. Job API answers 403 to every call
+
+    Result:
+    OK: future fails with ConfigApiBaseException 403
+    """
+    transport.add_route("GET", "epdns/job", status=403, body={"errors": ["forbidden"]})
+    transport.add_route("GET", "epdns/job/{id}", status=403, body={"errors": ["forbidden"]})
+    tracker = DnsJobTracker(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport),
+                            interval=0.01, max_interval=0.01, max_failures=3)
+    with pytest.raises(ConfigApiBaseException) as error:
+        tracker.track("1").result(5)
+    assert error.value.status_code == 403
+    assert len([t for m, t, r in transport.requests if t.endswith("epdns/job")]) == 3
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import itertools
+import json
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.dns_plan import DnsPlan, StepResult
+
+shortname = "testname"
+zone = "example.com"
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake DNS API assigning sequential ids to created objects, attachments have no own id"""
+    ids = itertools.count(1)
+    transport = FakeTransport(sleep=lambda s: None)
+
+    def create(request, path_params):
+        body = json.loads(request.body)
+        body["id"] = next(ids)
+        return body
+
+    for endpoint in ("resource", "resource/{id}/healthcheck", "zone/{zone}/failover", "rule",
+                     "zone/{zone}/directorpolicy"):
+        transport.add_route("POST", f"epdns/shortname/{{shortname}}/{endpoint}", handler=create)
+    transport.add_route("POST", "epdns/shortname/{shortname}/zone/{zone}/failover/{id}/resource",
+                        handler=lambda request, path_params: json.loads(request.body))
+    for endpoint in ("resource/{id}", "resource/{id}/healthcheck/{id}", "zone/{zone}/failover/{id}",
+                     "zone/{zone}/failover/{id}/resource/{id}", "rule/{id}", "zone/{zone}/directorpolicy/{id}"):
+        transport.add_route("DELETE", f"epdns/shortname/{{shortname}}/{endpoint}", status=204, body=None)
+    return transport
+
+
+def _plan(client):
+    plan = DnsPlan(client, shortname, concurrency=4)
+    resource = plan.resource("origin", {"name": "origin"})
+    plan.health_check("origin-hc", resource, {"type": "HTTP"})
+    failover = plan.failover("fo", zone, {"name": "fo"})
+    plan.resource_to_failover("fo-origin", zone, failover, {"resourceId": resource})
+    rule = plan.rule("rule", {"name": "geo"})
+    plan.director_policy("policy", zone, {"ruleId": rule, "failoverId": failover})
+    return plan
+
+
+def test_apply(transport):
+    """Test: Plan creates all objects and passes created ids to dependent steps
+
+    Result:
+    OK: all steps created, dependent bodies and paths contain created ids
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    plan = _plan(client)
+    assert plan.dependencies()["policy"] == ["rule", "fo"]
+    results = {result.name: result for result in plan.apply()}
+
+    assert all(result.status == StepResult.CREATED for result in results.values())
+    posts = {r.url.split("/testname/", 1)[1]: json.loads(r.body) for m, t, r in transport.requests if m == "POST"}
+    assert posts["zone/example.com/directorpolicy"] == {"ruleId": results["rule"].id, "failoverId": results["fo"].id}
+    assert posts[f"zone/example.com/failover/{results['fo'].id}/resource"] == {"resourceId": results["origin"].id}
+    assert f"resource/{results['origin'].id}/healthcheck" in posts
+
+
+def test_rollback_on_failure(transport):
+    """Test: Failed step rolls back everything already created
+
+    Steps:
+    1. Fail creation of director policy
+
+    Result:
+    OK: policy failed, created objects deleted, children before parents
+    """
+    transport.add_route("POST", "epdns/shortname/{shortname}/zone/{zone}/directorpolicy", status=400,
+                        body={"errors": ["bad rule"]})
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    results = {result.name: result for result in _plan(client).apply()}
+
+    assert results["policy"].status == StepResult.FAILED
+    assert results["policy"].error.status_code == 400
+    rolled_back = [name for name, result in results.items() if result.status == StepResult.ROLLED_BACK]
+    assert set(rolled_back) | {"policy"} == set(results)
+    deletes = [r.url for m, t, r in transport.requests if m == "DELETE"]
+    assert len(deletes) == len(rolled_back)
+    failover_delete = deletes.index(next(u for u in deletes if u.endswith(f"/failover/{results['fo'].id}")))
+    attach_delete = deletes.index(next(u for u in deletes if "/failover/" in u and u.count("/resource/")))
+    assert attach_delete < failover_delete
+    assert deletes[attach_delete].endswith(f"/failover/{results['fo'].id}/resource/{results['origin'].id}")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.config_api_helper.instance_index import InstanceIndex
+from ll_sdk.utils.config_api_helper.mirror import ConfigMirror
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+
+shortname = "testname"
+
+
+def _instance(uuid, hostname, path="", options=()):
+    return {"uuid": uuid, "revision": {"versionNumber": 1},
+            "body": {"publishedHostname": hostname, "publishedUrlPath": path,
+                     "protocolSets": [{"publishedProtocol": "https", "sourceProtocol": "https",
+                                       "options": [{"name": name, "parameters": params} for name, params in options]}]}}
+
+
+@pytest.fixture(scope="function")
+def instances():
+    """Fixture for delivery and httpcs instances sharing hostnames"""
+    httpcs = {"uuid": "live", "body": {
+        "httpcsSvcInstance": {"publishedHostname": "live.example.com", "publishedUrlPath": "/hls",
+                              "protocolSets": []},
+        "childHttpcsSvcInstances": [{"protocolSets": [{"options": [{"name": "refresh_absmin",
+                                                                    "parameters": [60]}]}]}]}}
+    return [
+        _instance("root", "www.example.com", "/", [("refresh_absmin", [3600])]),
+        _instance("video", "www.example.com", "/video", [("rewrite_host", ["cdn.example.com"])]),
+        _instance("other", "img.other.com", "/", [("refresh_absmin", [3600])]),
+        httpcs,
+    ]
+
+
+def test_queries(instances):
+    """Test: Hostname, domain, path and option queries
+
+    Result:
+    OK: queries return expected uuids
+    """
+    index = InstanceIndex(instances)
+    assert index.by_hostname("WWW.example.com.") == {"root", "video"}
+    assert index.by_domain("example.com") == {"root", "video", "live"}
+    assert index.by_path_prefix("www.example.com", "/video") == {"video"}
+    assert index.serving("www.example.com", "/video/a.mp4") == {"video"}
+    assert index.serving("www.example.com", "/images/a.png") == {"root"}
+    assert index.serving("unknown.example.com", "/") == set()
+    assert index.by_option("refresh_absmin") == {"root", "other", "live"}
+    assert index.by_option_parameter("refresh_absmin", 3600) == {"root", "other"}
+    assert index.by_option_parameter("refresh_absmin", 60) == {"live"}
+
+
+def test_incremental_updates(instances):
+    """Test: Replaced and removed instances leave no stale postings
+
+    Result:
+    OK: old hostname/options are gone, internal structures are pruned
+    """
+    index = InstanceIndex(instances)
+    index.add(_instance("video", "vod.example.com", "/", [("cache_control", ["max-age=60"])]))
+    assert index.by_hostname("www.example.com") == {"root"}
+    assert index.by_hostname("vod.example.com") == {"video"}
+    assert index.by_option("rewrite_host") == set()
+    index.remove("other")
+    assert index.by_domain("other.com") == set()
+    assert "com" in index._hostnames.root.children and "other" not in index._hostnames.root.children["com"].children
+    assert len(index) == 3
+
+
+def test_from_mirror():
+    """Test: Index built from mirror follows mirror syncs
+
+    Result:
+    OK: created instance is found, deleted instance is removed
+    """
+    state = {"a": _instance("a", "a.example.com")}
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/shortname/{shortname}", handler=lambda r, p: list(state.values()))
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    mirror = ConfigMirror(client, shortname, families=["delivery"])
+    mirror.sync()
+    index = InstanceIndex.from_mirror(mirror)
+    assert index.by_hostname("a.example.com") == {"a"}
+
+    state["b"] = _instance("b", "b.example.com")
+    del state["a"]
+    mirror.sync()
+    assert index.by_domain("example.com") == {"b"}
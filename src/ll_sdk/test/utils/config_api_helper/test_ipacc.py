@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import ipaddress
+import random
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.ipacc import IpaccLookup, PrefixTrie
+
+shortname = "testname"
+blocks = {
+    "office": ["10.0.0.0/8", {"ip": "192.168.1.0", "prefixLength": 24}, "2001:db8::/32"],
+    "vpn": ["10.1.0.0/16", "2001:db8:1::/48"],
+}
+
+
+@pytest.fixture(scope="function")
+def lookup():
+    """Fixture for IPACC lookup compiled from fake config-api"""
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "ipaclist/shortname/{shortname}", body=[{"uuid": uuid} for uuid in blocks])
+    transport.add_route("GET", "ipaclist/{id}/blocks", handler=lambda r, p: {"blocks": blocks[p["id"]]})
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    return IpaccLookup.from_client(client, shortname)
+
+
+def test_lookup(lookup):
+    """Test: The most specific block wins for IPv4 and IPv6
+
+    Result:
+    OK: owners of the longest matching prefix are returned
+    """
+    assert len(lookup) == 5
+    assert lookup.lookup("10.2.3.4") == ("office",)
+    assert lookup.lookup("10.1.3.4") == ("vpn",)
+    assert lookup.lookup("192.168.1.77") == ("office",)
+    assert lookup.lookup("2001:db8:1::5") == ("vpn",)
+    assert lookup.lookup("2001:db8:2::5") == ("office",)
+    assert not lookup.contains("11.0.0.1")
+    assert lookup.contains_many(["10.0.0.1", "8.8.8.8", "2001:db8::1"]) == [True, False, True]
+
+
+def test_prefix_trie_matches_linear_scan():
+    """Test: Patricia trie longest match equals linear scan over random prefixes
+
+    Result:
+    OK: results are the same for random addresses
+    """
+    rnd = random.Random(7)
+    networks = {ipaddress.ip_network((rnd.getrandbits(32), rnd.randint(0, 32)), strict=False) for _ in range(300)}
+    trie = PrefixTrie(32)
+    for network in networks:
+        trie.insert(int(network.network_address), network.prefixlen, str(network))
+    assert len(trie) == len(networks)
+    for _ in range(2000):
+        address = ipaddress.ip_address(rnd.getrandbits(32))
+        matching = [n for n in networks if address in n]
+        expected = str(max(matching, key=lambda n: n.prefixlen)) if matching else None
+        match = trie.longest_match(int(address))
+        assert (match[2] if match else None) == expected
+
+
+def test_contains_many_numpy(lookup):
+    """Test: Vectorized batch check of IPv4 integers
+
+    Result:
+    OK: numpy result equals scalar lookups
+    """
+    np = pytest.importorskip("numpy")
+    addresses = np.array([int(ipaddress.ip_address(ip)) for ip in ("10.0.0.1", "8.8.8.8", "192.168.1.1",
+                                                                   "192.168.2.1")], dtype=np.uint32)
+    assert lookup.contains_many(addresses).tolist() == [True, False, True, False]
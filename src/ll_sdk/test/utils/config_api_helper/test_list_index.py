@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from ll_sdk.utils.config_api_helper.deliver import DeliverServiceInstanceObj
+from ll_sdk.utils.config_api_helper.list_index import ListIndex
+
+
+def test_find_and_sync():
+    """Test: Index returns position of the first item and follows list mutations
+
+    Steps:
+    1. Look up items, append, delete, replace item in place, replace list
+
+    Result:
+    OK: every lookup matches linear search
+    """
+    index = ListIndex(lambda item: item.get("name"))
+    items = [{"name": "a"}, {"name": "b"}, {"name": "a"}]
+    assert index.find(items, "a") == 0 and index.find(items, "b") == 1 and index.find(items, "c") is None
+    items.append({"name": "c"})
+    index.appended(items)
+    assert index.find(items, "c") == 3
+    del items[0]
+    assert index.find(items, "a") == 1 and index.find(items, "c") == 2
+    items[1] = {"name": "d"}
+    assert index.find(items, "a") is None and index.find(items, "d") == 1
+    assert index.find([{"name": "x"}], "x") == 0
+
+
+def test_delivery_option_edits():
+    """Test: Many option edits of delivery instance keep indexes in sync
+
+    Steps:
+    1. Add 300 options to both protocol sets, modify and remove some of them
+
+    Result:
+    OK: modified and removed options are the expected ones
+    """
+    config = DeliverServiceInstanceObj()
+    config.generate_default("testname", "www.example.com", "origin.example.com", "LLNW-Generic",
+                            ["https", "http"], ["https", "http"])
+    for idx in range(300):
+        config.add_option(f"option_{idx}", [str(idx)])
+    config.add_option("option_5", ["dup"], "https", "https")
+    for idx in range(0, 300, 3):
+        config.modify_options(f"option_{idx}", ["modified"])
+    config.remove_option("option_5", "https", "https")
+    config.remove_option("option_7")
+
+    https, http = config["body"]["protocolSets"]
+    names = [option["name"] for option in https["options"]]
+    assert "option_7" not in names and names.count("option_5") == 1
+    assert https["options"][-1] == {"name": "option_5", "parameters": ["dup"]}
+    assert len(http["options"]) == 299
+    assert all(option["parameters"] == (["modified"] if int(option["name"].split("_")[1]) % 3 == 0
+                                        else [option["name"].split("_")[1]]) for option in http["options"])
+
+
+def test_delete_then_append_and_replace():
+    """Test: Index is not stale after delete + append or item replacement with unchanged length
+
+    Steps:
+    1. Delete item and append another one, so length is the same as when index was built
+    2. Replace item with items[i] = ...
+
+    Result:
+    OK: new and replaced items are found, removed ones are not
+    """
+    index = ListIndex(lambda item: item.get("name"))
+    items = [{"name": "a"}, {"name": "b"}]
+    assert index.find(items, "b") == 1
+    del items[0]
+    items.append({"name": "c"})
+    assert index.find(items, "c") == 1 and index.find(items, "b") == 0 and index.find(items, "a") is None
+    items[0] = {"name": "d"}
+    assert index.find(items, "d") == 0 and index.find(items, "b") is None
+
+
+def test_delivery_edits_after_delete():
+    """Test: Delivery lookups after deleting protocol sets and options
+
+    Steps:
+    1. Clear https/https protocol set and add https/http one, add option to it
+    2. Remove option, add another one and modify it
+
+    Result:
+    OK: option is added only to https/http protocol set, added option is modified
+    """
+    config = DeliverServiceInstanceObj()
+    config.generate_default("testname", "www.example.com", "origin.example.com", "LLNW-Generic",
+                            ["https", "http"], ["https", "http"])
+    config.clear_protocol_set("https", "https")
+    config.add_protocol_set("https", "http")
+    config.add_option("opt_a", ["1"], "https", "http")
+    http, mixed = config["body"]["protocolSets"]
+    assert http["options"] == [] and mixed["options"] == [{"name": "opt_a", "parameters": ["1"]}]
+
+    config.add_option("opt_b", ["2"], "https", "http")
+    config.remove_option("opt_a", "https", "http")
+    config.add_option("opt_c", ["3"], "https", "http")
+    config.modify_options("opt_c", ["4"], "https", "http")
+    assert mixed["options"] == [{"name": "opt_b", "parameters": ["2"]}, {"name": "opt_c", "parameters": ["4"]}]
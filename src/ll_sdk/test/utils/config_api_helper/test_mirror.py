@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.config_api_helper.mirror import ConfigMirror
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+
+shortname = "testname"
+
+
+def _instance(uuid, version):
+    return {"uuid": uuid, "revision": {"versionNumber": version}, "body": {"publishedHostname": f"{uuid}.com"}}
+
+
+class Account(object):
+    """Fake account state served by fake transport, listing returns only uuid and revision"""
+
+    def __init__(self):
+        self.instances = {"a": _instance("a", 1), "b": _instance("b", 1)}
+
+    def listing(self, request, path_params):
+        return [{"uuid": i["uuid"], "revision": i["revision"]} for i in self.instances.values()]
+
+    def get(self, request, path_params):
+        return self.instances[path_params["id"]]
+
+
+@pytest.fixture(scope="function")
+def account():
+    return Account()
+
+
+@pytest.fixture(scope="function")
+def transport(account):
+    """Fixture for fake transport serving delivery instances of account"""
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/shortname/{shortname}", handler=account.listing)
+    transport.add_route("GET", "svcinst/delivery/{id}", handler=account.get)
+    return transport
+
+
+def _gets(transport):
+    return [t for m, t, _ in transport.requests if t.endswith("svcinst/delivery/{id}")]
+
+
+def test_incremental_sync(account, transport, tmp_path):
+    """Test: Mirror fetches only changed objects and persists them
+
+    Steps:
+    1. Sync account
+    2. Change one instance, delete another one, add new one and sync again
+    3. Open mirror from the same file
+
+    Result:
+    OK: only changed and new instances are fetched, deleted one is removed, data survives reopen
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    path = str(tmp_path / "mirror.db")
+    mirror = ConfigMirror(client, shortname, path=path, families=["delivery"])
+    report, = mirror.sync()
+    assert (report.created, report.updated, report.deleted) == (2, 0, 0)
+    assert len(_gets(transport)) == 2
+
+    account.instances["a"] = _instance("a", 2)
+    del account.instances["b"]
+    account.instances["c"] = _instance("c", 1)
+    transport.requests.clear()
+    report, = mirror.sync()
+    assert (report.created, report.updated, report.deleted, report.unchanged) == (1, 1, 1, 0)
+    assert len(_gets(transport)) == 2
+    assert mirror.get("delivery", "a")["revision"]["versionNumber"] == 2
+    mirror.close()
+
+    reopened = ConfigMirror(client, shortname, path=path, families=["delivery"])
+    assert sorted(i["uuid"] for i in reopened.list("delivery")) == ["a", "c"]
+    transport.requests.clear()
+    report, = reopened.sync()
+    assert report.unchanged == 2 and not _gets(transport)
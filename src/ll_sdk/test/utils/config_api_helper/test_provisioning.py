@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.config_api_helper.deliver import DeliverServiceInstanceObj
+from ll_sdk.utils.config_api_helper.httpcs import HttpCsServiceInstanceObj
+from ll_sdk.utils.config_api_helper.provisioning import BulkProvisioner, ProvisionResult
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+from ll_sdk.utils.client_helper.rate_limiter import RateLimiter
+
+shortname = "testname"
+invalid_host = "invalid.example.com"
+
+
+def _validate(request, path_params):
+    body = json.loads(request.body)
+    hostname = body["body"].get("httpcsSvcInstance", body["body"])["publishedHostname"]
+    if hostname == invalid_host:
+        return {"Success": False, "errors": ["invalid hostname"]}
+    return {"Success": True}
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake transport validating every hostname except invalid_host"""
+    transport = FakeTransport(routes=config_api_routes(), sleep=lambda s: None)
+    for service in ("delivery", "httpcs"):
+        transport.add_route("POST", f"svcinst/{service}/validate", handler=_validate)
+    return transport
+
+
+def _configs(hosts):
+    configs = []
+    for host in hosts:
+        config = DeliverServiceInstanceObj()
+        config.generate_default(shortname, host, "origin.example.com", "LLNW-Generic", "https", "https")
+        configs.append(config)
+    httpcs = HttpCsServiceInstanceObj()
+    httpcs.generate_default(shortname, "hls", "live.example.com", "origin.example.com", "LLNW-Generic",
+                            "https", "https")
+    configs.append(httpcs)
+    return configs
+
+
+def test_provision(transport):
+    """Test: Only valid configs are created
+
+    Steps:
+    1. Provision 3 delivery configs (one invalid) and one httpcs config
+
+    Result:
+    OK: invalid config is reported and not created, others are created with uuid
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    provisioner = BulkProvisioner(client, concurrency=4, rate_limiter=RateLimiter(1000))
+    results = list(provisioner.provision(_configs(["a.example.com", invalid_host, "b.example.com"])))
+
+    assert [r.status for r in results] == [ProvisionResult.CREATED, ProvisionResult.INVALID,
+                                           ProvisionResult.CREATED, ProvisionResult.CREATED]
+    assert results[3].service == "httpcs"
+    assert all(r.uuid for r in results if r.ok)
+    assert results[1].errors == {"Success": False, "errors": ["invalid hostname"]}
+    created = [t for m, t, _ in transport.requests if m == "POST" and t.endswith("svcinst/delivery")]
+    assert len(created) == 2
+    assert BulkProvisioner.summary(results) == {"created": 3, "invalid": 1}
+
+
+def test_provision_update_and_failure(transport):
+    """Test: Config with uuid is updated, API error is reported as failed
+
+    Result:
+    OK: statuses are updated and failed
+    """
+    transport.add_route("PUT", "svcinst/delivery/{id}", status=500, body={"errors": ["boom"]})
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    config = _configs(["a.example.com"])[0]
+    results = list(BulkProvisioner(client).provision([("uuid-1", config)]))
+    assert results[0].status == ProvisionResult.FAILED
+    assert results[0].uuid == "uuid-1"
+
+
+def test_all_or_nothing(transport):
+    """Test: Nothing is submitted if at least one config is invalid
+
+    Result:
+    OK: valid configs are skipped
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    results = BulkProvisioner(client).provision_all_or_nothing(_configs(["a.example.com", invalid_host]))
+    assert [r.status for r in results] == [ProvisionResult.SKIPPED, ProvisionResult.INVALID,
+                                           ProvisionResult.SKIPPED]
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+import json
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+from ll_sdk.utils.config_api_helper.deliver import DeliverServiceInstanceObj
+from ll_sdk.utils.config_api_helper.reconciler import Reconciler, PlanAction, ApplyResult, load_desired_state
+
+shortname = "testname"
+
+
+def _delivery(host, uuid=None, version=1):
+    config = DeliverServiceInstanceObj()
+    config.generate_default(shortname, host, "origin.example.com", "LLNW-Generic", "https", "https")
+    config = json.loads(json.dumps(config))
+    if uuid is not None:
+        config.update({"uuid": uuid, "shortname": shortname, "status": {}, "revision": {"versionNumber": version}})
+    return config
+
+
+@pytest.fixture(scope="function")
+def actual():
+    """Fixture for actual delivery instances of account"""
+    return [_delivery("same.example.com", "u-same"), _delivery("changed.example.com", "u-changed"),
+            _delivery("old.example.com", "u-old"), _delivery("rollback.example.com", "u-rollback", 5)]
+
+
+@pytest.fixture(scope="function")
+def desired(actual, tmp_path):
+    """Fixture for desired state directory"""
+    changed = _delivery("changed.example.com")
+    changed["body"]["sourceHostname"] = "new-origin.example.com"
+    objects = {"delivery/same.json": _delivery("same.example.com"), "delivery/changed.json": changed,
+               "delivery/new.json": [_delivery("new.example.com")],
+               "delivery/rollback.json": dict(_delivery("rollback.example.com"), rollbackTo=3),
+               "certificate/cert.json": {"body": {"certName": "www", "cert": "PEM", "certKey": "KEY",
+                                                  "subjectAlternativeNames": ["*.example.com"]},
+                                         "accounts": [{"shortname": shortname}]}}
+    for name, obj in objects.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps(obj))
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="function")
+def transport(actual):
+    """Fixture for fake config-api serving actual instances"""
+    transport = FakeTransport(routes=config_api_routes(instances=copy.deepcopy(actual)), sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/httpcs/shortname/{shortname}", body=[])
+    transport.add_route("POST", "customerCertificate", body={"uuid": "c-1"})
+    transport.add_route("POST", "svcinst/delivery/{id}/rollbackTo/{id}", body=None, status=204)
+    return transport
+
+
+def test_plan_and_apply(desired, transport):
+    """Test: Plan contains only real changes, apply keeps dependency order
+
+    Result:
+    OK: create/update/rollback/delete planned, certificate created before service instances
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    reconciler = Reconciler(client, shortname, prune=True)
+    plan = reconciler.plan(load_desired_state(desired))
+    assert sorted((a.action, a.key[1]) for a in plan) == [
+        ("create", "new.example.com"), ("create", "www"), ("delete", "old.example.com"),
+        ("rollback", "rollback.example.com"), ("update", "changed.example.com")]
+
+    transport.requests.clear()
+    results = reconciler.apply(plan)
+    assert all(r.status == ApplyResult.DONE for r in results)
+    assert {r.action.key[1]: r.uuid for r in results}["www"] == "c-1"
+    writes = [t for m, t, r in transport.requests if m != "GET"]
+    assert writes[0].endswith("customerCertificate")
+    assert any(t.endswith("rollbackTo/{id}") for t in writes)
+    assert len(writes) == 5
+
+
+def test_apply_failure_is_reported(desired, transport):
+    """Test: Failed certificate skips dependent service instance actions
+
+    Result:
+    OK: certificate failed, service instance create/update/rollback skipped, delete done
+    """
+    transport.add_route("POST", "customerCertificate", status=400, body={"errors": ["bad cert"]})
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    results = Reconciler(client, shortname, prune=True).reconcile(desired)
+    statuses = {(r.action.action, r.action.family): r.status for r in results}
+    assert statuses[(PlanAction.CREATE, "certificate")] == ApplyResult.FAILED
+    assert statuses[(PlanAction.CREATE, "delivery")] == ApplyResult.SKIPPED
+    assert statuses[(PlanAction.DELETE, "delivery")] == ApplyResult.DONE
+
+
+def test_unrelated_certificate_failure(transport):
+    """Test: Service instance depends only on certificates covering its published hostname
+
+    Steps:
+    1. Plan certificate of other.example.org and certificate of new.example.com, only the first one fails
+    2. Plan create of new.example.com delivery instance
+
+    Result:
+    OK: delivery instance depends on matching certificate only and is created
+    """
+    transport.add_route("POST", "customerCertificate",
+                        handler=lambda request, params: (400, {"errors": ["bad cert"]})
+                        if "other.example.org" in str(request.body) else (200, {"uuid": "c-2"}))
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    reconciler = Reconciler(client, shortname)
+    desired = [("certificate", {"body": {"certName": "other", "subjectAlternativeNames": ["other.example.org"]}}),
+               ("certificate", {"body": {"certName": "new", "commonName": "new.example.com"}}),
+               ("delivery", _delivery("new.example.com"))]
+    plan = reconciler.plan(desired)
+    keys = [action.key[1] for action in plan]
+    assert reconciler.dependencies(plan)[keys.index("new.example.com")] == [keys.index("new")]
+
+    statuses = {r.action.key[1]: r.status for r in reconciler.apply(plan)}
+    assert statuses == {"other": ApplyResult.FAILED, "new": ApplyResult.DONE, "new.example.com": ApplyResult.DONE}
+
+
+def test_rollback_is_idempotent(desired, transport):
+    """Test: Rollback is planned only when current state differs from target version
+
+    Steps:
+    1. Serve version 3 of rollback.example.com equal to its current state, plan
+
+    Result:
+    OK: no rollback action planned
+    """
+    transport.add_route("GET", "svcinst/delivery/{id}/versions/{id}", body=_delivery("rollback.example.com"))
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    plan = Reconciler(client, shortname).plan(load_desired_state(desired))
+    assert [a for a in plan if a.action == PlanAction.ROLLBACK] == []
+
+
+def test_rollback_of_certificate_is_rejected(transport):
+    """Test: rollbackTo of family without rollback support fails at plan time
+
+    Result:
+    OK: ValueError raised by plan()
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    with pytest.raises(ValueError):
+        Reconciler(client, shortname).plan([("certificate", {"body": {"certName": "www"}, "rollbackTo": 2})])
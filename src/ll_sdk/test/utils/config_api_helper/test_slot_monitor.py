@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.slot_monitor import SlotMonitor
+
+shortname = "testname"
+
+
+class Clock(object):
+    """Manual clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def states():
+    return {"s1": "IDLE", "s2": "ACTIVE"}
+
+
+@pytest.fixture(scope="function")
+def transport(states):
+    """Fixture for fake transport with two live slots and one webrtc slot"""
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "live/shortname/{shortname}/slots",
+                        handler=lambda r, p: [{"id": slot_id} for slot_id in states])
+    transport.add_route("GET", "live/shortname/{shortname}/slots/{id}/status",
+                        handler=lambda r, p: {"state": states[r.url.split("/")[-2]]})
+    transport.add_route("GET", "webrtc/shortname/{shortname}/slots", body={"slots": [{"slotId": "w1"}]})
+    transport.add_route("GET", "webrtc/shortname/{shortname}/slots/{id}", body={"slotId": "w1", "status": "OFFLINE"})
+    return transport
+
+
+def _polled(transport, slot_id):
+    return len([r for m, t, r in transport.requests if f"/slots/{slot_id}" in r.url])
+
+
+def test_adaptive_polling(states, transport):
+    """Test: Idle slots back off, active slots keep min interval, changes are published
+
+    Steps:
+    1. Discover and poll for 40 seconds of manual clock
+    2. Change idle slot state
+
+    Result:
+    OK: active slot is polled more often than idle, change event is published and resets interval
+    """
+    clock = Clock()
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    monitor = SlotMonitor(client, [shortname], min_interval=1, max_interval=16, clock=clock)
+    events = []
+    monitor.subscribe(events.append)
+    monitor.discover()
+    assert len(monitor) == 3
+
+    while clock.now < 40:
+        monitor.poll()
+        clock.now += 1
+    assert {(e.slot_id, e.new_state) for e in events} == {("s1", "IDLE"), ("s2", "ACTIVE"), ("w1", "OFFLINE")}
+    assert _polled(transport, "s2") == 40
+    assert _polled(transport, "s1") < 10
+    assert monitor.states()[("webrtc", shortname, "w1")] == "OFFLINE"
+
+    states["s1"] = "ACTIVE"
+    clock.now += monitor.next_due()
+    events.clear()
+    for _ in range(17):
+        monitor.poll()
+        clock.now += 1
+    assert [(e.slot_id, e.old_state, e.new_state) for e in events] == [("s1", "IDLE", "ACTIVE")]
+
+
+def test_discover_drops_removed_slots(states, transport):
+    """Test: Slot removed from listing is not monitored anymore
+
+    Result:
+    OK: slot is dropped
+    """
+    monitor = SlotMonitor(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport), [shortname],
+                          kinds=("live",))
+    monitor.discover()
+    del states["s1"]
+    monitor.discover()
+    assert list(monitor.states()) == [("live", shortname, "s2")]
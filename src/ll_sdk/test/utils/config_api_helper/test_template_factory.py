@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from ll_sdk.utils.config_api_helper.templates.factory import compile_template, clone_json
+from ll_sdk.utils.config_api_helper.templates.httpcs_template import _http_cs_service_instance_template
+from ll_sdk.utils.config_api_helper.httpcs import HttpCsServiceInstanceObj
+
+
+def test_compiled_template_returns_fresh_copies():
+    """Test: Compiled template factory returns independent copies equal to template
+
+    Steps:
+    1. Compile template, create two copies, mutate the first one
+
+    Result:
+    OK: second copy and template are unchanged, later template changes don't leak into factory
+    """
+    template = {"a": [{"b": 1, "c": None}], "d": {"e": "x", "f": True}, "g": (1, 2)}
+    factory = compile_template(template)
+    first, second = factory(), factory()
+    assert first == template and second == template
+    first["a"][0]["b"] = 2
+    first["d"]["e"] = "y"
+    assert second == template and template["a"][0]["b"] == 1
+    template["d"]["e"] = "z"
+    assert factory()["d"]["e"] == "x"
+    assert compile_template(_http_cs_service_instance_template)() == _http_cs_service_instance_template
+
+
+def test_clone_json():
+    """Test: clone_json copies containers and keeps scalars"""
+    value = {"a": [{"b": [1, "2"]}], "c": 1.5}
+    cloned = clone_json(value)
+    assert cloned == value
+    assert cloned["a"] is not value["a"] and cloned["a"][0]["b"] is not value["a"][0]["b"]
+
+
+def test_httpcs_children_protocol_sets_independent():
+    """Test: Protocol sets added to all children are independent objects
+
+    Result:
+    OK: option added to one child is not visible in other children and root
+    """
+    httpcs = HttpCsServiceInstanceObj()
+    httpcs.generate_default("testname", ["hls"], published_protocol="https", source_protocol="https",
+                            profile_name="LLNW-Generic")
+    httpcs.add_child_option("opt", ["1"], child_idx=1)
+    children = httpcs["body"]["childHttpcsSvcInstances"]
+    assert children[1]["protocolSets"][0]["options"] == [{"name": "opt", "parameters": ["1"]}]
+    assert children[0]["protocolSets"][0]["options"] == []
+    assert httpcs["body"]["httpcsSvcInstance"]["protocolSets"][0]["options"] == []
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+import requests
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.circuit_breaker import CircuitBreakerOpenException
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.transaction import BatchTransaction, TransactionException
+
+shortname = "testname"
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake config-api, update of uuid-2 is rejected"""
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/{id}/versions",
+                        body=[{"versionNumber": 3}, {"versionNumber": 7}, {"versionNumber": 5}])
+    transport.add_route("PUT", "svcinst/delivery/{id}",
+                        handler=lambda request, params: (400, {"errors": ["bad"]}) if request.url.endswith("uuid-2")
+                        else (200, {"uuid": request.url.rsplit("/", 1)[1]}))
+    transport.add_route("POST", "svcinst/delivery/{id}/rollbackTo/{id}", body=None, status=204)
+    return transport
+
+
+def _updates(uuids):
+    return [(uuid, {"body": {"publishedHostname": f"{uuid}.example.com"}}) for uuid in uuids]
+
+
+def _raise_open_circuit(request, path_params):
+    raise CircuitBreakerOpenException("svcinst/delivery/{id}", "test")
+
+
+def _calls(transport, method):
+    return [r.url.split("/svcinst/delivery/", 1)[1] for m, t, r in transport.requests if m == method]
+
+
+def test_commit(transport):
+    """Test: Successful batch is not rolled back
+
+    Result:
+    OK: versions recorded, all updates applied, no rollback calls
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    result = BatchTransaction(client, shortname).apply(_updates(["uuid-1", "uuid-3"]))
+    assert result.committed and not result.rollbacks
+    assert result.versions == {"uuid-1": 7, "uuid-3": 7}
+    assert sorted(_calls(transport, "PUT")) == ["uuid-1", "uuid-3"]
+    assert not _calls(transport, "POST")
+
+
+def test_rollback_on_failure(transport):
+    """Test: Failed update stops the batch and applied updates are rolled back to recorded version
+
+    Steps:
+    1. Apply 4 updates one by one, the second is rejected
+
+    Result:
+    OK: uuid-3 and uuid-4 not updated, only uuid-1 rolled back to version 7
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    transaction = BatchTransaction(client, shortname, concurrency=1)
+    result = transaction.apply(_updates(["uuid-1", "uuid-2", "uuid-3", "uuid-4"]))
+    assert not result.committed and result.rolled_back
+    assert [update.result for update in result.updates[2:]] == [None, None]
+    assert _calls(transport, "PUT") == ["uuid-1", "uuid-2"]
+    assert _calls(transport, "POST") == ["uuid-1/rollbackTo/7"]
+
+
+def test_record_failure(transport):
+    """Test: Nothing is updated when pre-change version can't be recorded
+
+    Result:
+    OK: TransactionException raised, no update calls
+    """
+    transport.add_route("GET", "svcinst/delivery/{id}/versions", body=[])
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    with pytest.raises(TransactionException):
+        BatchTransaction(client, shortname).apply(_updates(["uuid-1"]))
+    assert not _calls(transport, "PUT")
+
+
+def test_sdk_error_stops_batch(transport):
+    """Test: Update raising SDK error before sending stops the batch and is not rolled back
+
+    Steps:
+    1. Apply 3 updates one by one, the first one raises CircuitBreakerOpenException
+
+    Result:
+    OK: remaining updates are not started, nothing was changed, so nothing is rolled back
+    """
+    transport.add_route("PUT", "svcinst/delivery/{id}", handler=_raise_open_circuit)
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    result = BatchTransaction(client, shortname, concurrency=1).apply(_updates(["uuid-1", "uuid-2", "uuid-3"]))
+    assert not result.committed and result.rollbacks == []
+    assert isinstance(result.updates[0].error, CircuitBreakerOpenException)
+    assert [update.result for update in result.updates[1:]] == [None, None]
+    assert _calls(transport, "POST") == []
+
+
+def test_read_timeout_is_rolled_back(transport):
+    """Test: Update which timed out after sending may have been applied and is rolled back
+
+    Steps:
+    1. Apply 2 updates one by one, the second one times out reading the response
+
+    Result:
+    OK: both instances rolled back to version 7
+    """
+    def timeout(request, path_params):
+        if request.url.endswith("uuid-2"):
+            raise requests.exceptions.ReadTimeout("read timeout")
+        return {"uuid": "uuid-1"}
+
+    transport.add_route("PUT", "svcinst/delivery/{id}", handler=timeout)
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    result = BatchTransaction(client, shortname, concurrency=1).apply(_updates(["uuid-1", "uuid-2"]))
+    assert not result.committed and result.rolled_back
+    assert sorted(_calls(transport, "POST")) == ["uuid-1/rollbackTo/7", "uuid-2/rollbackTo/7"]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport, config_api_routes
+from ll_sdk.utils.config_api_helper.deliver import DeliverServiceInstanceObj
+from ll_sdk.utils.config_api_helper.provisioning import BulkProvisioner, ProvisionResult
+from ll_sdk.utils.config_api_helper.validator import OfflineValidator
+
+shortname = "testname"
+catalog = [
+    {"name": "refresh_absmin", "parameters": [{"name": "seconds", "type": "INTEGER", "required": True}],
+     "repeatable": False},
+    {"name": "rewrite_host", "parameters": [{"type": "STRING"}, {"type": "STRING", "required": False}]},
+    {"name": "hsts", "parameters": [], "protocols": ["https"]},
+    {"name": "custom"},
+]
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake config-api with option catalog of LLNW-Generic profile only"""
+    transport = FakeTransport(routes=config_api_routes(), sleep=lambda s: None)
+    transport.add_route("GET", "configoption/shortname/{shortname}/svcProf/{profile}",
+                        handler=lambda r, p: catalog if r.url.endswith("LLNW-Generic") else (404, {}))
+    return transport
+
+
+def _config(profile="LLNW-Generic", host="www.example.com"):
+    config = DeliverServiceInstanceObj()
+    config.generate_default(shortname, host, "origin.example.com", profile, "https", "https")
+    config.add_protocol_set("http", "http")
+    return config
+
+
+def _remote_validations(transport):
+    return len([t for m, t, r in transport.requests if t.endswith("validate")])
+
+
+def test_local_checks(transport):
+    """Test: Option names, parameter counts/types, protocols and repetition are checked locally
+
+    Result:
+    OK: every violation is reported, catalog is fetched once, no remote validation
+    """
+    validator = OfflineValidator(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport))
+    config = _config()
+    config.add_option("refresh_absmin", ["3600"])
+    config.add_option("rewrite_host", ["a.example.com"])
+    config.add_option("custom", [1, 2, 3])
+    assert validator.validate(config).valid
+
+    config.add_option("unknown_option", [])
+    config.add_option("rewrite_host", [], "https", "https")
+    config.add_option("refresh_absmin", ["soon"], "http", "http")
+    config.add_option("hsts", [], "http", "http")
+    result = validator.validate(config)
+    assert not result.valid and not result.remote
+    errors = "\n".join(result.errors)
+    assert "unknown option [unknown_option]" in errors
+    assert "option [rewrite_host] expects 1..2 parameters, got 0" in errors
+    assert "option [refresh_absmin] parameter 0 has invalid value [soon]" in errors
+    assert "option [refresh_absmin] is used 2 times" in errors
+    assert "option [hsts] is not allowed for http" in errors
+    assert len([t for m, t, r in transport.requests if "configoption" in t]) == 1
+    assert _remote_validations(transport) == 0
+
+
+def test_remote_fallback(transport):
+    """Test: Config of profile without catalog is validated remotely, broken protocol set is rejected locally
+
+    Result:
+    OK: remote result is used only when local checks cannot decide
+    """
+    validator = OfflineValidator(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport))
+    result = validator.validate(_config(profile="Other"))
+    assert result.valid and result.remote
+
+    config = _config(profile="Other")
+    config["body"]["protocolSets"].append({"publishedProtocol": "https", "sourceProtocol": "https", "options": []})
+    assert validator.validate(config).errors == ["root: duplicated protocol set https/https"]
+    assert _remote_validations(transport) == 1
+
+
+def test_provisioner_with_validator(transport):
+    """Test: BulkProvisioner uses offline validator instead of remote validate
+
+    Result:
+    OK: invalid config rejected locally, valid one created
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    invalid = _config(host="bad.example.com")
+    invalid.add_option("unknown_option", [])
+    results = list(BulkProvisioner(client, validator=OfflineValidator(client)).provision([_config(), invalid]))
+    assert [r.status for r in results] == [ProvisionResult.CREATED, ProvisionResult.INVALID]
+    assert _remote_validations(transport) == 0
+
+
+def test_transient_catalog_failure_is_not_cached(transport):
+    """Test: Catalog request failing with 5xx is repeated for the next config
+
+    Steps:
+    1. Catalog request answers 503, validate config
+    2. Catalog request answers catalog, validate config
+
+    Result:
+    OK: first config validated remotely, second one locally
+    """
+    responses = [(503, {"errors": ["unavailable"]})]
+    transport.add_route("GET", "configoption/shortname/{shortname}/svcProf/{profile}",
+                        handler=lambda r, p: responses.pop() if responses else catalog)
+    validator = OfflineValidator(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport))
+    assert validator.validate(_config()).remote
+    result = validator.validate(_config())
+    assert result.valid and not result.remote
+    assert _remote_validations(transport) == 1
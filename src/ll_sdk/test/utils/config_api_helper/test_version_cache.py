@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+from ll_sdk.config_api import ConfigApiClient, ConfigApiBaseException
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.version_cache import VersionCache
+
+shortname = "testname"
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake config-api with 3 delivery versions, versions 1 and 3 are identical"""
+    versions = [{"versionNumber": number, "createdBy": "user"} for number in (1, 2)]
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/{id}/versions", handler=lambda request, params: versions)
+
+    def get_version(request, path_params):
+        number = int(request.url.rsplit("/", 1)[1])
+        return {"body": {"publishedHostname": "www.example.com", "origin": "b" if number == 2 else "a"}}
+
+    transport.add_route("GET", "svcinst/delivery/{id}/versions/{id}", handler=get_version)
+    transport.versions = versions
+    return transport
+
+
+def _fetched(transport):
+    return [r.url.rsplit("/", 1)[1] for m, t, r in transport.requests if t.endswith("versions/{id}")]
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_history_incremental(tmp_path, transport, compress):
+    """Test: History fetches only versions missing in persistent cache
+
+    Steps:
+    1. Load history, add new version, load history again with new cache on the same file
+
+    Result:
+    OK: every version fetched once, identical payloads stored once
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    path = str(tmp_path / "versions.db")
+    cache = VersionCache(client, path=path, compress=compress)
+    history = cache.history("delivery", "uuid-1", shortname)
+    assert sorted(history) == [1, 2]
+    assert sorted(_fetched(transport)) == ["1", "2"]
+    cache.close()
+
+    transport.versions.append({"versionNumber": 3})
+    cache = VersionCache(client, path=path, compress=compress)
+    history = cache.history("delivery", "uuid-1", shortname)
+    assert history[3] == history[1]
+    assert sorted(_fetched(transport)) == ["1", "2", "3"]
+    assert cache.history("delivery", "uuid-1", shortname, since=2) == {3: history[3]}
+    assert cache._db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 2
+
+    assert cache.get_version("delivery", "uuid-1", 2, shortname)["body"]["origin"] == "b"
+    assert len(_fetched(transport)) == 3
+
+
+def test_get_version_error(transport):
+    """Test: Error response is raised and not cached
+
+    Result:
+    OK: ConfigApiBaseException is raised
+    """
+    transport.add_route("GET", "customerCertificate/{id}/versions/{id}", status=404, body={"errors": []})
+    cache = VersionCache(ConfigApiClient("apis.example.com", "user", "ab12", transport=transport))
+    with pytest.raises(ConfigApiBaseException):
+        cache.get_version("certificate", "uuid-1", 1)
+    assert cache.cached_versions("certificate", "uuid-1") == []
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import pytest
+from urllib.parse import parse_qs, urlparse
+from ll_sdk.config_api import ConfigApiClient
+from ll_sdk.utils.client_helper.fake_transport import FakeTransport
+from ll_sdk.utils.config_api_helper.watcher import ServiceInstanceWatcher, ChangeEvent
+
+shortname = "testname"
+
+
+@pytest.fixture(scope="function")
+def transport():
+    """Fixture for fake config-api with ETag support of delivery listing"""
+    instances = {uuid: {"uuid": uuid, "revision": {"versionNumber": 1}, "body": {"publishedHostname": uuid}}
+                 for uuid in ("uuid-1", "uuid-2")}
+
+    def list_instances(request, path_params):
+        etag = str(hash(json.dumps(instances, sort_keys=True)))
+        if request.headers.get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+        return 200, list(instances.values()), {"ETag": etag}
+
+    transport = FakeTransport(sleep=lambda s: None)
+    transport.add_route("GET", "svcinst/delivery/shortname/{shortname}", handler=list_instances)
+    transport.add_route("GET", "svcinst/delivery/{id}",
+                        handler=lambda request, params: instances[request.url.rsplit("/", 1)[1]])
+    transport.instances = instances
+    return transport
+
+
+def _gets(transport):
+    return sorted(r.url.rsplit("/", 1)[1] for m, t, r in transport.requests if t.endswith("delivery/{id}"))
+
+
+def test_poll_changes(transport):
+    """Test: Watcher reports changes and fetches only changed instances
+
+    Steps:
+    1. Poll baseline and unchanged listing
+    2. Modify, add and delete instance, poll
+
+    Result:
+    OK: no events until change, unchanged listing answered with 304, only changed instances fetched
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    watcher = ServiceInstanceWatcher(client, [shortname], services=("delivery",))
+    received = []
+    watcher.subscribe(received.append)
+    assert watcher.poll() == [] and watcher.poll() == []
+    assert _gets(transport) == []
+
+    transport.instances["uuid-1"] = dict(transport.instances["uuid-1"], revision={"versionNumber": 2})
+    transport.instances["uuid-3"] = {"uuid": "uuid-3", "revision": {"versionNumber": 1}, "body": {}}
+    del transport.instances["uuid-2"]
+    events = watcher.poll()
+    assert sorted((e.kind, e.uuid) for e in events) == [
+        (ChangeEvent.ADDED, "uuid-3"), (ChangeEvent.DELETED, "uuid-2"), (ChangeEvent.MODIFIED, "uuid-1")]
+    assert received == events
+    assert [e.config["revision"]["versionNumber"] for e in events if e.uuid == "uuid-1"] == [2]
+    assert _gets(transport) == ["uuid-1", "uuid-3"]
+    assert watcher.poll() == []
+
+
+def test_multi_page_listing(transport):
+    """Test: Change on the second page of listing is reported
+
+    Steps:
+    1. Serve paged listing with per page ETag, 3 instances with page size 2
+    2. Poll baseline, modify instance on the second page, poll
+
+    Result:
+    OK: modification reported, ETag of the first page is not reused
+    """
+    instances = transport.instances
+    instances["uuid-3"] = {"uuid": "uuid-3", "revision": {"versionNumber": 1}, "body": {}}
+
+    def list_page(request, path_params):
+        query = parse_qs(urlparse(request.url).query)
+        size, page = int(query["size"][0]), int(query["page"][0])
+        items = sorted(instances.values(), key=lambda item: item["uuid"])[(page - 1) * size:page * size]
+        etag = str(hash(json.dumps(items, sort_keys=True)))
+        if request.headers.get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+        return 200, items, {"ETag": etag}
+
+    transport.add_route("GET", "svcinst/delivery/shortname/{shortname}", handler=list_page)
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    watcher = ServiceInstanceWatcher(client, [shortname], services=("delivery",), page_size=2)
+    assert watcher.poll() == []
+
+    instances["uuid-3"] = dict(instances["uuid-3"], revision={"versionNumber": 2})
+    assert [(e.kind, e.uuid) for e in watcher.poll()] == [(ChangeEvent.MODIFIED, "uuid-3")]
+
+
+def test_stream(transport):
+    """Test: Asynchronous iteration over change events
+
+    Result:
+    OK: existing instances reported as added with emit_initial
+    """
+    client = ConfigApiClient("apis.example.com", "user", "ab12", transport=transport)
+    watcher = ServiceInstanceWatcher(client, [shortname], services=("delivery",), interval=0, emit_initial=True)
+
+    async def collect():
+        events = []
+        async for event in watcher.stream():
+            events.append(event)
+            if len(events) == 2:
+                watcher.stop()
+        return events
+
+    events = asyncio.run(asyncio.wait_for(collect(), 5))
+    assert sorted(e.uuid for e in events) == ["uuid-1", "uuid-2"]
+    assert {e.kind for e in events} == {ChangeEvent.ADDED}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['BulkResult', 'bulk_map']
+__docformat__ = 'restructuredtext'
+
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class BulkResult(namedtuple('BulkResult', ['index', 'item', 'result', 'error'])):
+    """
+    Outcome of a single bulk call: result of the call or raised error
+
+        :param index: position of item in input. int
+        :param item: call arguments
+        :param result: returned value, None if call raised
+        :param error: raised exception, None if call succeeded
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _call(func, item, rate_limiter):
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    if isinstance(item, dict):
+        return func(**item)
+    if isinstance(item, (tuple, list)):
+        return func(*item)
+    return func(item)
+
+
+def bulk_map(func, items, concurrency=8, rate_limiter=None, ordered=True, prefetch=None):
+    """
+    Call func for every item with bounded concurrency and yield BulkResult per item.
+
+    Items are pulled from the (possibly lazy) iterable only when there is room in the window of
+    ``concurrency + prefetch`` calls in flight, so memory stays bounded and slow consumers
+    apply backpressure. Exceptions do not stop the stream, they are reported in BulkResult.error.
+
+        :param func: callable
+        :param items: iterable of kwargs dicts, args tuples or single arguments
+        :param concurrency: (optional) Default 8. Amount of worker threads. int
+        :param rate_limiter: (optional) RateLimiter acquired before each call
+        :param ordered: (optional) Default True. Yield results in input order, otherwise as completed. bool
+        :param prefetch: (optional) Default concurrency. Extra calls queued ahead of the workers. int
+    """
+    window = concurrency + (concurrency if prefetch is None else prefetch)
+    iterator = iter(enumerate(items))
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def submit():
+        for index, item in iterator:
+            pending.append((index, item, executor.submit(_call, func, item, rate_limiter)))
+            if len(pending) >= window:
+                return
+
+    def outcome(index, item, future):
+        error = future.exception()
+        return BulkResult(index, item, None if error is not None else future.result(), error)
+
+    try:
+        submit()
+        while pending:
+            if ordered:
+                index, item, future = pending.popleft()
+                yield outcome(index, item, future)
+            else:
+                wait([future for _, _, future in pending], return_when=FIRST_COMPLETED)
+                done = [entry for entry in pending if entry[2].done()]
+                for entry in done:
+                    pending.remove(entry)
+                for entry in done:
+                    yield outcome(*entry)
+            submit()
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
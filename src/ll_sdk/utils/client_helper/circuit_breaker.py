@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['CircuitBreaker', 'CircuitBreakerOpenException']
+__docformat__ = 'restructuredtext'
+
+import time
+import threading
+from collections import deque
+
+
+class _Circuit(object):
+    """
+    State machine of a single endpoint: closed -> open -> half-open -> closed/open
+    """
+
+    def __init__(self, endpoint, breaker):
+        self.endpoint = endpoint
+        self._breaker = breaker
+        self._lock = threading.Lock()
+        self._window = deque(maxlen=breaker.window_size)
+        self.state = CircuitBreaker.CLOSED
+        self.opened_at = None
+        self.trip_reason = None
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self.rejected = 0
+
+    def _trip(self, reason):
+        self.state = CircuitBreaker.OPEN
+        self.opened_at = self._breaker.clock()
+        self.trip_reason = reason
+        self._window.clear()
+
+    def before_call(self):
+        """
+        Reserve a call slot or raise CircuitBreakerOpenException when the circuit is open
+        """
+        with self._lock:
+            if self.state == CircuitBreaker.OPEN:
+                if self._breaker.clock() - self.opened_at < self._breaker.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitBreakerOpenException(self.endpoint, self.trip_reason)
+                self.state = CircuitBreaker.HALF_OPEN
+                self._half_open_calls = 0
+                self._half_open_successes = 0
+            if self.state == CircuitBreaker.HALF_OPEN:
+                if self._half_open_calls >= self._breaker.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitBreakerOpenException(self.endpoint, 'half-open probe in progress')
+                self._half_open_calls += 1
+
+    def record(self, success, latency):
+        """
+        Register the outcome of a call started with before_call
+
+            :param success: bool
+            :param latency: seconds. float
+        """
+        breaker = self._breaker
+        if breaker.slow_call_threshold is not None and latency >= breaker.slow_call_threshold:
+            success = False
+        with self._lock:
+            if self.state == CircuitBreaker.HALF_OPEN:
+                if not success:
+                    self._trip('half-open probe failed')
+                    return
+                self._half_open_successes += 1
+                if self._half_open_successes >= breaker.half_open_max_calls:
+                    self.state = CircuitBreaker.CLOSED
+                    self.opened_at = None
+                    self.trip_reason = None
+                return
+            if self.state != CircuitBreaker.CLOSED:
+                return
+            self._window.append((success, latency))
+            if len(self._window) < breaker.min_calls:
+                return
+            failures = sum(1 for ok, _ in self._window if not ok)
+            error_rate = failures / len(self._window)
+            if error_rate >= breaker.error_rate_threshold:
+                self._trip(f'error rate {error_rate:.2f} >= {breaker.error_rate_threshold}')
+                return
+            if breaker.latency_threshold is not None:
+                latency_p = self._percentile(breaker.latency_percentile)
+                if latency_p >= breaker.latency_threshold:
+                    self._trip(f'p{breaker.latency_percentile:g} latency {latency_p:.3f}s '
+                               f'>= {breaker.latency_threshold}s')
+
+    def _percentile(self, percentile):
+        latencies = sorted(latency for _, latency in self._window)
+        rank = max(int(round(percentile / 100.0 * len(latencies))) - 1, 0)
+        return latencies[rank]
+
+    def snapshot(self):
+        with self._lock:
+            calls = len(self._window)
+            failures = sum(1 for ok, _ in self._window if not ok)
+            return {'state': self.state,
+                    'calls': calls,
+                    'failures': failures,
+                    'error_rate': failures / calls if calls else 0.0,
+                    f'latency_p{self._breaker.latency_percentile:g}':
+                        self._percentile(self._breaker.latency_percentile) if calls else None,
+                    'rejected': self.rejected,
+                    'opened_at': self.opened_at,
+                    'trip_reason': self.trip_reason}
+
+
+class CircuitBreaker(object):
+    """
+    Per-endpoint circuit breaker registry.
+
+    Every endpoint template (e.g. ``traffic/geo`` or ``svcinst/delivery/{id}``) gets its own circuit,
+    so one failing endpoint is shed without affecting the rest of the API.
+    A circuit trips when the error rate or the latency percentile over the last ``window_size``
+    calls exceeds the threshold, fails fast for ``reset_timeout`` seconds and then lets
+    ``half_open_max_calls`` probe calls through to decide whether to close again.
+
+        :param error_rate_threshold: (optional) Default 0.5. Fraction of failed calls that trips the circuit. float
+        :param latency_threshold: (optional) Latency in seconds of the ``latency_percentile`` that trips the circuit. float
+        :param latency_percentile: (optional) Default 95. float
+        :param window_size: (optional) Default 20. Amount of recent calls to evaluate. int
+        :param min_calls: (optional) Default 10. Calls required in the window before the circuit may trip. int
+        :param reset_timeout: (optional) Default 30. Seconds the circuit stays open. float
+        :param half_open_max_calls: (optional) Default 1. Probe calls allowed in half-open state. int
+        :param slow_call_threshold: (optional) Calls slower than this (seconds) count as failures. float
+        :param failure_status_codes: (optional) Default 5xx and 429. Response codes counted as failures.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    DEFAULT_FAILURE_STATUS_CODES = frozenset([429] + list(range(500, 600)))
+
+    def __init__(self, error_rate_threshold=0.5, latency_threshold=None, latency_percentile=95,
+                 window_size=20, min_calls=10, reset_timeout=30, half_open_max_calls=1,
+                 slow_call_threshold=None, failure_status_codes=None, clock=None):
+        self.error_rate_threshold = error_rate_threshold
+        self.latency_threshold = latency_threshold
+        self.latency_percentile = latency_percentile
+        self.window_size = window_size
+        self.min_calls = min(min_calls, window_size)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.slow_call_threshold = slow_call_threshold
+        self.failure_status_codes = frozenset(failure_status_codes or self.DEFAULT_FAILURE_STATUS_CODES)
+        self.clock = clock or time.monotonic
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def circuit(self, endpoint):
+        """
+        Return circuit for endpoint template, create it on first use
+
+            :param endpoint: str
+        """
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            with self._lock:
+                circuit = self._circuits.setdefault(endpoint, _Circuit(endpoint, self))
+        return circuit
+
+    def is_failure(self, status_code):
+        return status_code in self.failure_status_codes
+
+    def state(self, endpoint):
+        """
+        Current state of endpoint circuit: closed, open or half-open
+
+            :param endpoint: str
+        """
+        circuit = self._circuits.get(endpoint)
+        return circuit.state if circuit is not None else self.CLOSED
+
+    def snapshot(self):
+        """
+        State of all known circuits for monitoring, keyed by endpoint template
+        """
+        return {endpoint: circuit.snapshot() for endpoint, circuit in list(self._circuits.items())}
+
+    def reset(self, endpoint=None):
+        """
+        Force circuit(s) back to closed state
+
+            :param endpoint: (optional) If not present reset all circuits. str
+        """
+        with self._lock:
+            if endpoint is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(endpoint, None)
+
+
+class CircuitBreakerOpenException(BaseException):
+    __module__ = 'builtins'
+
+    def __init__(self, endpoint, reason=None):
+        super(CircuitBreakerOpenException, self).__init__(f'Circuit for [{endpoint}] is open: {reason}')
+        self.endpoint = endpoint
+        self.reason = reason
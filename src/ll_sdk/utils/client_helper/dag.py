@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['run_dag', 'reverse_dependencies']
+__docformat__ = 'restructuredtext'
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from ll_sdk.utils.client_helper.bulk import BulkResult
+
+
+def reverse_dependencies(dependencies, nodes=None):
+    """
+    Dependency graph for undoing: every node depends on the nodes which depended on it
+
+        :param dependencies: dict node -> iterable of nodes it depends on
+        :param nodes: (optional) Default all. Subset of nodes to keep
+    """
+    nodes = list(dependencies) if nodes is None else list(nodes)
+    kept = set(nodes)
+    reverse = {node: [] for node in nodes}
+    for node in nodes:
+        for dependency in dependencies[node]:
+            if dependency in kept:
+                reverse[dependency].append(node)
+    return reverse
+
+
+def run_dag(func, dependencies, concurrency=8, fail_fast=True):
+    """
+    Call func(node) for every node of dependency graph, each node only after all its dependencies succeeded.
+    Independent nodes run concurrently.
+
+    Returns dict node -> BulkResult(index, node, result, error) in completion order. Nodes depending on
+    a failed node are not called and missing in the result, with ``fail_fast`` no new nodes are started
+    after the first failure (calls in flight are awaited).
+
+        :param func: callable taking node
+        :param dependencies: dict node -> iterable of nodes it depends on, all of them have to be keys
+        :param concurrency: (optional) Default 8. int
+        :param fail_fast: (optional) Default True. bool
+    """
+    index = {node: position for position, node in enumerate(dependencies)}
+    waiting = {node: set(required) for node, required in dependencies.items()}
+    for node, required in waiting.items():
+        unknown = required.difference(index)
+        if unknown:
+            raise KeyError(f'Node [{node}] depends on unknown nodes {sorted(map(str, unknown))}')
+    dependents = {node: [] for node in dependencies}
+    for node, required in waiting.items():
+        for dependency in required:
+            dependents[dependency].append(node)
+
+    ready = [node for node, required in waiting.items() if not required]
+    results = {}
+    running = {}
+    failed = False
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        while ready or running:
+            while ready and len(running) < concurrency and not (failed and fail_fast):
+                node = ready.pop(0)
+                running[executor.submit(func, node)] = node
+            if not running:
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                error = future.exception()
+                results[node] = BulkResult(index[node], node, None if error is not None else future.result(), error)
+                if error is not None:
+                    failed = True
+                    continue
+                for dependent in dependents[node]:
+                    waiting[dependent].discard(node)
+                    if not waiting[dependent]:
+                        ready.append(dependent)
+        if not failed and len(results) < len(index):
+            raise ValueError('Dependency graph contains a cycle')
+    finally:
+        executor.shutdown(wait=True)
+    return results
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['FakeTransport', 'constant_latency', 'uniform_latency', 'lognormal_latency', 'config_api_routes',
+           'reporting_api_routes']
+__docformat__ = 'restructuredtext'
+
+import json
+import math
+import time
+import uuid
+import random
+import threading
+from http.client import responses
+from collections import deque
+from datetime import timedelta
+from urllib.parse import urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from ll_sdk.base_client import endpoint_template
+from ll_sdk.utils.client_helper.transport import BaseTransport
+
+
+def constant_latency(seconds):
+    """
+    Latency distribution that always returns the same value
+    """
+    return lambda rnd: seconds
+
+
+def uniform_latency(low, high):
+    """
+    Latency distribution uniformly distributed between low and high seconds
+    """
+    return lambda rnd: rnd.uniform(low, high)
+
+
+def lognormal_latency(median, sigma=0.5):
+    """
+    Long-tailed latency distribution, typical for real HTTP APIs
+
+        :param median: seconds. float
+        :param sigma: shape of the tail. float
+    """
+    mu = math.log(median)
+    return lambda rnd: rnd.lognormvariate(mu, sigma)
+
+
+class _Route(object):
+
+    def __init__(self, method, endpoint, body=None, status=200, headers=None, latency=None, payload_size=None,
+                 error_rate=None, error_status=None, handler=None):
+        self.method = method.upper() if method else None
+        self.endpoint = endpoint.strip('/')
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+        self.latency = latency
+        self.payload_size = payload_size
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.handler = handler
+
+    def matches(self, method, template):
+        if self.method is not None and self.method != method:
+            return False
+        route_segments = self.endpoint.split('/')
+        segments = template.split('/')
+        if len(segments) < len(route_segments):
+            return False
+        return all(expected == actual or expected.startswith('{')
+                   for expected, actual in zip(route_segments, segments[-len(route_segments):]))
+
+
+class FakeTransport(BaseTransport):
+    """
+    In-memory transport serving canned responses without network.
+    Intended for load tests and benchmarks of code built on top of SDK clients.
+
+    Routes are matched by HTTP method and endpoint template (see ll_sdk.base_client.endpoint_template),
+    route placeholder segment matches any segment and the most recently added route wins.
+    Route body can be a value or a callable ``handler(request, path_params)`` returning body,
+    or (status, body) tuple.
+
+        :param routes: (optional) list of route definitions (dicts with add_route arguments)
+        :param latency: (optional) Default no latency. Seconds or distribution ``f(random.Random) -> seconds``
+        :param error_rate: (optional) Default 0. Probability of injected error. float
+        :param error_status: (optional) Default 503. Status code of injected error response. int
+        :param error_exception: (optional) Exception (class or instance) raised instead of error response
+        :param seed: (optional) Random seed for reproducible runs
+        :param sleep: (optional) Function used to simulate latency. Default time.sleep
+        :param history: (optional) Default 1000. Amount of last requests kept in ``requests``. int
+    """
+
+    def __init__(self, routes=None, latency=None, error_rate=0.0, error_status=503, error_exception=None,
+                 seed=None, sleep=None, history=1000):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_exception = error_exception
+        self.sleep = sleep or time.sleep
+        self.requests = deque(maxlen=history)
+        self.requests_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes = []
+        self._route_cache = {}
+        for route in routes or []:
+            self.add_route(**route)
+
+    def add_route(self, method, endpoint, body=None, status=200, headers=None, latency=None, payload_size=None,
+                  error_rate=None, error_status=None, handler=None):
+        """
+        Register canned response
+
+            :param method: HTTP method, None matches any. str
+            :param endpoint: endpoint template, e.g. 'svcinst/delivery/{id}'. str
+            :param body: (optional) json serializable response body
+            :param status: (optional) Default 200. int
+            :param headers: (optional) response headers. dict
+            :param latency: (optional) overrides transport latency for this route
+            :param payload_size: (optional) pad response body up to this amount of bytes. int
+            :param error_rate: (optional) overrides transport error rate for this route. float
+            :param error_status: (optional) overrides transport error status for this route. int
+            :param handler: (optional) callable(request, path_params) returning body, (status, body)
+                             or (status, body, headers)
+        """
+        with self._lock:
+            self._routes.insert(0, _Route(method, endpoint, body, status, headers, latency, payload_size,
+                                          error_rate, error_status, handler))
+            self._route_cache.clear()
+
+    def _find_route(self, method, template):
+        key = (method, template)
+        route = self._route_cache.get(key, False)
+        if route is False:
+            route = next((r for r in self._routes if r.matches(method, template)), None)
+            self._route_cache[key] = route
+        return route
+
+    def _sample(self, distribution):
+        if distribution is None:
+            return 0.0
+        if callable(distribution):
+            with self._lock:
+                return distribution(self._random)
+        return float(distribution)
+
+    def _chance(self, probability):
+        if not probability:
+            return False
+        with self._lock:
+            return self._random.random() < probability
+
+    @staticmethod
+    def _path_params(route, path):
+        template = route.endpoint.split('/')
+        values = path.strip('/').split('/')[-len(template):]
+        return {name.strip('{}'): value for name, value in zip(template, values) if name.startswith('{')}
+
+    def request(self, method, url, headers=None, timeout=None, **kwargs):
+        method = method.upper()
+        prepared = requests.Request(method, url, headers=headers, params=kwargs.get('params'),
+                                    data=kwargs.get('data'), files=kwargs.get('files'),
+                                    auth=kwargs.get('auth')).prepare()
+        path = urlsplit(prepared.url).path
+        template = endpoint_template(path)
+        route = self._find_route(method, template)
+        with self._lock:
+            self.requests.append((method, template, prepared))
+            self.requests_count += 1
+
+        latency = self._sample(route.latency if route is not None and route.latency is not None else self.latency)
+        if timeout is not None:
+            read_timeout = timeout[-1] if isinstance(timeout, tuple) else timeout
+            if latency > read_timeout:
+                self.sleep(read_timeout)
+                raise requests.exceptions.ReadTimeout(f'Fake read timeout after {read_timeout}s', request=prepared)
+        if latency:
+            self.sleep(latency)
+
+        error_rate = route.error_rate if route is not None and route.error_rate is not None else self.error_rate
+        if self._chance(error_rate):
+            if self.error_exception is not None:
+                raise self.error_exception
+            status = route.error_status if route is not None and route.error_status else self.error_status
+            return self._build_response(prepared, status, {'errors': ['Injected error']}, {}, latency)
+
+        if route is None:
+            return self._build_response(prepared, 404, {'errors': [f'No fake route for {method} {template}']},
+                                        {}, latency)
+        status, body, headers = route.status, route.body, route.headers
+        if route.handler is not None:
+            result = route.handler(prepared, self._path_params(route, path))
+            if isinstance(result, tuple):
+                status, body = result[:2]
+                headers = result[2] if len(result) > 2 else headers
+            else:
+                body = result
+        return self._build_response(prepared, status, body, headers, latency, route.payload_size)
+
+    @staticmethod
+    def _build_response(prepared, status, body, headers, latency, payload_size=None):
+        content = b'' if body is None else json.dumps(body).encode('utf-8')
+        if payload_size and len(content) < payload_size and isinstance(body, dict):
+            padding = payload_size - len(content) - len(', "padding": ""')
+            content = json.dumps(dict(body, padding='x' * max(padding, 0))).encode('utf-8')
+        response = requests.models.Response()
+        response.status_code = status
+        response._content = content
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers.setdefault('Content-Type', 'application/json')
+        response.headers['Content-Length'] = str(len(content))
+        response.encoding = 'utf-8'
+        response.url = prepared.url
+        response.request = prepared
+        response.reason = responses.get(status, '')
+        response.elapsed = timedelta(seconds=latency)
+        return response
+
+
+def _echo_created(request, path_params):
+    body = json.loads(request.body) if request.body else {}
+    if isinstance(body, dict):
+        body.setdefault('uuid', str(uuid.uuid4()))
+        body.setdefault('revision', {'versionNumber': 1})
+    return body
+
+
+def config_api_routes(instances=None, payload_size=None):
+    """
+    Canned responses of the most used config-api endpoints
+
+        :param instances: (optional) list of service instances returned by list/get endpoints
+        :param payload_size: (optional) pad response bodies up to this amount of bytes. int
+    """
+    instances = instances or []
+    by_uuid = {inst.get('uuid'): inst for inst in instances}
+
+    def get_instance(request, path_params):
+        inst = by_uuid.get(path_params.get('id'))
+        return (200, inst) if inst is not None else (404, {'errors': ['Not found']})
+
+    routes = [
+        {'method': 'GET', 'endpoint': 'health/check', 'body': ['OK']},
+        {'method': 'GET', 'endpoint': 'utils/status', 'body': {'version': 'fake'}},
+        {'method': 'GET', 'endpoint': 'configoption/shortname/{shortname}/svcProf/{profile}', 'body': []},
+        {'method': 'GET', 'endpoint': 'customerCertificate/shortname/{shortname}', 'body': []},
+        {'method': 'GET', 'endpoint': 'edgerules/shortname/{shortname}', 'body': []},
+        {'method': 'GET', 'endpoint': 'ipaclist/shortname/{shortname}', 'body': []},
+        {'method': 'GET', 'endpoint': 'lds/shortname/{shortname}/config', 'body': []},
+        {'method': 'GET', 'endpoint': 'epdns/job/{id}', 'body': {'status': 'COMPLETED'}},
+    ]
+    for service in ('delivery', 'httpcs'):
+        routes.extend([
+            {'method': 'GET', 'endpoint': f'svcinst/{service}/shortname/{{shortname}}', 'body': instances},
+            {'method': 'GET', 'endpoint': f'svcinst/{service}/shortname/{{shortname}}/searchAuto', 'body': instances},
+            {'method': 'GET', 'endpoint': f'svcinst/{service}/{{id}}', 'handler': get_instance},
+            {'method': 'GET', 'endpoint': f'svcinst/{service}/{{id}}/versions', 'body': []},
+            {'method': 'POST', 'endpoint': f'svcinst/{service}/validate', 'body': {'Success': True}},
+            {'method': 'POST', 'endpoint': f'svcinst/{service}', 'handler': _echo_created},
+            {'method': 'POST', 'endpoint': f'svcinst/{service}/inheritance', 'handler': _echo_created},
+            {'method': 'PUT', 'endpoint': f'svcinst/{service}/{{id}}', 'handler': _echo_created},
+            {'method': 'DELETE', 'endpoint': f'svcinst/{service}/{{id}}', 'body': None, 'status': 204},
+        ])
+    for route in routes:
+        route.setdefault('payload_size', payload_size)
+    return routes
+
+
+def reporting_api_routes(payload_size=None):
+    """
+    Canned responses of realtime-reporting-api and reporting-api endpoints, every report returns empty data
+
+        :param payload_size: (optional) pad response bodies up to this amount of bytes. int
+    """
+    return [{'method': 'GET', 'endpoint': 'health/check', 'body': ['OK']},
+            {'method': 'POST', 'endpoint': 'traffic', 'body': {'data': []}, 'payload_size': payload_size},
+            {'method': 'POST', 'endpoint': 'traffic/{report}', 'body': {'data': []}, 'payload_size': payload_size},
+            {'method': 'POST', 'endpoint': 'statuscodes/{report}', 'body': {'data': []}, 'payload_size': payload_size}]
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['LatencyHistogram', 'MetricsRegistry', 'MetricsSnapshot']
+__docformat__ = 'restructuredtext'
+
+import threading
+
+
+class LatencyHistogram(object):
+    """
+    HDR-style log-linear latency histogram.
+
+    Values are recorded in microseconds into buckets of powers of two, each split into
+    ``2 ** SUB_BUCKET_BITS`` linear sub-buckets, so any percentile is reported with
+    relative error below 1 / 2 ** SUB_BUCKET_BITS (6.25%) with memory bounded by the value range.
+    """
+    SUB_BUCKET_BITS = 4
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, value):
+        shift = max(value.bit_length() - cls.SUB_BUCKET_BITS - 1, 0)
+        return shift * cls.SUB_BUCKETS + (value >> shift)
+
+    @classmethod
+    def _bounds(cls, index):
+        """
+        Lowest and highest value (microseconds) of the bucket
+        """
+        shift = max(index // cls.SUB_BUCKETS - 1, 0)
+        mantissa = index - shift * cls.SUB_BUCKETS
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds):
+        """
+        Record latency
+
+            :param seconds: float
+        """
+        index = self._index(max(int(seconds * 1000000), 0))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percentile):
+        """
+        Latency in seconds below which the given percent of recorded values fall
+
+            :param percentile: 0-100. float
+        """
+        if not self.count:
+            return None
+        rank = max(percentile / 100.0 * self.count, 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self._bounds(index)
+                return min((low + high) / 2000000.0, self.max)
+        return self.max
+
+    def cumulative(self, bounds):
+        """
+        Amount of values less or equal than each of the bounds (seconds), for histogram export
+
+            :param bounds: sorted list of float
+        """
+        result = []
+        items = sorted(self.counts.items())
+        seen = 0
+        position = 0
+        for bound in bounds:
+            limit = bound * 1000000
+            while position < len(items) and self._bounds(items[position][0])[1] <= limit:
+                seen += items[position][1]
+                position += 1
+            result.append(seen)
+        return result
+
+    def copy(self):
+        histogram = LatencyHistogram()
+        histogram.counts = dict(self.counts)
+        histogram.count = self.count
+        histogram.total = self.total
+        histogram.min = self.min
+        histogram.max = self.max
+        return histogram
+
+
+class _EndpointMetrics(object):
+
+    def __init__(self):
+        self.count = 0
+        self.status_classes = {}
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency = LatencyHistogram()
+
+    def copy(self):
+        metrics = _EndpointMetrics()
+        metrics.count = self.count
+        metrics.status_classes = dict(self.status_classes)
+        metrics.bytes_out = self.bytes_out
+        metrics.bytes_in = self.bytes_in
+        metrics.latency = self.latency.copy()
+        return metrics
+
+
+def _status_class(status):
+    if isinstance(status, int):
+        return f'{status // 100}xx'
+    return status or 'error'
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+class MetricsSnapshot(object):
+    """
+    Point-in-time copy of client metrics keyed by (method, endpoint template)
+    """
+    PERCENTILES = (50, 95, 99)
+    EXPORT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, endpoints, labels=None):
+        self._endpoints = endpoints
+        self.labels = labels or {}
+
+    def __iter__(self):
+        return iter(self._endpoints)
+
+    def __len__(self):
+        return len(self._endpoints)
+
+    def __getitem__(self, key):
+        return self.endpoint(*key)
+
+    def endpoint(self, method, endpoint):
+        """
+        Metrics of a single endpoint
+
+            :param method: str
+            :param endpoint: endpoint template. str
+        """
+        metrics = self._endpoints[(method, endpoint)]
+        result = {'count': metrics.count,
+                  'status_classes': dict(metrics.status_classes),
+                  'bytes_out': metrics.bytes_out,
+                  'bytes_in': metrics.bytes_in,
+                  'latency_mean': metrics.latency.total / metrics.latency.count if metrics.latency.count else None,
+                  'latency_max': metrics.latency.max}
+        for percentile in self.PERCENTILES:
+            result[f'latency_p{percentile}'] = metrics.latency.percentile(percentile)
+        return result
+
+    def as_dict(self):
+        """
+        Metrics of all endpoints as {'METHOD endpoint': {...}}
+        """
+        return {f'{method} {endpoint}': self.endpoint(method, endpoint) for method, endpoint in sorted(self._endpoints)}
+
+    def to_prometheus(self, prefix='llnw_sdk'):
+        """
+        Export metrics in Prometheus / OpenMetrics text exposition format
+
+            :param prefix: (optional) Default llnw_sdk. Metric name prefix. str
+        """
+        common = ''.join(f'{name}="{_escape(value)}",' for name, value in sorted(self.labels.items()))
+        lines = [f'# HELP {prefix}_requests_total Requests sent per endpoint and response status class',
+                 f'# TYPE {prefix}_requests_total counter']
+        keys = sorted(self._endpoints)
+        labels = {key: f'{common}method="{_escape(key[0])}",endpoint="{_escape(key[1])}"' for key in keys}
+        for key in keys:
+            for status_class, count in sorted(self._endpoints[key].status_classes.items()):
+                lines.append(f'{prefix}_requests_total{{{labels[key]},status_class="{status_class}"}} {count}')
+
+        for name, attr, help_text in (('request_bytes_total', 'bytes_out', 'Request body bytes sent'),
+                                      ('response_bytes_total', 'bytes_in', 'Response body bytes received')):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for key in keys:
+                lines.append(f'{prefix}_{name}{{{labels[key]}}} {getattr(self._endpoints[key], attr)}')
+
+        lines.append(f'# HELP {prefix}_request_duration_seconds Request latency')
+        lines.append(f'# TYPE {prefix}_request_duration_seconds histogram')
+        for key in keys:
+            histogram = self._endpoints[key].latency
+            for bound, count in zip(self.EXPORT_BUCKETS, histogram.cumulative(self.EXPORT_BUCKETS)):
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels[key]},le="{bound}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels[key]},le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels[key]}}} {histogram.total}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels[key]}}} {histogram.count}')
+
+        lines.append(f'# HELP {prefix}_request_duration_quantile_seconds Request latency percentiles')
+        lines.append(f'# TYPE {prefix}_request_duration_quantile_seconds gauge')
+        for key in keys:
+            histogram = self._endpoints[key].latency
+            for percentile in self.PERCENTILES:
+                value = histogram.percentile(percentile)
+                if value is not None:
+                    lines.append(f'{prefix}_request_duration_quantile_seconds'
+                                 f'{{{labels[key]},quantile="{percentile / 100.0}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsRegistry(object):
+    """
+    Thread safe per-endpoint request metrics: count, status classes, bytes in/out and latency histogram.
+    Endpoints are keyed by method and endpoint template to keep cardinality bounded.
+
+        :param labels: (optional) constant labels added to every exported metric, e.g. {'client': 'config-api'}
+    """
+
+    def __init__(self, labels=None):
+        self.labels = labels or {}
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, endpoint, status, bytes_out=0, bytes_in=0, latency=None):
+        """
+        Record single request
+
+            :param method: str
+            :param endpoint: endpoint template. str
+            :param status: response status code, or status class (e.g. 'error', 'rejected') if there is no response
+            :param bytes_out: (optional) request body size. int
+            :param bytes_in: (optional) response body size. int
+            :param latency: (optional) seconds. float
+        """
+        status_class = _status_class(status)
+        with self._lock:
+            metrics = self._endpoints.get((method, endpoint))
+            if metrics is None:
+                metrics = self._endpoints[(method, endpoint)] = _EndpointMetrics()
+            metrics.count += 1
+            metrics.status_classes[status_class] = metrics.status_classes.get(status_class, 0) + 1
+            metrics.bytes_out += bytes_out
+            metrics.bytes_in += bytes_in
+            if latency is not None:
+                metrics.latency.record(latency)
+
+    def snapshot(self):
+        """
+        Consistent copy of current metrics
+        """
+        with self._lock:
+            endpoints = {key: metrics.copy() for key, metrics in self._endpoints.items()}
+        return MetricsSnapshot(endpoints, self.labels)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['RateLimiter']
+__docformat__ = 'restructuredtext'
+
+import time
+import threading
+
+
+class RateLimiter(object):
+    """
+    Thread safe token bucket rate limiter
+
+        :param rate: Requests per second. float
+        :param burst: (optional) Default max(1, rate). Amount of requests allowed at once after idle period. int
+    """
+
+    def __init__(self, rate, burst=None, clock=None, sleep=None):
+        if rate <= 0:
+            raise ValueError(f'rate should be positive, got {rate}')
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or time.sleep
+        self._tokens = self.burst
+        self._updated = self.clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        """
+        Take tokens and return how long the caller has to wait for them
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, tokens=1):
+        """
+        Block until request is allowed
+
+            :param tokens: (optional) Default 1. int
+        """
+        delay = self._reserve(tokens)
+        if delay > 0:
+            self.sleep(delay)
+        return delay
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['BaseTracer', 'OpenTelemetryTracer']
+__docformat__ = 'restructuredtext'
+
+
+class _NoopSpan(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class BaseTracer(object):
+    """
+    Tracing hook interface used by BaseRestAuthClient. Default implementation does nothing.
+
+    Client opens one span per API call with attributes:
+    ``llnw.endpoint``, ``llnw.shortname``, ``llnw.retry_attempt``, ``http.method``, ``http.url``,
+    ``http.request_content_length`` and ``http.status_code``.
+    """
+
+    def start_span(self, name, attributes=None):
+        """
+        Start span as a child of the caller's current span, to be used as context manager.
+        Returned span has to support set_attribute(key, value) and record_exception(exception).
+
+            :param name: str
+            :param attributes: (optional) dict
+        """
+        return _NOOP_SPAN
+
+    def inject(self, headers):
+        """
+        Propagate current trace context into outgoing request headers
+
+            :param headers: dict
+        """
+        pass
+
+
+class _OpenTelemetrySpan(object):
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._span = None
+
+    def __enter__(self):
+        self._span = self._manager.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._manager.__exit__(exc_type, exc_val, exc_tb)
+
+    def set_attribute(self, key, value):
+        self._span.set_attribute(key, value)
+
+    def record_exception(self, exception):
+        self._span.record_exception(exception)
+
+
+class OpenTelemetryTracer(BaseTracer):
+    """
+    Tracer adapter for OpenTelemetry, requires ``opentelemetry-api`` package.
+    Spans are created with CLIENT kind as children of the current context
+    and the context is propagated with the globally configured propagator (W3C traceparent by default).
+
+        :param tracer_provider: (optional) Default global tracer provider
+        :param propagate: (optional) Default True. Inject trace context headers into requests. bool
+    """
+
+    def __init__(self, tracer_provider=None, propagate=True):
+        try:
+            from opentelemetry import trace, propagate as otel_propagate
+        except ImportError:
+            raise ImportError('OpenTelemetryTracer requires opentelemetry-api package: '
+                              'pip install opentelemetry-api')
+        self._tracer = trace.get_tracer('ll_sdk', tracer_provider=tracer_provider)
+        self._kind = trace.SpanKind.CLIENT
+        self._propagate = otel_propagate if propagate else None
+
+    def start_span(self, name, attributes=None):
+        return _OpenTelemetrySpan(self._tracer.start_as_current_span(name, kind=self._kind,
+                                                                     attributes=attributes))
+
+    def inject(self, headers):
+        if self._propagate is not None:
+            self._propagate.inject(headers)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['BaseTransport', 'RequestsTransport']
+__docformat__ = 'restructuredtext'
+
+import requests
+
+
+class BaseTransport(object):
+    """
+    Transport interface used by BaseRestAuthClient to send HTTP requests.
+
+    Implementations receive the same arguments as ``requests.Session.request``
+    and have to return ``requests.models.Response`` (or an object with the same interface).
+    """
+
+    def request(self, method, url, headers=None, timeout=None, **kwargs):
+        """
+        Send request and return response
+
+            :param method: str
+            :param url: str
+            :param headers: (optional) dict
+            :param timeout: (optional) float
+            :param kwargs: auth, params, data, files etc. as for requests.Session.request
+        """
+        raise NotImplementedError
+
+    def ensure_concurrency(self, concurrency):
+        """
+        Prepare transport to be used by the given amount of threads at once
+
+            :param concurrency: int
+        """
+        pass
+
+    def close(self):
+        """
+        Release resources held by transport
+        """
+        pass
+
+
+class RequestsTransport(BaseTransport):
+    """
+    Default transport based on requests.Session
+
+        :param session: (optional) requests.Session to use
+        :param pool_maxsize: (optional) Default 10. Max amount of kept-alive connections per host,
+                             should be not less than the amount of threads sharing the client. int
+    """
+
+    DEFAULT_POOL_MAXSIZE = requests.adapters.DEFAULT_POOLSIZE
+
+    def __init__(self, session=None, pool_maxsize=None):
+        self.session = session or requests.Session()
+        self.pool_maxsize = self.DEFAULT_POOL_MAXSIZE
+        if pool_maxsize is not None:
+            self._mount(pool_maxsize)
+
+    def _mount(self, pool_maxsize):
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pool_maxsize = pool_maxsize
+
+    def ensure_concurrency(self, concurrency):
+        if concurrency > self.pool_maxsize:
+            self._mount(concurrency)
+
+    def request(self, method, url, headers=None, timeout=None, **kwargs):
+        return self.session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+
+    def close(self):
+        self.session.close()
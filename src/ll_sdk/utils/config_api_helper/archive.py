@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['export_account', 'import_account', 'read_archive', 'ImportResult', 'FAMILIES']
+__docformat__ = 'restructuredtext'
+
+import gzip
+import itertools
+import json
+from collections import Counter, namedtuple
+from ll_sdk.utils.config_api_helper.mirror import object_uuid
+
+FORMAT = 'll_sdk-account-archive'
+FORMAT_VERSION = 1
+
+# Fields assigned by config-api, dropped before object is created again
+_SERVER_ONLY_FIELDS = frozenset(['revision', 'status', 'uuid', 'id', 'shortname'])
+
+# tier: import stage, objects of a tier are created after all objects of lower tiers
+# parent: family whose every object scopes listing (and creation) of this family
+# list: callable(client, shortname, parent) -> items, parent is (id, zone) of scoping object
+# get: callable(client, shortname, id) -> response with full object, None if listed items are complete
+# create: callable(client, shortname, zone, parent_id, obj) -> response, None for read-only families
+# Fields referring to other DNS objects -> family of the referred object, ids are unique only per family
+_REFERENCES = {'resourceId': 'dns_resource', 'healthCheckId': 'dns_health_check', 'failoverId': 'dns_failover',
+               'ruleId': 'dns_rule', 'directorPolicyId': 'dns_director_policy'}
+_REFERENCES.update({f'{key}s': family for key, family in list(_REFERENCES.items())})
+
+_Family = namedtuple('_Family', ['name', 'tier', 'parent', 'list', 'get', 'create'])
+
+
+class ImportResult(namedtuple('ImportResult', ['family', 'id', 'status', 'new_id', 'error'])):
+    """
+    Outcome of import of a single archived object
+
+        :param family: str
+        :param id: id of object in archive
+        :param status: created, failed or skipped (read-only family, missing secret or failed parent). str
+        :param new_id: id of created object
+        :param error: API error or reason of skip
+    """
+    __slots__ = ()
+
+    CREATED = 'created'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+
+def _zone_key(zone):
+    return zone.get('name') or zone.get('zoneName') or object_uuid(zone)
+
+
+def _listed(client, response):
+    return client.page_items(response)
+
+
+_FAMILY_LIST = (
+    # --- tier 0: objects without dependencies ---
+    _Family('certificate', 0, None,
+            lambda client, shortname, parent: client.iter_customer_certificates(shortname),
+            lambda client, shortname, uuid: client.get_customer_certificate(uuid),
+            lambda client, shortname, zone, parent_id, obj: client.create_customer_certificate(obj)),
+    _Family('ipacc', 0, None,
+            lambda client, shortname, parent: client.iter_customer_ipacc(shortname),
+            lambda client, shortname, uuid: client.get_customer_ipacc(uuid),
+            None),
+    _Family('edgerule', 0, None,
+            lambda client, shortname, parent: client.iter_edgerules(shortname),
+            lambda client, shortname, uuid: client.get_edgerule(shortname, uuid),
+            None),
+    _Family('lds', 0, None,
+            lambda client, shortname, parent: client.iter_lds(shortname),
+            lambda client, shortname, uuid: client.get_lds(shortname, uuid),
+            lambda client, shortname, zone, parent_id, obj: client.create_lds(shortname, obj)),
+    _Family('dns_zone', 0, None,
+            lambda client, shortname, parent: _listed(client, client.list_dns_zones(shortname)),
+            None, None),
+    _Family('dns_resource', 0, None,
+            lambda client, shortname, parent: client.iter_dns_resource(shortname),
+            None,
+            lambda client, shortname, zone, parent_id, obj: client.create_dns_resource(shortname, obj)),
+    _Family('dns_rule', 0, None,
+            lambda client, shortname, parent: client.iter_dns_rule(shortname),
+            None,
+            lambda client, shortname, zone, parent_id, obj: client.create_dns_rule(shortname, obj)),
+    _Family('live_schedule', 0, None,
+            lambda client, shortname, parent: _listed(client, client.list_live_video_schedule(shortname)),
+            None,
+            lambda client, shortname, zone, parent_id, obj: client.create_live_video_schedule(shortname, obj)),
+    _Family('live_slot', 0, None,
+            lambda client, shortname, parent: _listed(client, client.list_live_video_slot(shortname)),
+            None,
+            lambda client, shortname, zone, parent_id, obj: client.create_live_video_slot(shortname, obj)),
+    _Family('webrtc_slot', 0, None,
+            lambda client, shortname, parent: _listed(client, client.list_webrtc_video_slot(shortname)),
+            None,
+            lambda client, shortname, zone, parent_id, obj: client.create_webrtc_video_slot(shortname, obj)),
+    # --- tier 1: service instances refer to certificates, DNS objects scoped by resources and zones ---
+    _Family('delivery', 1, None,
+            lambda client, shortname, parent: client.iter_delivery_service_instances(shortname),
+            lambda client, shortname, uuid: client.get_delivery_service_instance(uuid),
+            lambda client, shortname, zone, parent_id, obj: client.create_delivery_service_instance(obj)),
+    _Family('httpcs', 1, None,
+            lambda client, shortname, parent: client.iter_httpcs_service_instances(shortname),
+            lambda client, shortname, uuid: client.get_httpcs_service_instance(uuid),
+            lambda client, shortname, zone, parent_id, obj: client.create_httpcs_service_instance(obj)),
+    _Family('dns_health_check', 1, 'dns_resource',
+            lambda client, shortname, parent: client.iter_dns_resource_health_check(shortname, parent[0]),
+            None,
+            lambda client, shortname, zone, parent_id, obj:
+            client.create_dns_resource_health_check(shortname, parent_id, obj)),
+    _Family('dns_failover', 1, 'dns_zone',
+            lambda client, shortname, parent: client.iter_dns_failover(shortname, parent[1]),
+            None,
+            lambda client, shortname, zone, parent_id, obj: client.create_dns_failover(shortname, zone, obj)),
+    # --- tier 2: failover members and director policies refer to failovers and resources ---
+    _Family('dns_resource_to_failover', 2, 'dns_failover',
+            lambda client, shortname, parent:
+            _listed(client, client.get_dns_resource_to_failover(shortname, parent[1], parent[0])),
+            None,
+            lambda client, shortname, zone, parent_id, obj:
+            client.create_dns_resource_to_failover(shortname, zone, parent_id, obj)),
+    _Family('dns_director_policy', 2, 'dns_zone',
+            lambda client, shortname, parent:
+            _listed(client, client.list_dns_director_policy(shortname, parent[1])),
+            None,
+            lambda client, shortname, zone, parent_id, obj:
+            client.create_dns_director_policy(shortname, zone, obj)),
+)
+
+_FAMILIES = {family.name: family for family in _FAMILY_LIST}
+FAMILIES = tuple(family.name for family in _FAMILY_LIST)
+
+
+class _ChunkedWriter(object):
+    """
+    JSON lines written as a sequence of gzip members of ``chunk_size`` records, every completed chunk
+    is flushed to disk and the file stays readable by any gzip reader
+    """
+
+    def __init__(self, path, chunk_size):
+        self._file = open(path, 'wb')
+        self._chunk_size = chunk_size
+        self._chunk = None
+        self._written = 0
+
+    def write(self, record):
+        if self._chunk is None:
+            self._chunk = gzip.GzipFile(fileobj=self._file, mode='wb')
+        self._chunk.write(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+        self._written += 1
+        if self._written % self._chunk_size == 0:
+            self._close_chunk()
+
+    def _close_chunk(self):
+        if self._chunk is not None:
+            self._chunk.close()
+            self._chunk = None
+            self._file.flush()
+
+    def close(self):
+        self._close_chunk()
+        self._file.close()
+
+
+def _export_family(client, shortname, family, parents, concurrency):
+    """
+    Yield (object, parent) of family, objects are fetched concurrently and yielded as they arrive
+    """
+    if family.parent is None:
+        listed = ((item, None) for item in family.list(client, shortname, None))
+    else:
+        def list_children(parent_id, zone):
+            return [(item, (parent_id, zone)) for item in family.list(client, shortname, (parent_id, zone))]
+
+        def children():
+            for result in client.map(list_children, parents, concurrency=concurrency, ordered=False):
+                if result.error is not None:
+                    raise result.error
+                yield from result.result
+        listed = children()
+
+    if family.get is None:
+        yield from listed
+        return
+
+    def fetch(item, parent):
+        return client.response_json(family.get(client, shortname, object_uuid(item))), parent
+
+    for result in client.map(fetch, listed, concurrency=concurrency, ordered=False):
+        if result.error is not None:
+            raise result.error
+        yield result.result
+
+
+def export_account(client, shortname, path, families=None, concurrency=8, chunk_size=500):
+    """
+    Stream all config objects of account into gzip compressed JSON lines archive.
+
+    Families are exported one by one in dependency order, objects of a family are fetched concurrently
+    and written as they arrive, so memory use doesn't depend on account size (only ids of objects
+    scoping other families are kept). Returns amount of exported objects per family.
+
+        :param client: ConfigApiClient
+        :param shortname: str
+        :param path: archive file. str
+        :param families: (optional) Default all FAMILIES
+        :param concurrency: (optional) Default 8. int
+        :param chunk_size: (optional) Default 500. Objects per gzip member. int
+    """
+    families = [family for family in _FAMILY_LIST if families is None or family.name in families]
+    needed_parents = {family.parent for family in families if family.parent is not None}
+    # Scoping families are listed even when they are not exported
+    scanned = [family for family in _FAMILY_LIST if family in families or family.name in needed_parents]
+    counts = Counter()
+    parents = {}
+    writer = _ChunkedWriter(path, chunk_size)
+    try:
+        writer.write({'format': FORMAT, 'version': FORMAT_VERSION, 'shortname': shortname})
+        for family in scanned:
+            exported = family in families
+            keep_ids = family.name in needed_parents
+            ids = []
+            for obj, parent in _export_family(client, shortname, family, parents.get(family.parent, []),
+                                              concurrency):
+                obj_id = _zone_key(obj) if family.name == 'dns_zone' else object_uuid(obj)
+                zone = obj_id if family.name == 'dns_zone' else (parent[1] if parent is not None else None)
+                if keep_ids:
+                    ids.append((obj_id, zone))
+                if exported:
+                    writer.write({'family': family.name, 'id': obj_id, 'parent': parent[0] if parent else None,
+                                  'zone': zone, 'object': obj})
+                    counts[family.name] += 1
+            parents[family.name] = ids
+    finally:
+        writer.close()
+    return dict(counts)
+
+
+def read_archive(path):
+    """
+    Yield records of archive: dicts with family, id, parent (id of scoping object), zone and object
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        header = json.loads(next(file, 'null'))
+        if not isinstance(header, dict) or header.get('format') != FORMAT:
+            raise ValueError(f'[{path}] is not an account archive')
+        if header['version'] > FORMAT_VERSION:
+            raise ValueError(f'Unsupported archive version [{header["version"]}]')
+        for line in file:
+            yield json.loads(line)
+
+
+def _archive_shortname(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        return json.loads(next(file)).get('shortname')
+
+
+def _clean(obj, source_shortname, shortname, id_map):
+    obj = {key: value for key, value in obj.items() if key not in _SERVER_ONLY_FIELDS}
+    if source_shortname != shortname and isinstance(obj.get('accounts'), list):
+        obj['accounts'] = [dict(account, shortname=shortname) if account.get('shortname') == source_shortname
+                           else account for account in obj['accounts']]
+    # References to other DNS objects (resourceId, failoverIds, ...) point to the new objects
+    for key, family in _REFERENCES.items():
+        value = obj.get(key)
+        if isinstance(value, list):
+            obj[key] = [id_map.get((family, item), item) if isinstance(item, (str, int)) else item
+                        for item in value]
+        elif isinstance(value, (str, int)):
+            obj[key] = id_map.get((family, value), value)
+    return obj
+
+
+def import_account(client, shortname, path, families=None, concurrency=8):
+    """
+    Replay archive into account, yield ImportResult per archived object.
+
+    Records are read lazily and created concurrently, tier by tier: an object is created only after
+    all objects it may depend on (certificates before service instances, DNS resources and zones before
+    health checks and failovers, failovers before their members and director policies). Edge rules,
+    IPACC lists and DNS zones are read-only in config-api, certificates without private key can't be created,
+    both are skipped. Children of objects which failed are skipped. Only the map of (family, old id) to new id
+    is kept in memory, ids are unique only within a family.
+
+        :param client: ConfigApiClient
+        :param shortname: target shortname. str
+        :param path: archive file. str
+        :param families: (optional) Default all families in archive
+        :param concurrency: (optional) Default 8. int
+    """
+    source_shortname = _archive_shortname(path)
+    id_map = {}
+    failed = set()
+
+    def import_one(record):
+        family = _FAMILIES[record['family']]
+        if family.create is None:
+            return ImportResult(family.name, record['id'], ImportResult.SKIPPED, None, 'read-only family')
+        obj = record['object']
+        if family.name == 'certificate' and not obj.get('body', {}).get('certKey'):
+            return ImportResult(family.name, record['id'], ImportResult.SKIPPED, None, 'private key not exported')
+        parent_id = record.get('parent')
+        if family.parent is not None:
+            if (family.parent, parent_id) in failed:
+                return ImportResult(family.name, record['id'], ImportResult.SKIPPED, None,
+                                    f'{family.parent} [{parent_id}] was not imported')
+            parent_id = id_map.get((family.parent, parent_id), parent_id)
+        response = family.create(client, shortname, record.get('zone'), parent_id,
+                                 _clean(obj, source_shortname, shortname, id_map))
+        if not 200 <= response.status_code < 300:
+            return ImportResult(family.name, record['id'], ImportResult.FAILED, None, response.text)
+        payload = response.json() if response.content else None
+        return ImportResult(family.name, record['id'], ImportResult.CREATED,
+                            object_uuid(payload) if isinstance(payload, dict) else None, None)
+
+    records = (record for record in read_archive(path) if families is None or record['family'] in families)
+    for _, tier in itertools.groupby(records, key=lambda record: _FAMILIES[record['family']].tier):
+        # Every tier is completed before the next one starts
+        for result in client.map(import_one, ((record,) for record in tier), concurrency=concurrency,
+                                 ordered=False):
+            record = result.item[0]
+            if result.error is not None:
+                import_result = ImportResult(record['family'], record['id'], ImportResult.FAILED, None,
+                                             result.error)
+            else:
+                import_result = result.result
+            if import_result.status == ImportResult.CREATED:
+                if import_result.new_id is not None:
+                    id_map[(record['family'], record['id'])] = import_result.new_id
+            elif _FAMILIES[record['family']].create is not None:
+                # Children of read-only objects use the existing parent, children of failed ones are skipped
+                failed.add((record['family'], record['id']))
+            yield import_result
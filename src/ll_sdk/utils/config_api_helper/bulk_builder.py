@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['BulkConfigBuilder', 'parse_options']
+__docformat__ = 'restructuredtext'
+
+import csv
+import json
+from itertools import product
+from ll_sdk.utils.config_api_helper.templates.delivery_template import _new_deliver_service_instance
+from ll_sdk.utils.config_api_helper.templates.httpcs_template import _new_http_cs_service_instance
+
+SUPPORTED_VIDEO_FORMATS = ('hls', 'hds', 'mss', 'dash')
+REWRITE_TYPES = ('manifest', 'chunk')
+MAX_PROTOCOL_SETS = 2
+
+# column -> accepted aliases
+_COLUMNS = {
+    'service': ('service',),
+    'uuid': ('uuid',),
+    'shortname': ('shortname',),
+    'published_host': ('published_host', 'publishedHostname'),
+    'source_host': ('source_host', 'sourceHostname'),
+    'published_path': ('published_path', 'publishedUrlPath'),
+    'source_path': ('source_path', 'sourceUrlPath'),
+    'profile_name': ('profile_name', 'profile', 'serviceProfileName'),
+    'published_protocol': ('published_protocol', 'publishedProtocol'),
+    'source_protocol': ('source_protocol', 'sourceProtocol'),
+    'options': ('options',),
+    'video_formats': ('video_formats', 'videoFormats'),
+}
+
+
+def _value(row, column):
+    for alias in _COLUMNS[column]:
+        value = row.get(alias)
+        # Empty CSV cells and NaN of DataFrames mean "not set"
+        if value is not None and value == value and value != '':
+            return value
+    return None
+
+
+def _split(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.replace('|', ',').split(',') if item.strip()]
+    return list(value)
+
+
+def parse_options(value):
+    """
+    Options of a table cell as tuple of (name, parameters tuple). Accepted formats:
+    list of {"name", "parameters"} dicts or (name, parameters) pairs, dict name -> parameters,
+    JSON of any of those, or ``name=p1,p2;name2;name3=p``
+
+        :param value: cell value
+    """
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = value.strip()
+        if value[:1] in ('[', '{'):
+            value = json.loads(value)
+        else:
+            options = []
+            for item in value.split(';'):
+                name, _, parameters = item.partition('=')
+                if name.strip():
+                    options.append((name.strip(), tuple(_split(parameters))))
+            return tuple(options)
+    if isinstance(value, dict):
+        value = list(value.items())
+    options = []
+    for option in value:
+        name, parameters = (option['name'], option.get('parameters')) if isinstance(option, dict) else option
+        if parameters is None:
+            parameters = ()
+        elif isinstance(parameters, (str, int, float)):
+            parameters = (parameters,)
+        options.append((name, tuple(parameters)))
+    return tuple(options)
+
+
+class BulkConfigBuilder(object):
+    """
+    Builder of delivery and httpcs service instance payloads from tabular inventory (CSV file, DataFrame
+    or iterable of dicts), one row per service instance.
+
+    Payloads are equal to DeliverServiceInstanceObj/HttpCsServiceInstanceObj.generate_default() with the
+    same protocol sets and options, but they are built in one pass without helper objects, and parts which
+    repeat between rows (accounts, protocol sets with their options, httpcs children) are built once
+    and shared by all rows using them. Shared parts must be treated as read-only: serialize or submit the
+    payloads, copy them (templates.factory.clone_json) before editing.
+
+    Columns (snake case or config-api names): service (delivery or httpcs), uuid (update instead of create),
+    shortname, published_host, source_host, published_path, source_path, profile_name, published_protocol
+    and source_protocol (``https|http`` for two protocol sets), options (see parse_options())
+    and video_formats (httpcs, ``hls|dash``). Missing columns fall back to the builder defaults.
+
+        :param shortname: (optional) default shortname. str
+        :param service: (optional) Default delivery. default service. str
+        :param profile_name: (optional) default service profile name. str
+        :param published_protocol: (optional) Default https. str or list
+        :param source_protocol: (optional) Default https. str or list
+        :param options: (optional) default options of protocol sets
+        :param video_formats: (optional) Default hls. default httpcs video formats. str or list
+    """
+
+    def __init__(self, shortname=None, service='delivery', profile_name=None, published_protocol='https',
+                 source_protocol='https', options=None, video_formats='hls'):
+        self.defaults = {'shortname': shortname, 'service': service, 'profile_name': profile_name,
+                         'published_protocol': published_protocol, 'source_protocol': source_protocol,
+                         'options': options, 'video_formats': video_formats}
+        self._accounts = {}
+        self._protocol_sets = {}
+        self._children = {}
+
+    # --- Shared parts ---
+    def _accounts_of(self, shortname):
+        accounts = self._accounts.get(shortname)
+        if accounts is None:
+            accounts = self._accounts[shortname] = [{'shortname': shortname}]
+        return accounts
+
+    def _protocol_sets_of(self, published_protocols, source_protocols, options):
+        key = (published_protocols, source_protocols, options)
+        protocol_sets = self._protocol_sets.get(key)
+        if protocol_sets is None:
+            option_objects = [{'name': name, 'parameters': list(parameters)} for name, parameters in options]
+            protocol_sets = [{'publishedProtocol': published, 'sourceProtocol': source, 'options': option_objects}
+                             for published, source in zip(published_protocols, source_protocols)]
+            # Same limit as add_protocol_set()
+            del protocol_sets[MAX_PROTOCOL_SETS:]
+            self._protocol_sets[key] = protocol_sets
+        return protocol_sets
+
+    def _children_of(self, video_formats, protocol_sets):
+        key = (video_formats, id(protocol_sets))
+        children = self._children.get(key)
+        if children is None:
+            children = self._children[key] = [
+                {'protocolSets': protocol_sets,
+                 'description': f'Generated by LLNW-SDK child {video_format} - {rewrite_type}',
+                 'publishedUrlPath': '', 'sourceUrlPath': '',
+                 'serviceKey': {'name': 'httpcs', 'videoFormat': video_format, 'rewriteType': rewrite_type}}
+                for video_format, rewrite_type in product(video_formats, REWRITE_TYPES)]
+        return children
+
+    # --- Rows ---
+    def _get(self, row, column):
+        value = _value(row, column)
+        return value if value is not None else self.defaults.get(column)
+
+    def build_row(self, row):
+        """
+        Payload of a single row
+
+            :param row: dict
+        """
+        published_host = _value(row, 'published_host')
+        source_host = _value(row, 'source_host')
+        if not published_host or not source_host:
+            raise ValueError(f'Row {row} has no published_host or source_host')
+        shortname = self._get(row, 'shortname')
+        if not shortname:
+            raise ValueError(f'Row {row} has no shortname')
+        service = self._get(row, 'service')
+        published_protocols = tuple(_split(self._get(row, 'published_protocol'))) or ('https',)
+        source_protocols = tuple(_split(self._get(row, 'source_protocol'))) or ('https',)
+        if len(published_protocols) != len(source_protocols):
+            raise ValueError(f'Row {row} has different amount of published and source protocols')
+        options = parse_options(self._get(row, 'options'))
+
+        if service == 'httpcs':
+            config = _new_http_cs_service_instance()
+            instance = config['body']['httpcsSvcInstance']
+            video_formats = tuple(_split(self._get(row, 'video_formats')))
+            if not video_formats or not set(video_formats).issubset(SUPPORTED_VIDEO_FORMATS):
+                raise ValueError(f'Supported video formats are {SUPPORTED_VIDEO_FORMATS}, row {row}')
+            instance['protocolSets'] = self._protocol_sets_of(published_protocols, source_protocols, options)
+            config['body']['childHttpcsSvcInstances'] = self._children_of(video_formats, instance['protocolSets'])
+        elif service == 'delivery':
+            config = _new_deliver_service_instance()
+            instance = config['body']
+            instance['protocolSets'] = self._protocol_sets_of(published_protocols, source_protocols, options)
+        else:
+            raise ValueError(f'Unsupported service [{service}]')
+
+        instance['publishedHostname'] = published_host
+        instance['sourceHostname'] = source_host
+        instance['publishedUrlPath'] = _value(row, 'published_path') or ''
+        instance['sourceUrlPath'] = _value(row, 'source_path') or ''
+        instance['serviceProfileName'] = self._get(row, 'profile_name') or ''
+        config['accounts'] = self._accounts_of(shortname)
+        uuid = _value(row, 'uuid')
+        if uuid is not None:
+            config['uuid'] = uuid
+        return config
+
+    @staticmethod
+    def iter_rows(table):
+        """
+        Rows of table as dicts, read lazily
+
+            :param table: path to CSV file, open CSV file, pandas DataFrame or iterable of dicts
+        """
+        if isinstance(table, str):
+            with open(table, newline='') as file:
+                yield from csv.DictReader(file)
+        elif hasattr(table, 'itertuples') and hasattr(table, 'columns'):
+            columns = [str(column) for column in table.columns]
+            for values in table.itertuples(index=False, name=None):
+                yield dict(zip(columns, values))
+        elif hasattr(table, 'read'):
+            yield from csv.DictReader(table)
+        else:
+            yield from table
+
+    def iter_configs(self, table):
+        """
+        Yield payload per row, the table is read lazily
+
+            :param table: path to CSV file, open CSV file, pandas DataFrame or iterable of dicts
+        """
+        for row in self.iter_rows(table):
+            yield self.build_row(row)
+
+    def build(self, table):
+        """
+        List of payloads of all rows
+
+            :param table: path to CSV file, open CSV file, pandas DataFrame or iterable of dicts
+        """
+        return list(self.iter_configs(table))
+
+    def write_jsonl(self, table, file):
+        """
+        Stream payloads as JSON lines into file, returns amount of written payloads
+
+            :param table: path to CSV file, open CSV file, pandas DataFrame or iterable of dicts
+            :param file: text file
+        """
+        count = 0
+        for config in self.iter_configs(table):
+            file.write(json.dumps(config, separators=(',', ':')))
+            file.write('\n')
+            count += 1
+        return count
+
+    def provision(self, provisioner, table, ordered=True):
+        """
+        Stream payloads into BulkProvisioner (validate -> create, or update for rows with uuid),
+        yield ProvisionResult per row
+
+            :param provisioner: BulkProvisioner
+            :param table: path to CSV file, open CSV file, pandas DataFrame or iterable of dicts
+            :param ordered: (optional) Default True. bool
+        """
+        return provisioner.provision(self.iter_configs(table), ordered=ordered)
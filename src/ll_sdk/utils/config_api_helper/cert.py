@@ -5,7 +5,6 @@ __all__ = ['SSLCertObj']
 __docformat__ = 'restructuredtext'
 
 import uuid
-from copy import deepcopy
 from ll_sdk.utils.config_api_helper.templates.ssl_cert_template import *
 
 
@@ -26,7 +25,7 @@ class SSLCertObj(dict):
         Clear all field values
         """
         self.clear()
-        self._temp = deepcopy(_ssl_cert_template)
+        self._temp = _new_ssl_cert()
 
     def generate_default(self, shortname, cert, cert_key, intermediate_certs=None, cert_name=None):
         """
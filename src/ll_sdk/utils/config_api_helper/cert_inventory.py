@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['CertificateInventory', 'CertRecord', 'parse_certificate']
+__docformat__ = 'restructuredtext'
+
+import bisect
+import hashlib
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+from dateutil import parser as date_parser
+from ll_sdk.config_api import ConfigApiBaseException
+
+_PEM_CERT = re.compile(r'-----BEGIN CERTIFICATE-----.+?-----END CERTIFICATE-----', re.DOTALL)
+_NOT_AFTER_KEYS = ('expirationDate', 'expiration', 'expiryDate', 'notAfter', 'validTo')
+_NOT_BEFORE_KEYS = ('issuedDate', 'notBefore', 'validFrom')
+_SAN_KEYS = ('subjectAlternativeNames', 'sans', 'san', 'dnsNames')
+_SUBJECT_KEYS = ('commonName', 'subject', 'cn')
+_REVISION_KEYS = ('revision', 'version', 'versionNumber', 'lastModified', 'lastModifiedDate', 'lastUpdatedDate')
+_ISSUER_KEYS = ('issuer', 'issuerName')
+_NEVER = datetime.max.replace(tzinfo=timezone.utc)
+
+
+class CertRecord(namedtuple('CertRecord', ['uuid', 'name', 'fingerprint', 'subject', 'sans', 'issuer',
+                                           'not_before', 'not_after', 'revision'])):
+    """
+    Parsed metadata of customer certificate
+
+        :param uuid: str
+        :param name: certName. str
+        :param fingerprint: str
+        :param subject: common name. str
+        :param sans: DNS subject alternative names, lower case. tuple
+        :param issuer: str
+        :param not_before: datetime (UTC)
+        :param not_after: datetime (UTC)
+        :param revision: change marker of listing (revision, version or last modification), None if unknown
+    """
+    __slots__ = ()
+
+
+_Parsed = namedtuple('_Parsed', ['subject', 'sans', 'issuer', 'not_before', 'not_after'])
+
+
+def _utc(value):
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        # config-api timestamps are epoch milliseconds
+        value = datetime.fromtimestamp(value / 1000, timezone.utc) if isinstance(value, (int, float)) \
+            else date_parser.parse(value)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _first(body, keys):
+    return next((body[key] for key in keys if body.get(key)), None)
+
+
+def _leaf_pem(body):
+    match = _PEM_CERT.search(body.get('cert') or '')
+    return match.group(0) if match else None
+
+
+def _parse_pem(pem):
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    cert = x509.load_pem_x509_certificate(pem.encode('ascii'))
+    try:
+        sans = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value \
+            .get_values_for_type(x509.DNSName)
+    except x509.ExtensionNotFound:
+        sans = []
+    common_names = cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+    issuer_names = cert.issuer.get_attributes_for_oid(NameOID.COMMON_NAME)
+    return _Parsed(common_names[0].value if common_names else None, sans,
+                   issuer_names[0].value if issuer_names else cert.issuer.rfc4514_string(),
+                   _utc(getattr(cert, 'not_valid_before_utc', None) or cert.not_valid_before),
+                   _utc(getattr(cert, 'not_valid_after_utc', None) or cert.not_valid_after))
+
+
+def parse_certificate(body):
+    """
+    Metadata of certificate body: parsed from PEM with ``cryptography`` package when it is installed,
+    otherwise taken from fields returned by config-api
+
+        :param body: body of SSLCertObj or of get_customer_certificate response
+    """
+    pem = _leaf_pem(body)
+    if pem is not None:
+        try:
+            parsed = _parse_pem(pem)
+        except (ImportError, ValueError):
+            parsed = None
+        if parsed is not None:
+            return parsed
+    sans = _first(body, _SAN_KEYS) or []
+    if isinstance(sans, str):
+        sans = [san.strip() for san in sans.split(',')]
+    subject = _first(body, _SUBJECT_KEYS)
+    if isinstance(subject, dict):
+        subject = subject.get('commonName') or subject.get('CN')
+    return _Parsed(subject, sans, _first(body, _ISSUER_KEYS), _utc(_first(body, _NOT_BEFORE_KEYS)),
+                   _utc(_first(body, _NOT_AFTER_KEYS)))
+
+
+def _revision(item):
+    """
+    Change marker of listed or fetched certificate, None if config-api returned none
+    """
+    revision = _first(item, _REVISION_KEYS)
+    if isinstance(revision, dict):
+        revision = _first(revision, ('versionNumber', 'version', 'lastUpdatedDate', 'lastModified')) or \
+            tuple(sorted(revision.items()))
+    return revision
+
+
+def _fingerprint(body):
+    fingerprints = body.get('fingerprints')
+    if fingerprints:
+        return fingerprints[0] if isinstance(fingerprints, list) else fingerprints
+    pem = _leaf_pem(body)
+    return hashlib.sha256(pem.encode('ascii')).hexdigest() if pem is not None else None
+
+
+class CertificateInventory(object):
+    """
+    Inventory of customer certificates with parsed metadata, expiry index and SAN map.
+
+    Every certificate is parsed once per fingerprint, refresh() downloads only certificates whose
+    fingerprint is not known yet. Expiry sweeps use sorted index (bisect), hostname lookups use SAN map
+    with wildcard support.
+
+        :param client: (optional) ConfigApiClient, required for refresh()
+        :param shortname: (optional) str, required for refresh()
+        :param concurrency: (optional) Default 8. Parallel get_customer_certificate calls. int
+    """
+
+    def __init__(self, client=None, shortname=None, concurrency=8):
+        self.client = client
+        self.shortname = shortname
+        self.concurrency = concurrency
+        self._parsed = {}
+        self._records = {}
+        self._expiry = []
+        self._sans = {}
+
+    # --- Updates ---
+    def add(self, cert, uuid=None, revision=None):
+        """
+        Add or replace certificate
+
+            :param cert: SSLCertObj or get_customer_certificate json
+            :param uuid: (optional) Default cert['uuid']. str
+            :param revision: (optional) Default revision of cert. Change marker compared by refresh()
+        """
+        uuid = uuid or cert.get('uuid')
+        body = cert['body']
+        fingerprint = _fingerprint(body)
+        parsed = self._parsed.get(fingerprint) if fingerprint is not None else None
+        if parsed is None:
+            parsed = parse_certificate(body)
+            if fingerprint is not None:
+                self._parsed[fingerprint] = parsed
+        self.remove(uuid)
+        record = CertRecord(uuid, body.get('certName'), fingerprint, parsed.subject,
+                            tuple(sorted({san.lower() for san in parsed.sans})), parsed.issuer,
+                            parsed.not_before, parsed.not_after,
+                            revision if revision is not None else _revision(cert))
+        self._records[uuid] = record
+        if record.not_after is not None:
+            bisect.insort(self._expiry, (record.not_after, uuid))
+        for san in set(record.sans) | ({record.subject.lower()} if record.subject else set()):
+            self._sans.setdefault(san, set()).add(uuid)
+        return record
+
+    def remove(self, uuid):
+        record = self._records.pop(uuid, None)
+        if record is None:
+            return
+        if record.not_after is not None:
+            del self._expiry[bisect.bisect_left(self._expiry, (record.not_after, uuid))]
+        for san in set(record.sans) | ({record.subject.lower()} if record.subject else set()):
+            self._sans[san].discard(uuid)
+            if not self._sans[san]:
+                del self._sans[san]
+
+    def refresh(self):
+        """
+        Synchronize with list_customer_certificates, download only certificates with unknown fingerprint.
+        Known certificates are also skipped when listing has no fingerprint but their revision is unchanged.
+        Returns amount of downloaded certificates.
+        """
+        listed = {}
+        for item in self.client.iter_customer_certificates(self.shortname):
+            uuid = item.get('uuid') or item.get('id')
+            listed[uuid] = item
+        for uuid in [uuid for uuid in self._records if uuid not in listed]:
+            self.remove(uuid)
+
+        to_fetch = []
+        for uuid, item in listed.items():
+            body = item.get('body') or {}
+            fingerprint = _fingerprint(body)
+            revision = _revision(item)
+            known = self._records.get(uuid)
+            if known is not None and fingerprint is not None and known.fingerprint == fingerprint:
+                continue
+            if known is not None and fingerprint is None and revision is not None and known.revision == revision:
+                continue
+            if fingerprint in self._parsed or _leaf_pem(body) is not None:
+                self.add(item, uuid, revision)
+            else:
+                to_fetch.append((uuid, revision))
+
+        for result in self.client.map(lambda uuid, revision: self.client.get_customer_certificate(uuid), to_fetch,
+                                      concurrency=self.concurrency):
+            if result.error is not None:
+                raise result.error
+            if result.result.status_code != 200:
+                raise ConfigApiBaseException(result.result.status_code, result.result.text)
+            self.add(result.result.json(), *result.item)
+        return len(to_fetch)
+
+    # --- Queries ---
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, uuid):
+        return self._records.get(uuid)
+
+    def records(self):
+        return list(self._records.values())
+
+    def expiring_before(self, when):
+        """
+        Records of certificates expiring before datetime, the soonest first
+
+            :param when: datetime (naive is treated as UTC)
+        """
+        end = bisect.bisect_left(self._expiry, (_utc(when), ''))
+        return [self._records[uuid] for _, uuid in self._expiry[:end]]
+
+    def expired(self, now=None):
+        """
+        Records of already expired certificates
+
+            :param now: (optional) Default current time. datetime
+        """
+        return self.expiring_before(now or datetime.now(timezone.utc))
+
+    def for_hostname(self, hostname):
+        """
+        Records of certificates covering hostname by SAN/common name, including wildcard names
+
+            :param hostname: str
+        """
+        hostname = hostname.lower().rstrip('.')
+        uuids = set(self._sans.get(hostname, ()))
+        if '.' in hostname:
+            uuids.update(self._sans.get('*.' + hostname.split('.', 1)[1], ()))
+        return sorted((self._records[uuid] for uuid in uuids), key=lambda record: record.not_after or _NEVER)
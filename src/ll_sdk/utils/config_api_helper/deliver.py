@@ -6,8 +6,17 @@ __docformat__ = 'restructuredtext'
 
 import uuid
 import requests
-from copy import deepcopy
+from ll_sdk.utils.config_api_helper.list_index import ListIndex
 from ll_sdk.utils.config_api_helper.templates.delivery_template import *
+from ll_sdk.utils.config_api_helper.templates.factory import clone_json
+
+
+def _protocol_key(protocol_set):
+    return protocol_set.get('publishedProtocol'), protocol_set.get('sourceProtocol')
+
+
+def _option_key(option):
+    return option.get('name')
 
 
 class DeliverServiceInstanceObj(dict):
@@ -36,8 +45,9 @@ class DeliverServiceInstanceObj(dict):
         Clear all field values
         """
         self.clear()
-        self._temp = deepcopy(_deliver_service_instance_template)
-        self._protocol_set_temp = deepcopy(_protocol_set_template)
+        self._temp = _new_deliver_service_instance()
+        self._protocol_index = ListIndex(_protocol_key)
+        self._option_index = ListIndex(_option_key)
 
     def _set_base(self, **kwargs):
         """
@@ -108,14 +118,7 @@ class DeliverServiceInstanceObj(dict):
 
     # --- Protocol Set ---
     def _get_protocol_idx(self, published_protocol, source_protocol):
-
-        protocol_sets_list = deepcopy(self['body']['protocolSets'])
-        protocol_idx = next((i for i, value in enumerate(protocol_sets_list) if
-                             (value['publishedProtocol'] == published_protocol and
-                              value['sourceProtocol'] == source_protocol)), None)
-        # if protocol_idx is False:
-        #     raise DeliverInstanceBaseException("Protocol not found")
-        return protocol_idx
+        return self._protocol_index.find(self['body']['protocolSets'], (published_protocol, source_protocol))
 
     def clear_protocol_set(self, published_protocol=None, source_protocol=None):
         """
@@ -128,20 +131,23 @@ class DeliverServiceInstanceObj(dict):
         if published_protocol and source_protocol:
             protocol_idx = self._get_protocol_idx(published_protocol, source_protocol)
             del self['body']['protocolSets'][protocol_idx]
+            self._protocol_index.invalidate(self['body']['protocolSets'])
         else:
             self['body']['protocolSets'] = []
+            self._protocol_index.clear()
 
     def add_protocol_set(self, published_protocol='https', source_protocol='https',
                          published_port=None, source_port=None, options=None):
         """
         Add one protocol set.
         """
-        protocol_set = deepcopy(self._protocol_set_temp)
+        protocol_set = _new_protocol_set()
         for arg, kwarg in locals().items():
             if arg in self.__protocol_set_fields and kwarg:
                 protocol_set[self.__protocol_set_fields[arg]] = kwarg
         if len(self['body']['protocolSets']) < 2:
             self['body']['protocolSets'].append(protocol_set)
+            self._protocol_index.appended(self['body']['protocolSets'])
 
     def modify_protocol_set(self, published_protocol, source_protocol,
                             published_port=None, source_port=None, options=None):
@@ -160,11 +166,12 @@ class DeliverServiceInstanceObj(dict):
         for arg, kwarg in locals().items():
             if arg in self.__protocol_set_fields and kwarg:
                 self["body"]['protocolSets'][protocol_idx][self.__protocol_set_fields[arg]] = kwarg
+        self._protocol_index.invalidate(self['body']['protocolSets'])
 
     # --- Options ---
     def _get_option_idx(self, option_name, options):
-        option_idx = next((i for i, item in enumerate(options) if item["name"] == option_name), False)
-        if option_idx is False:
+        option_idx = self._option_index.find(options, option_name)
+        if option_idx is None:
             raise DeliverInstanceBaseException('Option [{}] not present in Option Array [{}]'.format(option_name, options))
         return option_idx
 
@@ -182,8 +189,9 @@ class DeliverServiceInstanceObj(dict):
 
     def _add_option_protocol_sets_scope(self, option_name, option_parameters, protocol_set):
         _option_object = self._prepare_option_object(option_name, option_parameters)
-        option_object = deepcopy(_option_object)
+        option_object = clone_json(_option_object)
         protocol_set['options'].append(option_object)
+        self._option_index.appended(protocol_set['options'])
 
     def _modify_option_protocol_sets_scope(self, option_name, option_parameters, protocol_set):
         option_idx = self._get_option_idx(option_name, protocol_set['options'])
@@ -194,6 +202,7 @@ class DeliverServiceInstanceObj(dict):
         option_idx = self._get_option_idx(option_name, protocol_set['options'])
         if option_idx is not False:
             del protocol_set['options'][option_idx]
+            self._option_index.invalidate(protocol_set['options'])
 
     def _prepare_option_object(self, option_name, option_parameters):
 
@@ -257,6 +266,8 @@ class DeliverServiceInstanceObj(dict):
         del response['revision']
         del response['shortname']
         del response['status']
+        self._protocol_index.clear()
+        self._option_index.clear()
         self._set_base(**response)
 
     # --- Property ---
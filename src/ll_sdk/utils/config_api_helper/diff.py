@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['Change', 'normalize_config', 'config_diff', 'has_changes', 'update_if_changed']
+__docformat__ = 'restructuredtext'
+
+from collections import namedtuple
+from ll_sdk.config_api import ConfigApiBaseException
+from ll_sdk.utils.config_api_helper.provisioning import service_of
+
+Change = namedtuple('Change', ['path', 'local', 'remote'])
+
+# Fields populated by config-api, they never describe desired state
+SERVER_ONLY_FIELDS = frozenset(['revision', 'status', 'uuid', 'shortname'])
+_SERVICE_SERVER_ONLY_FIELDS = frozenset(['revision', 'status', 'uuid'])
+
+_MISSING = object()
+
+
+def _clean(value):
+    """
+    Copy of value without empty values (None, '') which config-api treats as absent
+    """
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items() if item is not None and item != ''}
+    if isinstance(value, list):
+        return [_clean(item) for item in value]
+    return value
+
+
+def _protocol_set_key(protocol_set):
+    return protocol_set.get('publishedProtocol', ''), protocol_set.get('sourceProtocol', '')
+
+
+def _child_key(child):
+    service_key = child.get('serviceKey', {})
+    return service_key.get('videoFormat', ''), service_key.get('rewriteType', '')
+
+
+def _normalize_service(service):
+    for key in _SERVICE_SERVER_ONLY_FIELDS.intersection(service):
+        del service[key]
+    protocol_sets = []
+    for protocol_set in service.get('protocolSets', []):
+        protocol_set = dict(protocol_set)
+        # Options with different names are independent, options with the same name keep relative order
+        protocol_set['options'] = sorted(protocol_set.get('options', []), key=lambda option: option.get('name', ''))
+        protocol_sets.append(protocol_set)
+    service['protocolSets'] = sorted(protocol_sets, key=_protocol_set_key)
+    return service
+
+
+def normalize_config(config):
+    """
+    Canonical form of delivery/httpcs service instance for comparison: server-only fields removed,
+    protocolSets sorted by protocols, options sorted by name (stable), httpcs children sorted by
+    (videoFormat, rewriteType) and accounts sorted by shortname.
+
+        :param config: DeliverServiceInstanceObj, HttpCsServiceInstanceObj or dict
+    """
+    config = {key: value for key, value in _clean(config).items() if key not in SERVER_ONLY_FIELDS}
+    body = config.get('body', {})
+    if 'httpcsSvcInstance' in body:
+        _normalize_service(body['httpcsSvcInstance'])
+        body['childHttpcsSvcInstances'] = sorted((_normalize_service(child)
+                                                  for child in body.get('childHttpcsSvcInstances', [])),
+                                                 key=_child_key)
+    elif body:
+        _normalize_service(body)
+    if 'accounts' in config:
+        config['accounts'] = sorted(config['accounts'], key=lambda account: account.get('shortname', ''))
+    return config
+
+
+def _diff(local, remote, path, changes):
+    if isinstance(local, dict) and isinstance(remote, dict):
+        for key in sorted(set(local) | set(remote)):
+            _diff(local.get(key, _MISSING), remote.get(key, _MISSING), f'{path}.{key}' if path else key, changes)
+    elif isinstance(local, list) and isinstance(remote, list) and len(local) == len(remote):
+        for idx, (local_item, remote_item) in enumerate(zip(local, remote)):
+            _diff(local_item, remote_item, f'{path}[{idx}]', changes)
+    elif local != remote:
+        changes.append(Change(path, None if local is _MISSING else local, None if remote is _MISSING else remote))
+
+
+def config_diff(local, remote):
+    """
+    List of semantic differences between local config and remote state
+
+        :param local: desired config
+        :param remote: config from config-api (json or requests.models.Response)
+    """
+    if hasattr(remote, 'json') and callable(remote.json):
+        remote = remote.json()
+    changes = []
+    _diff(normalize_config(local), normalize_config(remote), '', changes)
+    return changes
+
+
+def has_changes(local, remote):
+    """
+    True if update of remote state to local config would change anything
+
+        :param local: desired config
+        :param remote: config from config-api
+    """
+    return bool(config_diff(local, remote))
+
+
+def update_if_changed(client, uuid, config, remote=None):
+    """
+    Update delivery/httpcs service instance only if it differs from remote state.
+    Returns update response or None if there is nothing to update.
+    Raises ConfigApiBaseException when remote state is not given and can't be fetched,
+    nothing is updated then.
+
+        :param client: ConfigApiClient
+        :param uuid: str
+        :param config: desired config
+        :param remote: (optional) current remote state, fetched with get_*_service_instance if not present
+    """
+    service = service_of(config)
+    if remote is None:
+        response = getattr(client, f'get_{service}_service_instance')(uuid)
+        if response.status_code != 200:
+            raise ConfigApiBaseException(response.status_code, response.text)
+        remote = response.json()
+    if not has_changes(config, remote):
+        client.logger.debug(f"Skipping update of {service} service instance [{uuid}], nothing changed")
+        return None
+    return getattr(client, f'update_{service}_service_instance')(uuid, config)
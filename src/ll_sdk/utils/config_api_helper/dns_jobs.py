@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['DnsJobTracker', 'DnsJobException']
+__docformat__ = 'restructuredtext'
+
+import threading
+import time
+from concurrent.futures import Future
+from ll_sdk.config_api import ConfigApiBaseException
+
+_JOB_ID_KEYS = ('id', 'jobId', 'uuid')
+_STATUS_KEYS = ('status', 'state', 'jobStatus')
+SUCCESS_STATUSES = frozenset(['completed', 'complete', 'success', 'succeeded', 'done', 'finished'])
+FAILURE_STATUSES = frozenset(['failed', 'failure', 'error', 'cancelled', 'canceled', 'aborted'])
+
+
+def _jobs_of(payload):
+    if isinstance(payload, dict):
+        for key in ('jobs', 'content', 'items'):
+            if isinstance(payload.get(key), list):
+                return payload[key]
+        return []
+    return payload if isinstance(payload, list) else []
+
+
+def _job_id(job):
+    return next((str(job[key]) for key in _JOB_ID_KEYS if job.get(key) is not None), None)
+
+
+def _job_status(job):
+    status = next((job[key] for key in _STATUS_KEYS if isinstance(job.get(key), str)), '')
+    return status.lower()
+
+
+class DnsJobTracker(object):
+    """
+    Tracks completion of DNS jobs with a single background poller shared by all jobs.
+
+    Every polling round requests list_dns_job once for status of all tracked jobs, jobs missing in the
+    listing are requested with get_dns_job concurrently. The interval between rounds grows by ``backoff``
+    while nothing changes and resets when a job completes or a new job is tracked.
+    The poller thread runs only while there are jobs to track. Jobs not resolved within ``timeout`` fail with
+    DnsJobException, after ``max_failures`` consecutive failed rounds (e.g. 401/403) all pending jobs fail
+    with the last error.
+
+        :param client: ConfigApiClient
+        :param interval: (optional) Default 1. Initial interval between polls, seconds. float
+        :param max_interval: (optional) Default 30. seconds. float
+        :param backoff: (optional) Default 1.5. float
+        :param list_size: (optional) Default 100. Amount of jobs requested with list_dns_job. int
+        :param concurrency: (optional) Default 8. Parallel get_dns_job calls. int
+        :param background: (optional) Default True. Start poller thread on track(),
+                           otherwise poll() has to be called by the caller. bool
+        :param timeout: (optional) Default 600. Seconds a job may stay pending, None for no limit. float
+        :param max_failures: (optional) Default 10. Consecutive failed polling rounds of background poller
+                             before pending jobs fail, None for no limit. int
+    """
+
+    def __init__(self, client, interval=1, max_interval=30, backoff=1.5, list_size=100, concurrency=8,
+                 background=True, timeout=600, max_failures=10):
+        self.client = client
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.list_size = list_size
+        self.concurrency = concurrency
+        self.background = background
+        self.timeout = timeout
+        self.max_failures = max_failures
+        self._pending = {}
+        self._deadlines = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._delay = interval
+
+    def track(self, job_id):
+        """
+        Future resolved with job payload when job completes, or failed with DnsJobException when job fails
+
+            :param job_id: str
+        """
+        job_id = str(job_id)
+        with self._lock:
+            future = self._pending.get(job_id)
+            if future is None:
+                future = self._pending[job_id] = Future()
+                if self.timeout is not None:
+                    self._deadlines[job_id] = time.monotonic() + self.timeout
+            self._delay = self.interval
+            if self.background and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='dns-job-tracker', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return future
+
+    def track_async(self, job_id, loop=None):
+        """
+        Awaitable version of track()
+
+            :param job_id: str
+            :param loop: (optional) Default current event loop
+        """
+        import asyncio
+        return asyncio.wrap_future(self.track(job_id), loop=loop)
+
+    def join(self, timeout=None):
+        """
+        Wait until poller thread ends, i.e. all tracked jobs are resolved
+
+            :param timeout: (optional) seconds. float
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def _resolve(self, job_id, job):
+        status = _job_status(job)
+        if status in SUCCESS_STATUSES:
+            future = self._pending.pop(job_id)
+            future.set_result(job)
+        elif status in FAILURE_STATUSES:
+            future = self._pending.pop(job_id)
+            future.set_exception(DnsJobException(job_id, job))
+        else:
+            return False
+        self._deadlines.pop(job_id, None)
+        return True
+
+    def _expire(self):
+        """
+        Fail jobs pending longer than timeout, returns amount of expired jobs
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, deadline in self._deadlines.items() if deadline <= now]
+            for job_id in expired:
+                del self._deadlines[job_id]
+                self._pending.pop(job_id).set_exception(
+                    DnsJobException(job_id, None, f'not resolved within {self.timeout}s'))
+        return len(expired)
+
+    def poll(self):
+        """
+        Single polling round, returns amount of resolved (including expired) jobs.
+        Raises ConfigApiBaseException when no job status could be read.
+        """
+        with self._lock:
+            waiting = set(self._pending)
+        if not waiting:
+            return 0
+        statuses = {}
+        response = self.client.list_dns_job(size=self.list_size)
+        if response.status_code == 200:
+            for job in _jobs_of(response.json()):
+                job_id = _job_id(job)
+                if job_id in waiting:
+                    statuses[job_id] = job
+        missing = [job_id for job_id in waiting if job_id not in statuses]
+        errors = []
+        for result in self.client.map('get_dns_job', missing, concurrency=self.concurrency):
+            if result.error is None and result.result.status_code == 200:
+                statuses[result.item] = result.result.json()
+            else:
+                errors.append(result.error or ConfigApiBaseException(result.result.status_code, result.result.text))
+
+        resolved = 0
+        with self._lock:
+            for job_id, job in statuses.items():
+                if job_id in self._pending and self._resolve(job_id, job):
+                    resolved += 1
+        resolved += self._expire()
+        if response.status_code != 200 and not statuses and errors:
+            # Nothing could be read in this round
+            raise ConfigApiBaseException(response.status_code, response.text)
+        return resolved
+
+    def _fail_pending(self, error):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._deadlines.clear()
+            self._thread = None
+        for future in pending.values():
+            future.set_exception(error)
+
+    def _run(self):
+        failures = 0
+        while True:
+            self._wakeup.clear()
+            try:
+                resolved = self.poll()
+                failures = 0
+            except (KeyboardInterrupt, SystemExit) as error:
+                self._fail_pending(error)
+                raise
+            except BaseException as error:
+                # SDK errors (e.g. CircuitBreakerOpenException) derive from BaseException, keep polling
+                self.client.logger.warning(f'DNS job polling failed: {error!r}')
+                failures += 1
+                if self.max_failures is not None and failures >= self.max_failures:
+                    self._fail_pending(error)
+                    return
+                resolved = self._expire()
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                self._delay = self.interval if resolved else min(self._delay * self.backoff, self.max_interval)
+                delay = self._delay
+                if self._deadlines:
+                    delay = max(0, min(delay, min(self._deadlines.values()) - time.monotonic()))
+            self._wakeup.wait(delay)
+
+
+class DnsJobException(BaseException):
+    __module__ = 'builtins'
+
+    def __init__(self, job_id, job, reason=None):
+        self.job_id = job_id
+        self.job = job
+        self.reason = reason
+        super(DnsJobException, self).__init__(f'DNS job [{job_id}] failed: {reason or job}')
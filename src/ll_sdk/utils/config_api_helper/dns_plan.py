@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['DnsPlan', 'Ref', 'StepResult', 'DnsPlanException']
+__docformat__ = 'restructuredtext'
+
+from collections import namedtuple
+from ll_sdk.utils.client_helper.dag import run_dag, reverse_dependencies
+
+
+class Ref(namedtuple('Ref', ['name', 'field'])):
+    """
+    Reference to a field of object created by another plan step, resolved when the step is executed
+
+        :param name: step name
+        :param field: (optional) Default 'id'. Field of created object. str
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, field='id'):
+        return super(Ref, cls).__new__(cls, name, field)
+
+    def get(self, field):
+        return Ref(self.name, field)
+
+
+class StepResult(namedtuple('StepResult', ['name', 'kind', 'status', 'id', 'error'])):
+    """
+    Outcome of a single plan step
+
+        :param name: step name. str
+        :param kind: resource, health_check, failover, resource_to_failover, rule or director_policy. str
+        :param status: created, failed, skipped (not executed), rolled_back or rollback_failed. str
+        :param id: id of created object
+        :param error: API error or exception
+    """
+    __slots__ = ()
+
+    CREATED = 'created'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+    ROLLED_BACK = 'rolled_back'
+    ROLLBACK_FAILED = 'rollback_failed'
+
+    @property
+    def ok(self):
+        return self.status == self.CREATED
+
+
+_Step = namedtuple('_Step', ['name', 'kind', 'create', 'delete', 'args', 'body', 'depends_on'])
+
+# kind -> (create method, delete method, amount of scope args passed to delete before the id,
+#          body field holding the id passed to delete, None for id of created object)
+_KINDS = {
+    'resource': ('create_dns_resource', 'delete_dns_resource_by_id', 0, None),
+    'health_check': ('create_dns_resource_health_check', 'delete_dns_resource_health_check_by_id', 1, None),
+    'failover': ('create_dns_failover', 'delete_dns_failover_by_id', 1, None),
+    # Attachment is deleted by id of the attached resource
+    'resource_to_failover': ('create_dns_resource_to_failover', 'delete_dns_resource_to_failover', 2, 'resourceId'),
+    'rule': ('create_dns_rule', 'delete_dns_rule_by_id', 0, None),
+    'director_policy': ('create_dns_director_policy', 'delete_dns_director_policy_by_id', 1, None),
+}
+
+
+def _refs(value):
+    if isinstance(value, Ref):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _refs(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _refs(item)
+
+
+class DnsPlan(object):
+    """
+    Declarative DNS provisioning plan.
+
+    Steps are declared with resource(), health_check(), failover(), resource_to_failover(), rule()
+    and director_policy(), each returns Ref to the object it creates. Refs can be used as ids and anywhere
+    in bodies of later steps and define the dependency graph. apply() runs independent steps concurrently,
+    substitutes Refs with ids of created objects and deletes everything created when a step fails.
+
+        plan = DnsPlan(client, 'shortname')
+        resource = plan.resource('origin', {...})
+        plan.health_check('origin-hc', resource, {...})
+        failover = plan.failover('fo', 'example.com', {...})
+        plan.resource_to_failover('fo-origin', 'example.com', failover, {'resourceId': resource})
+        results = plan.apply()
+
+        :param client: ConfigApiClient
+        :param shortname: str
+        :param concurrency: (optional) Default 8. int
+    """
+
+    def __init__(self, client, shortname, concurrency=8):
+        self.client = client
+        self.shortname = shortname
+        self.concurrency = concurrency
+        self._steps = {}
+        self._created = {}
+
+    def _add(self, name, kind, args, body, depends_on):
+        if name in self._steps:
+            raise KeyError(f'Step [{name}] is already defined')
+        depends_on = [dependency.name if isinstance(dependency, Ref) else dependency
+                      for dependency in depends_on or ()]
+        depends_on.extend(ref.name for ref in _refs((args, body)))
+        for dependency in depends_on:
+            if dependency not in self._steps:
+                raise KeyError(f'Step [{name}] refers to undefined step [{dependency}]')
+        create, delete, _, _ = _KINDS[kind]
+        self._steps[name] = _Step(name, kind, create, delete, tuple(args), body, tuple(dict.fromkeys(depends_on)))
+        return Ref(name)
+
+    # --- Declaration ---
+    def resource(self, name, resource, depends_on=None):
+        return self._add(name, 'resource', (), resource, depends_on)
+
+    def health_check(self, name, resource_id, health_check, depends_on=None):
+        return self._add(name, 'health_check', (resource_id,), health_check, depends_on)
+
+    def failover(self, name, zone, failover, depends_on=None):
+        return self._add(name, 'failover', (zone,), failover, depends_on)
+
+    def resource_to_failover(self, name, zone, failover_id, resource, depends_on=None):
+        return self._add(name, 'resource_to_failover', (zone, failover_id), resource, depends_on)
+
+    def rule(self, name, rule, depends_on=None):
+        return self._add(name, 'rule', (), rule, depends_on)
+
+    def director_policy(self, name, zone, dir_policy, depends_on=None):
+        return self._add(name, 'director_policy', (zone,), dir_policy, depends_on)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def dependencies(self):
+        """
+        Dependency graph of plan: step name -> names of steps it depends on
+        """
+        return {name: list(step.depends_on) for name, step in self._steps.items()}
+
+    # --- Execution ---
+    @staticmethod
+    def _created_id(created, field='id'):
+        if field == 'id' and 'id' not in created:
+            return created.get('uuid')
+        return created[field]
+
+    def _resolve(self, value, created):
+        if isinstance(value, Ref):
+            return self._created_id(created[value.name], value.field)
+        if isinstance(value, dict):
+            return {key: self._resolve(item, created) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._resolve(item, created) for item in value)
+        return value
+
+    def _create(self, step, created):
+        args = self._resolve(step.args, created)
+        response = getattr(self.client, step.create)(self.shortname, *args, self._resolve(step.body, created))
+        if not 200 <= response.status_code < 300:
+            raise DnsPlanException(step.name, response.status_code, response.text)
+        payload = response.json() if response.content else {}
+        created[step.name] = payload if isinstance(payload, dict) else {}
+        return self._created_id(created[step.name])
+
+    def _delete(self, step, created, created_id):
+        _, _, scope_size, id_field = _KINDS[step.kind]
+        scope = self._resolve(step.args, created)[:scope_size]
+        if id_field is not None:
+            created_id = self._resolve(step.body, created)[id_field]
+        response = getattr(self.client, step.delete)(self.shortname, *scope, created_id)
+        if not 200 <= response.status_code < 300:
+            raise DnsPlanException(step.name, response.status_code, response.text)
+
+    def rollback(self, results):
+        """
+        Delete objects created by plan in reverse dependency order, returns updated results
+
+            :param results: list of StepResult returned by apply()
+        """
+        by_name = {result.name: result for result in results}
+        done = [result.name for result in results if result.status == StepResult.CREATED]
+        outcome = run_dag(lambda name: self._delete(self._steps[name], self._created, by_name[name].id),
+                          reverse_dependencies(self.dependencies(), done), concurrency=self.concurrency,
+                          fail_fast=False)
+        for name in done:
+            if name in outcome and outcome[name].error is None:
+                by_name[name] = by_name[name]._replace(status=StepResult.ROLLED_BACK)
+            else:
+                error = outcome[name].error if name in outcome else None
+                by_name[name] = by_name[name]._replace(status=StepResult.ROLLBACK_FAILED, error=error)
+        return [by_name[result.name] for result in results]
+
+    def apply(self, rollback_on_failure=True):
+        """
+        Execute plan, returns list of StepResult in declaration order.
+        If any step fails, no new steps are started and (with rollback_on_failure) all created objects are deleted.
+
+            :param rollback_on_failure: (optional) Default True. bool
+        """
+        self._created = {}
+        self.client.transport.ensure_concurrency(self.concurrency)
+        outcome = run_dag(lambda name: self._create(self._steps[name], self._created), self.dependencies(),
+                          concurrency=self.concurrency)
+        results = []
+        for name, step in self._steps.items():
+            if name not in outcome:
+                results.append(StepResult(name, step.kind, StepResult.SKIPPED, None, None))
+            elif outcome[name].error is not None:
+                results.append(StepResult(name, step.kind, StepResult.FAILED, None, outcome[name].error))
+            else:
+                results.append(StepResult(name, step.kind, StepResult.CREATED, outcome[name].result, None))
+        if rollback_on_failure and any(result.status == StepResult.FAILED for result in results):
+            results = self.rollback(results)
+        return results
+
+
+class DnsPlanException(BaseException):
+    __module__ = 'builtins'
+
+    def __init__(self, name, status_code, body):
+        self.name = name
+        self.status_code = status_code
+        self.body = body
+        super(DnsPlanException, self).__init__(f'DNS plan step [{name}] failed with [{status_code}]: {body}')
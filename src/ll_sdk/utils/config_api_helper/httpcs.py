@@ -7,8 +7,22 @@ __docformat__ = 'restructuredtext'
 import uuid
 import requests
 from itertools import product
-from copy import deepcopy
+from ll_sdk.utils.config_api_helper.list_index import ListIndex
 from ll_sdk.utils.config_api_helper.templates.httpcs_template import *
+from ll_sdk.utils.config_api_helper.templates.factory import clone_json
+
+
+def _protocol_key(protocol_set):
+    return protocol_set.get('publishedProtocol'), protocol_set.get('sourceProtocol')
+
+
+def _option_key(option):
+    return option.get('name')
+
+
+def _child_key(child):
+    service_key = child.get('serviceKey') or {}
+    return service_key.get('videoFormat'), service_key.get('rewriteType')
 
 
 class HttpCsServiceInstanceObj(dict):
@@ -38,9 +52,10 @@ class HttpCsServiceInstanceObj(dict):
         Clear all fields value
         """
         self.clear()
-        self._temp = deepcopy(_http_cs_service_instance_template)
-        self._protocol_set_temp = deepcopy(_protocol_set_temp)
-        self._child_temp = deepcopy(_child_temp)
+        self._temp = _new_http_cs_service_instance()
+        self._protocol_index = ListIndex(_protocol_key)
+        self._option_index = ListIndex(_option_key)
+        self._child_index = ListIndex(_child_key)
         self['body'] = {}
         self['body']['httpcsSvcInstance'] = {}
         self['body']['httpcsSvcInstance']['protocolSets'] = []
@@ -52,12 +67,12 @@ class HttpCsServiceInstanceObj(dict):
         Set the base values of an object
         """
         for option, value in list(kwargs.items()):
-            _value = deepcopy(value)
+            _value = clone_json(value)
             self[option] = _value
 
     def _gen_child(self, video_format, rewrite_type):
         # required_fields = ["serviceKey", "protocolSets", "publishedUrlPath", "sourceUrlPath"]
-        child_temp = deepcopy(_child_temp)
+        child_temp = _new_child()
         child_temp['description'] = 'Generated by LLNW-SDK child {} - {}'.format(video_format, rewrite_type)
         child_temp['serviceKey'] = {"name": "httpcs",
                                     "videoFormat": video_format,
@@ -70,7 +85,8 @@ class HttpCsServiceInstanceObj(dict):
         Generate an HTTPCS object
         """
         self.clear_obj()
-        self.set_base(**self._temp)
+        # Template copy is fresh, no need to copy it once more in set_base
+        self.update(self._temp)
         self.shortname = shortname
 
         if source_host is not None:
@@ -93,6 +109,7 @@ class HttpCsServiceInstanceObj(dict):
         for video_format, rewrite_type in product(video_formats, self._rewrite_types):
             child_temp = self._gen_child(video_format, rewrite_type)
             self['body']['childHttpcsSvcInstances'].append(child_temp)
+            self._child_index.appended(self['body']['childHttpcsSvcInstances'])
 
         if bool(published_protocol) ^ bool(source_protocol):
             raise HttpCsSvcInstanceBaseException(
@@ -108,11 +125,8 @@ class HttpCsServiceInstanceObj(dict):
 
     def _get_shild_idx(self, video_formats, rewrite_type):
 
-        idx = next((i for i, v in enumerate(self['body']['childHttpcsSvcInstances']) if
-                    v['serviceKey']['videoFormat'] == video_formats and v['serviceKey']['rewriteType'] == rewrite_type),
-                   False)
-
-        if idx is False:
+        idx = self._child_index.find(self['body']['childHttpcsSvcInstances'], (video_formats, rewrite_type))
+        if idx is None:
             raise HttpCsSvcInstanceBaseException(
                 'Provided formats {}, {} not present'.format(video_formats, rewrite_type))
         return idx
@@ -159,11 +173,11 @@ class HttpCsServiceInstanceObj(dict):
             raise HttpCsSvcInstanceBaseException('child_idx or video_formats and rewriteType MUST be provided')
 
     def _gen_protocol_set(self, **kwargs):
-        protocol_set = deepcopy(self._protocol_set_temp)
+        protocol_set = _new_protocol_set()
 
         for arg, kwarg in kwargs.items():
             if arg in self.__protocol_set_fields and kwarg:
-                option = deepcopy(kwarg)
+                option = clone_json(kwarg)
                 protocol_set[self.__protocol_set_fields[arg]] = option
 
         return protocol_set
@@ -188,10 +202,8 @@ class HttpCsServiceInstanceObj(dict):
                 "published_protocol: [{}], source_protocol: [{}] shouuld be with or without value"
                 "".format(published_protocol, source_protocol))
         if published_protocol is not None and source_protocol is not None:
-            protocol_idx = next((i for i, value in enumerate(protocol_sets_list) if
-                                 (value['publishedProtocol'] == published_protocol and
-                                  value['sourceProtocol'] == source_protocol)), False)
-            if protocol_idx is False:
+            protocol_idx = self._protocol_index.find(protocol_sets_list, (published_protocol, source_protocol))
+            if protocol_idx is None:
                 raise HttpCsSvcInstanceBaseException("Protocol not found")
         return protocol_idx
 
@@ -205,11 +217,10 @@ class HttpCsServiceInstanceObj(dict):
                                               published_port=published_port, source_port=source_port, options=options)
         if len(self['body']['httpcsSvcInstance']['protocolSets']) < 2:
             # Root
-            root_protoco_set = deepcopy(protocol_set)
-            self['body']['httpcsSvcInstance']['protocolSets'].append(root_protoco_set)
+            self['body']['httpcsSvcInstance']['protocolSets'].append(protocol_set)
             # Children
             for childInstance in self['body']['childHttpcsSvcInstances']:
-                child_protoco_set = deepcopy(protocol_set)
+                child_protoco_set = clone_json(protocol_set)
                 childInstance['protocolSets'].append(child_protoco_set)
 
     def clear_root_protocol_sets(self):
@@ -258,7 +269,7 @@ class HttpCsServiceInstanceObj(dict):
             self['body']["childHttpcsSvcInstances"][child_idx]["protocolSets"].append(protocol_set)
         else:
             for child in self['body']["childHttpcsSvcInstances"]:
-                _protocol_set = deepcopy(protocol_set)
+                _protocol_set = clone_json(protocol_set)
                 child["protocolSets"].append(_protocol_set)
 
     def modify_root_protocol_set(self, published_protocol, source_protocol,
@@ -277,6 +288,7 @@ class HttpCsServiceInstanceObj(dict):
         for arg, kwarg in locals().items():
             if arg in self.__protocol_set_fields and kwarg:
                 self["body"]["httpcsSvcInstance"]['protocolSets'][protocol_idx][self.__protocol_set_fields[arg]] = kwarg
+        self._protocol_index.invalidate(protocol_sets_list)
 
     def modify_child_protocol_set(self, published_protocol, source_protocol,
                                   child_idx=None, video_formats=None, rewrite_type=None,
@@ -303,11 +315,12 @@ class HttpCsServiceInstanceObj(dict):
             if arg in self.__protocol_set_fields and kwarg:
                 self["body"]["childHttpcsSvcInstances"][child_idx]['protocolSets'][protocol_idx][
                     self.__protocol_set_fields[arg]] = kwarg
+        self._protocol_index.invalidate(protocol_sets_list)
 
     # --- Options root ---
     def _get_option_idx(self, option_name, options):
-        option_idx = next((i for i, item in enumerate(options) if item["name"] == option_name), False)
-        return option_idx
+        option_idx = self._option_index.find(options, option_name)
+        return option_idx if option_idx is not None else False
 
     def _prepare_option_object(self, option_name, option_parameters):
 
@@ -342,11 +355,13 @@ class HttpCsServiceInstanceObj(dict):
         option_idx = self._get_option_idx(option_name, protocol_set['options'])
         if option_idx is not False:
             del protocol_set['options'][option_idx]
+            self._option_index.invalidate(protocol_set['options'])
 
     def _add_option_protocol_sets_scope(self, option_name, option_parameters, protocol_set):
         _option_object = self._prepare_option_object(option_name, option_parameters)
-        option_object = deepcopy(_option_object)
+        option_object = clone_json(_option_object)
         protocol_set['options'].append(option_object)
+        self._option_index.appended(protocol_set['options'])
 
     def _tmp_child_option_operation(self, option_name, option_parameters, published_protocol, source_protocol,
                                     child_idx, video_formats, rewrite_type, func):
@@ -480,6 +495,9 @@ class HttpCsServiceInstanceObj(dict):
         del response['revision']
         del response['shortname']
         del response['status']
+        self._protocol_index.clear()
+        self._option_index.clear()
+        self._child_index.clear()
         self.set_base(**response)
 
     # --- Property ---
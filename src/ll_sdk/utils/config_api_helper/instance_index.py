@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['InstanceIndex']
+__docformat__ = 'restructuredtext'
+
+import json
+from collections import defaultdict, namedtuple
+
+_Entry = namedtuple('_Entry', ['hostnames', 'paths', 'options', 'parameters'])
+
+
+class _TrieNode(object):
+    __slots__ = ('children', 'uuids')
+
+    def __init__(self):
+        self.children = {}
+        self.uuids = set()
+
+
+class _Trie(object):
+    """
+    Trie over key segments, nodes keep uuids of instances registered exactly at them
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def add(self, segments, uuid):
+        node = self.root
+        for segment in segments:
+            node = node.children.setdefault(segment, _TrieNode())
+        node.uuids.add(uuid)
+
+    def remove(self, segments, uuid):
+        path = [self.root]
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].uuids.discard(uuid)
+        for depth in range(len(segments), 0, -1):
+            if path[depth].uuids or path[depth].children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+
+    def exact(self, segments):
+        node = self.root
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                return set()
+        return set(node.uuids)
+
+    def subtree(self, segments):
+        """
+        uuids registered at segments or below
+        """
+        node = self.root
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                return set()
+        found = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            found.update(node.uuids)
+            stack.extend(node.children.values())
+        return found
+
+    def prefixes(self, segments):
+        """
+        (depth, uuids) of every node on the way to segments, i.e. registered prefixes of segments
+        """
+        node = self.root
+        found = [(0, node.uuids)] if node.uuids else []
+        for depth, segment in enumerate(segments, 1):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.uuids:
+                found.append((depth, node.uuids))
+        return found
+
+
+def _host_segments(hostname):
+    return tuple(reversed(hostname.lower().rstrip('.').split('.')))
+
+
+def _path_segments(path):
+    return tuple(segment for segment in (path or '').split('/') if segment)
+
+
+def _parameter_key(parameter):
+    return json.dumps(parameter, sort_keys=True)
+
+
+def _services(instance):
+    """
+    Root and child service definitions of delivery/httpcs service instance
+    """
+    body = instance.get('body', {})
+    if 'httpcsSvcInstance' in body:
+        return [body['httpcsSvcInstance']] + list(body.get('childHttpcsSvcInstances', []))
+    return [body]
+
+
+class InstanceIndex(object):
+    """
+    In-memory inverted index over delivery and httpcs service instances for local search:
+    published hostname trie (exact and domain queries), published path prefix trie per hostname,
+    option name postings and option parameter postings.
+
+    Index is updated incrementally with add()/remove(), attach() keeps it in sync with ConfigMirror.
+    """
+
+    def __init__(self, instances=None):
+        self._instances = {}
+        self._entries = {}
+        self._hostnames = _Trie()
+        self._paths = defaultdict(_Trie)
+        self._options = defaultdict(set)
+        self._parameters = defaultdict(set)
+        for instance in instances or ():
+            self.add(instance)
+
+    @classmethod
+    def from_mirror(cls, mirror, families=('delivery', 'httpcs')):
+        """
+        Build index from ConfigMirror and keep it updated on every mirror sync
+
+            :param mirror: ConfigMirror
+            :param families: (optional) Default delivery and httpcs
+        """
+        index = cls()
+        for family in families:
+            for instance in mirror.list(family):
+                index.add(instance)
+        index.attach(mirror, families)
+        return index
+
+    def attach(self, mirror, families=('delivery', 'httpcs')):
+        """
+        Subscribe to ConfigMirror changes
+
+            :param mirror: ConfigMirror
+            :param families: (optional) Default delivery and httpcs
+        """
+        def listener(family, uuid, obj):
+            if family not in families:
+                return
+            if obj is None:
+                self.remove(uuid)
+            else:
+                self.add(obj, uuid)
+        mirror.add_listener(listener)
+
+    # --- Updates ---
+    def add(self, instance, uuid=None):
+        """
+        Add or replace instance in index
+
+            :param instance: service instance json
+            :param uuid: (optional) Default instance['uuid']. str
+        """
+        uuid = uuid or instance['uuid']
+        if uuid in self._entries:
+            self.remove(uuid)
+        hostnames, paths, options, parameters = set(), set(), set(), set()
+        for service in _services(instance):
+            hostname = service.get('publishedHostname')
+            if hostname:
+                hostname = hostname.lower().rstrip('.')
+                hostnames.add(hostname)
+                paths.add((hostname, _path_segments(service.get('publishedUrlPath'))))
+            for protocol_set in service.get('protocolSets', []):
+                for option in protocol_set.get('options', []):
+                    options.add(option.get('name'))
+                    for parameter in option.get('parameters') or []:
+                        parameters.add((option.get('name'), _parameter_key(parameter)))
+
+        for hostname in hostnames:
+            self._hostnames.add(_host_segments(hostname), uuid)
+        for hostname, segments in paths:
+            self._paths[hostname].add(segments, uuid)
+        for name in options:
+            self._options[name].add(uuid)
+        for key in parameters:
+            self._parameters[key].add(uuid)
+        self._instances[uuid] = instance
+        self._entries[uuid] = _Entry(hostnames, paths, options, parameters)
+
+    def remove(self, uuid):
+        """
+        Remove instance from index
+
+            :param uuid: str
+        """
+        entry = self._entries.pop(uuid, None)
+        if entry is None:
+            return
+        del self._instances[uuid]
+        for hostname in entry.hostnames:
+            self._hostnames.remove(_host_segments(hostname), uuid)
+        for hostname, segments in entry.paths:
+            self._paths[hostname].remove(segments, uuid)
+            if not self._paths[hostname].root.children and not self._paths[hostname].root.uuids:
+                del self._paths[hostname]
+        for postings, keys in ((self._options, entry.options), (self._parameters, entry.parameters)):
+            for key in keys:
+                postings[key].discard(uuid)
+                if not postings[key]:
+                    del postings[key]
+
+    # --- Queries ---
+    def __len__(self):
+        return len(self._instances)
+
+    def __contains__(self, uuid):
+        return uuid in self._instances
+
+    def get(self, uuid):
+        return self._instances.get(uuid)
+
+    def by_hostname(self, hostname):
+        """
+        uuids of instances publishing hostname
+
+            :param hostname: str
+        """
+        return self._hostnames.exact(_host_segments(hostname))
+
+    def by_domain(self, domain):
+        """
+        uuids of instances publishing domain or any of its subdomains
+
+            :param domain: str
+        """
+        return self._hostnames.subtree(_host_segments(domain))
+
+    def by_path_prefix(self, hostname, prefix):
+        """
+        uuids of instances of hostname with published path under prefix
+
+            :param hostname: str
+            :param prefix: str
+        """
+        trie = self._paths.get(hostname.lower().rstrip('.'))
+        return trie.subtree(_path_segments(prefix)) if trie is not None else set()
+
+    def serving(self, hostname, path='/'):
+        """
+        uuids of instances with the longest published path matching request path on hostname
+
+            :param hostname: str
+            :param path: (optional) Default '/'. str
+        """
+        trie = self._paths.get(hostname.lower().rstrip('.'))
+        if trie is None:
+            return set()
+        matches = trie.prefixes(_path_segments(path))
+        return set(matches[-1][1]) if matches else set()
+
+    def by_option(self, name):
+        """
+        uuids of instances using option in any protocol set
+
+            :param name: str
+        """
+        return set(self._options.get(name, ()))
+
+    def by_option_parameter(self, name, parameter):
+        """
+        uuids of instances using option with parameter
+
+            :param name: str
+            :param parameter: parameter value
+        """
+        return set(self._parameters.get((name, _parameter_key(parameter)), ()))
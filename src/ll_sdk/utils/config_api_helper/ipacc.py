@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['PrefixTrie', 'IpaccLookup']
+__docformat__ = 'restructuredtext'
+
+import ipaddress
+from ll_sdk.config_api import ConfigApiBaseException
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_BLOCK_KEYS = ('cidr', 'block', 'ipBlock', 'network', 'ip', 'address', 'value')
+_PREFIX_KEYS = ('prefixLength', 'prefix', 'mask', 'netmask')
+
+
+class _Node(object):
+    __slots__ = ('key', 'length', 'value', 'children')
+
+    def __init__(self, key, length, value=None):
+        self.key = key
+        self.length = length
+        self.value = value
+        self.children = [None, None]
+
+
+class PrefixTrie(object):
+    """
+    Path-compressed binary (Patricia) trie for longest prefix match over integer keys
+
+        :param bits: key width, 32 for IPv4, 128 for IPv6. int
+    """
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.root = _Node(0, 0)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _bit(self, key, position):
+        return (key >> (self.bits - position - 1)) & 1
+
+    def _common(self, a, a_length, b, b_length):
+        length = min(a_length, b_length)
+        diff = (a ^ b) >> (self.bits - length)
+        return length - diff.bit_length()
+
+    def insert(self, key, length, value):
+        """
+        Store value for prefix, existing value of the same prefix is replaced
+
+            :param key: network address. int
+            :param length: prefix length. int
+            :param value: any, except None
+        """
+        node = self.root
+        while True:
+            if node.length == length:
+                self._size += node.value is None
+                node.value = value
+                return
+            bit = self._bit(key, node.length)
+            child = node.children[bit]
+            if child is None:
+                node.children[bit] = _Node(key, length, value)
+                self._size += 1
+                return
+            common = self._common(child.key, child.length, key, length)
+            if common == child.length:
+                node = child
+                continue
+            split = _Node(key >> (self.bits - common) << (self.bits - common), common)
+            node.children[bit] = split
+            split.children[self._bit(child.key, common)] = child
+            if common == length:
+                split.value = value
+            else:
+                split.children[self._bit(key, common)] = _Node(key, length, value)
+            self._size += 1
+            return
+
+    def get(self, key, length):
+        """
+        Value stored for exact prefix or None
+        """
+        node = self.root
+        while node is not None and node.length < length:
+            node = node.children[self._bit(key, node.length)]
+        if node is None or node.length != length or self._common(node.key, length, key, length) != length:
+            return None
+        return node.value
+
+    def longest_match(self, key):
+        """
+        (network, length, value) of the most specific prefix containing key or None
+
+            :param key: address. int
+        """
+        node = self.root
+        best = node if node.value is not None else None
+        while node.length < self.bits:
+            child = node.children[self._bit(key, node.length)]
+            if child is None or (key ^ child.key) >> (self.bits - child.length):
+                break
+            node = child
+            if node.value is not None:
+                best = node
+        return None if best is None else (best.key, best.length, best.value)
+
+    def items(self):
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                yield node.key, node.length, node.value
+            stack.extend(child for child in node.children if child is not None)
+
+
+def _block_network(block):
+    """
+    ip_network of IPACC block given as CIDR string or dict
+    """
+    if isinstance(block, dict):
+        address = next((block[key] for key in _BLOCK_KEYS if block.get(key)), None)
+        prefix = next((block[key] for key in _PREFIX_KEYS if block.get(key) is not None), None)
+        if address is None:
+            raise ValueError(f'IPACC block without address: {block}')
+        block = f'{address}/{prefix}' if prefix is not None and '/' not in str(address) else address
+    return ipaddress.ip_network(str(block).strip(), strict=False)
+
+
+def _blocks_of(payload):
+    if isinstance(payload, dict):
+        for key in ('blocks', 'ipBlocks', 'content', 'items'):
+            if isinstance(payload.get(key), list):
+                return payload[key]
+        return []
+    return payload if isinstance(payload, list) else []
+
+
+class IpaccLookup(object):
+    """
+    Compiled IPACC blocks for fast membership checks of client IPs.
+
+    Blocks of IPACC lists are compiled into Patricia tries (one for IPv4, one for IPv6),
+    lookup returns uuids of lists whose most specific block contains the address.
+    Batch checks of IPv4 addresses given as NumPy integer array are vectorized when numpy is installed.
+    """
+
+    def __init__(self):
+        self._tries = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        self._vectorized = None
+
+    @classmethod
+    def from_client(cls, client, shortname, concurrency=8):
+        """
+        Fetch IPACC lists of shortname and their blocks (concurrently) and compile them
+
+            :param client: ConfigApiClient
+            :param shortname: str
+            :param concurrency: (optional) Default 8. int
+        """
+        lookup = cls()
+        uuids = [ipacc.get('uuid') or ipacc.get('id') for ipacc in client.iter_customer_ipacc(shortname)]
+        for result in client.map('get_customer_ipacc_blocks', uuids, concurrency=concurrency):
+            if result.error is not None:
+                raise result.error
+            if result.result.status_code != 200:
+                raise ConfigApiBaseException(result.result.status_code, result.result.text)
+            lookup.add_blocks(result.item, _blocks_of(result.result.json()))
+        return lookup
+
+    def add(self, block, owner):
+        """
+        Add block of IPACC list
+
+            :param block: CIDR string or block dict
+            :param owner: uuid of IPACC list. str
+        """
+        network = _block_network(block)
+        trie = self._tries[network.version]
+        key, length = int(network.network_address), network.prefixlen
+        owners = trie.get(key, length) or ()
+        if owner not in owners:
+            trie.insert(key, length, owners + (owner,))
+        self._vectorized = None
+
+    def add_blocks(self, owner, blocks):
+        for block in blocks:
+            self.add(block, owner)
+
+    def __len__(self):
+        return sum(len(trie) for trie in self._tries.values())
+
+    def lookup(self, ip):
+        """
+        uuids of IPACC lists matching address by the most specific block, empty tuple if no block matches
+
+            :param ip: str, int (IPv4) or ipaddress object
+        """
+        address = ipaddress.ip_address(ip)
+        match = self._tries[address.version].longest_match(int(address))
+        return match[2] if match is not None else ()
+
+    def contains(self, ip):
+        return bool(self.lookup(ip))
+
+    def lookup_many(self, ips):
+        """
+        lookup() for every address
+
+            :param ips: iterable of addresses
+        """
+        return [self.lookup(ip) for ip in ips]
+
+    def _ipv4_tables(self):
+        if self._vectorized is None:
+            by_length = {}
+            for key, length, _ in self._tries[4].items():
+                by_length.setdefault(length, []).append(key)
+            self._vectorized = [(np.uint32((0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF),
+                                 np.array(sorted(keys), dtype=np.uint32)) for length, keys in by_length.items()]
+        return self._vectorized
+
+    def contains_many(self, ips):
+        """
+        Membership of every address in any block. For NumPy array of IPv4 addresses as integers
+        the check is vectorized (one masked set lookup per distinct prefix length) and NumPy bool array is returned.
+
+            :param ips: iterable of addresses or numpy integer array of IPv4 addresses
+        """
+        if np is not None and isinstance(ips, np.ndarray) and np.issubdtype(ips.dtype, np.integer):
+            addresses = ips.astype(np.uint32)
+            found = np.zeros(addresses.shape, dtype=bool)
+            for mask, networks in self._ipv4_tables():
+                found |= np.isin(addresses & mask, networks, assume_unique=False)
+            return found
+        return [self.contains(ip) for ip in ips]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['ListIndex']
+__docformat__ = 'restructuredtext'
+
+
+class ListIndex(object):
+    """
+    Position of the first item with given key in lists of dicts (protocol sets, options, child instances).
+
+    Index of every list is built on the first lookup and then validated lazily: it is rebuilt when the list
+    was replaced, its length changed behind the index or the found item doesn't carry the key any more.
+    A miss is confirmed with a linear scan of the keys, so items deleted, replaced or renamed behind
+    the index are still found. appended() keeps the index current after append and invalidate() drops it
+    after other changes, so add/lookup sequences stay linear.
+
+        :param key: callable(item) -> hashable key
+        :param max_lists: (optional) Default 64. Indexes of more lists are dropped. int
+    """
+
+    def __init__(self, key, max_lists=64):
+        self._key = key
+        self._max_lists = max_lists
+        self._indexes = {}
+
+    def _build(self, items):
+        positions = {}
+        for position, item in enumerate(items):
+            positions.setdefault(self._key(item), position)
+        if len(self._indexes) >= self._max_lists:
+            self._indexes.clear()
+        entry = self._indexes[id(items)] = [items, len(items), positions]
+        return entry
+
+    def _entry(self, items):
+        entry = self._indexes.get(id(items))
+        if entry is None or entry[0] is not items or entry[1] != len(items):
+            entry = self._build(items)
+        return entry
+
+    def find(self, items, key):
+        """
+        Position of the first item with key, None if there is no such item
+
+            :param items: list
+            :param key: hashable
+        """
+        position = self._entry(items)[2].get(key)
+        if position is not None and (position >= len(items) or self._key(items[position]) != key):
+            position = self._build(items)[2].get(key)
+        elif position is None:
+            # Index may miss item changed in place (items[i] = ...), confirm before reporting absence
+            for item in items:
+                if self._key(item) == key:
+                    position = self._build(items)[2].get(key)
+                    break
+        return position
+
+    def appended(self, items):
+        """
+        Register item appended to the end of the list
+        """
+        entry = self._indexes.get(id(items))
+        if entry is not None and entry[0] is items and entry[1] == len(items) - 1:
+            entry[2].setdefault(self._key(items[-1]), entry[1])
+            entry[1] += 1
+
+    def invalidate(self, items):
+        """
+        Drop index of the list after it was changed other way than append
+        """
+        self._indexes.pop(id(items), None)
+
+    def clear(self):
+        self._indexes.clear()
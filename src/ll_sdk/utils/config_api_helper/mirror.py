@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['ConfigMirror', 'SyncReport', 'object_uuid', 'object_version']
+__docformat__ = 'restructuredtext'
+
+import json
+import sqlite3
+import hashlib
+from collections import namedtuple
+
+SyncReport = namedtuple('SyncReport', ['family', 'created', 'updated', 'deleted', 'unchanged', 'failed'])
+
+_Family = namedtuple('_Family', ['name', 'list_items', 'get'])
+
+_FAMILIES = (
+    _Family('delivery',
+            lambda client, shortname: client.iter_delivery_service_instances(shortname),
+            lambda client, shortname, uuid: client.get_delivery_service_instance(uuid)),
+    _Family('httpcs',
+            lambda client, shortname: client.iter_httpcs_service_instances(shortname),
+            lambda client, shortname, uuid: client.get_httpcs_service_instance(uuid)),
+    _Family('certificate',
+            lambda client, shortname: client.iter_customer_certificates(shortname),
+            lambda client, shortname, uuid: client.get_customer_certificate(uuid)),
+    _Family('edgerule',
+            lambda client, shortname: client.iter_edgerules(shortname),
+            lambda client, shortname, uuid: client.get_edgerule(shortname, uuid)),
+    _Family('ipacc',
+            lambda client, shortname: client.iter_customer_ipacc(shortname),
+            lambda client, shortname, uuid: client.get_customer_ipacc(uuid)),
+    _Family('lds',
+            lambda client, shortname: client.iter_lds(shortname),
+            lambda client, shortname, uuid: client.get_lds(shortname, uuid)),
+)
+
+_REVISION_KEYS = ('versionNumber', 'version', 'revisionNumber', 'lastUpdatedDate', 'lastUpdated', 'updatedDate')
+
+
+def object_uuid(obj):
+    """
+    Identifier of config object
+    """
+    return obj.get('uuid') or obj.get('id')
+
+
+def object_version(obj):
+    """
+    Version of config object from its revision/version data, None if object has no version information
+    """
+    revision = obj.get('revision')
+    if isinstance(revision, dict):
+        for key in _REVISION_KEYS:
+            if revision.get(key) is not None:
+                return str(revision[key])
+        if revision:
+            return json.dumps(revision, sort_keys=True)
+    elif revision is not None:
+        return str(revision)
+    for key in ('version', 'versionNumber'):
+        if obj.get(key) is not None:
+            return str(obj[key])
+    return None
+
+
+def _digest(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ConfigMirror(object):
+    """
+    Local mirror of account configuration stored in SQLite.
+
+    sync() lists service instances (delivery, httpcs), certificates, edge rules, IPACC lists and LDS configs
+    with list_*/iter_* methods, compares revision/version data with the local copy and fetches only new and
+    changed objects with get_* methods concurrently. Reads are served from memory.
+
+        :param client: ConfigApiClient
+        :param shortname: str
+        :param path: (optional) Default ':memory:'. SQLite database file. str
+        :param families: (optional) Default all. Subset of delivery, httpcs, certificate, edgerule, ipacc, lds
+        :param concurrency: (optional) Default 8. Parallel get_* calls. int
+        :param trust_listing: (optional) Default True. Store listed objects which already contain body
+                              without fetching them again. bool
+    """
+    FAMILIES = tuple(family.name for family in _FAMILIES)
+
+    def __init__(self, client, shortname, path=':memory:', families=None, concurrency=8, trust_listing=True):
+        self.client = client
+        self.shortname = shortname
+        self.concurrency = concurrency
+        self.trust_listing = trust_listing
+        self.families = [family for family in _FAMILIES if families is None or family.name in families]
+        self._db = sqlite3.connect(path)
+        self._db.execute('CREATE TABLE IF NOT EXISTS objects (shortname TEXT, family TEXT, uuid TEXT, '
+                         'version TEXT, data TEXT, PRIMARY KEY (shortname, family, uuid))')
+        self._db.commit()
+        self._cache = {family.name: None for family in _FAMILIES}
+        self._versions = {family.name: None for family in _FAMILIES}
+        self._listeners = []
+
+    def close(self):
+        self._db.close()
+
+    def add_listener(self, listener):
+        """
+        Subscribe to changes applied by sync(), listener(family, uuid, obj) is called for every
+        created/updated object and with obj None for deleted object
+
+            :param listener: callable
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, family, uuid, obj):
+        for listener in self._listeners:
+            listener(family, uuid, obj)
+
+    def _load(self, family):
+        if self._cache[family] is None:
+            rows = self._db.execute('SELECT uuid, version, data FROM objects WHERE shortname = ? AND family = ?',
+                                    (self.shortname, family))
+            self._cache[family] = {}
+            self._versions[family] = {}
+            for uuid, version, data in rows:
+                self._cache[family][uuid] = json.loads(data)
+                self._versions[family][uuid] = version
+        return self._cache[family]
+
+    # --- Reads ---
+    def get(self, family, uuid):
+        """
+        Local copy of config object or None
+
+            :param family: str
+            :param uuid: str
+        """
+        return self._load(family).get(uuid)
+
+    def list(self, family):
+        """
+        All local objects of family
+
+            :param family: str
+        """
+        return list(self._load(family).values())
+
+    def version(self, family, uuid):
+        self._load(family)
+        return self._versions[family].get(uuid)
+
+    def __contains__(self, key):
+        family, uuid = key
+        return uuid in self._load(family)
+
+    # --- Sync ---
+    def _store(self, family, uuid, version, obj):
+        self._db.execute('INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?)',
+                         (self.shortname, family, uuid, version, json.dumps(obj)))
+        self._cache[family][uuid] = obj
+        self._versions[family][uuid] = version
+        self._notify(family, uuid, obj)
+
+    def _delete(self, family, uuid):
+        self._db.execute('DELETE FROM objects WHERE shortname = ? AND family = ? AND uuid = ?',
+                         (self.shortname, family, uuid))
+        del self._cache[family][uuid]
+        del self._versions[family][uuid]
+        self._notify(family, uuid, None)
+
+    def _sync_family(self, family):
+        cached = self._load(family.name)
+        versions = self._versions[family.name]
+        listed = {}
+        to_fetch = []
+        for item in family.list_items(self.client, self.shortname):
+            uuid = object_uuid(item)
+            if uuid is None:
+                continue
+            version = object_version(item)
+            if version is None and 'body' in item:
+                version = _digest(item)
+            listed[uuid] = version
+            if version is None or versions.get(uuid) != version:
+                to_fetch.append((uuid, item))
+
+        created = updated = failed = 0
+        fetch = []
+        for uuid, item in to_fetch:
+            if self.trust_listing and 'body' in item:
+                if uuid in cached:
+                    updated += 1
+                else:
+                    created += 1
+                self._store(family.name, uuid, listed[uuid], item)
+            else:
+                fetch.append(uuid)
+
+        for result in self.client.map(lambda uuid: family.get(self.client, self.shortname, uuid), fetch,
+                                      concurrency=self.concurrency):
+            uuid = result.item
+            if result.error is not None or result.result.status_code != 200:
+                failed += 1
+                continue
+            obj = result.result.json()
+            version = listed[uuid] or object_version(obj) or _digest(obj)
+            if uuid in cached:
+                if versions.get(uuid) == version:
+                    continue
+                updated += 1
+            else:
+                created += 1
+            self._store(family.name, uuid, version, obj)
+
+        deleted = [uuid for uuid in cached if uuid not in listed]
+        for uuid in deleted:
+            self._delete(family.name, uuid)
+        self._db.commit()
+        unchanged = len(listed) - created - updated - failed
+        return SyncReport(family.name, created, updated, len(deleted), unchanged, failed)
+
+    def sync(self):
+        """
+        Synchronize local copy with config-api, returns list of SyncReport per family
+        """
+        return [self._sync_family(family) for family in self.families]
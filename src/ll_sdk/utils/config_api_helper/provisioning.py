@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['BulkProvisioner', 'ProvisionResult', 'service_of', 'published_hostname_of']
+__docformat__ = 'restructuredtext'
+
+from collections import Counter, namedtuple
+from ll_sdk.utils.client_helper.bulk import bulk_map
+
+
+class ProvisionResult(namedtuple('ProvisionResult', ['index', 'service', 'hostname', 'status', 'uuid', 'errors'])):
+    """
+    Outcome of provisioning of a single config
+
+        :param index: position of config in input. int
+        :param service: delivery or httpcs. str
+        :param hostname: published hostname. str
+        :param status: created, updated, valid (dry run), invalid, skipped or failed. str
+        :param uuid: uuid of created/updated service instance. str
+        :param errors: validation or API errors
+    """
+    __slots__ = ()
+
+    CREATED = 'created'
+    UPDATED = 'updated'
+    VALID = 'valid'
+    INVALID = 'invalid'
+    SKIPPED = 'skipped'
+    FAILED = 'failed'
+
+    @property
+    def ok(self):
+        return self.status in (self.CREATED, self.UPDATED, self.VALID)
+
+
+def service_of(config):
+    """
+    Service of service instance config: httpcs or delivery
+    """
+    return 'httpcs' if 'httpcsSvcInstance' in config.get('body', {}) else 'delivery'
+
+
+def published_hostname_of(config):
+    body = config.get('body', {})
+    return body.get('httpcsSvcInstance', body).get('publishedHostname')
+
+
+def _is_success(response):
+    if response.status_code != 200:
+        return False
+    payload = response.json()
+    return isinstance(payload, dict) and (payload.get('Success') or payload.get('success')) is True
+
+
+def _errors(response):
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+class BulkProvisioner(object):
+    """
+    Concurrent validate -> create/update pipeline for delivery and httpcs service instances.
+
+    Every config is validated with validate_*_service_instance and only configs reported
+    with 'Success': True are created (or updated when uuid is known). Configs are processed by
+    ``concurrency`` workers, each API call acquires ``rate_limiter`` if provided.
+
+        :param client: ConfigApiClient
+        :param concurrency: (optional) Default 8. int
+        :param rate_limiter: (optional) RateLimiter for API calls made by pipeline
+        :param dry_run: (optional) Default False. Only validate. bool
+        :param validator: (optional) OfflineValidator used instead of remote validate calls
+    """
+
+    def __init__(self, client, concurrency=8, rate_limiter=None, dry_run=False, validator=None):
+        self.client = client
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.dry_run = dry_run
+        self.validator = validator
+
+    def _call(self, method, *args):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return getattr(self.client, method)(*args)
+
+    def _validate(self, index, config):
+        service = service_of(config)
+        if self.validator is not None:
+            validation = self.validator.validate(config)
+            status = ProvisionResult.VALID if validation.valid else ProvisionResult.INVALID
+            return ProvisionResult(index, service, published_hostname_of(config), status, None,
+                                   validation.errors or None)
+        response = self._call(f'validate_{service}_service_instance', config)
+        if not _is_success(response):
+            return ProvisionResult(index, service, published_hostname_of(config), ProvisionResult.INVALID,
+                                   None, _errors(response))
+        return ProvisionResult(index, service, published_hostname_of(config), ProvisionResult.VALID, None, None)
+
+    def _submit(self, index, uuid, config):
+        service = service_of(config)
+        if uuid is None:
+            response = self._call(f'create_{service}_service_instance', config)
+            status = ProvisionResult.CREATED
+        else:
+            response = self._call(f'update_{service}_service_instance', uuid, config)
+            status = ProvisionResult.UPDATED
+        if not 200 <= response.status_code < 300:
+            return ProvisionResult(index, service, published_hostname_of(config), ProvisionResult.FAILED, uuid,
+                                   _errors(response))
+        payload = response.json() if response.content else {}
+        uuid = uuid or (payload.get('uuid') if isinstance(payload, dict) else None)
+        return ProvisionResult(index, service, published_hostname_of(config), status, uuid, None)
+
+    def _provision_one(self, index, uuid, config):
+        result = self._validate(index, config)
+        if result.status != ProvisionResult.VALID or self.dry_run:
+            return result
+        return self._submit(index, uuid, config)
+
+    @staticmethod
+    def _split(item):
+        """
+        Item is config (created, or updated if it has uuid) or (uuid, config) tuple (updated)
+        """
+        if isinstance(item, tuple):
+            return item
+        return item.get('uuid'), item
+
+    def _report(self, results):
+        for bulk_result in results:
+            if bulk_result.error is None:
+                yield bulk_result.result
+                continue
+            uuid, config = bulk_result.item[1:]
+            yield ProvisionResult(bulk_result.index, service_of(config), published_hostname_of(config),
+                                  ProvisionResult.FAILED, uuid, repr(bulk_result.error))
+
+    def provision(self, configs, ordered=True):
+        """
+        Validate and create/update configs concurrently, yield ProvisionResult per config.
+        Configs are read lazily, so input can be a generator of any size.
+
+            :param configs: iterable of DeliverServiceInstanceObj/HttpCsServiceInstanceObj/dicts
+                            or (uuid, config) tuples for updates
+            :param ordered: (optional) Default True. Yield results in input order, otherwise as completed. bool
+        """
+        items = ((index,) + self._split(item) for index, item in enumerate(configs))
+        return self._report(bulk_map(self._provision_one, items, concurrency=self.concurrency, ordered=ordered))
+
+    def provision_all_or_nothing(self, configs):
+        """
+        Validate all configs concurrently and submit them only if every config is valid.
+        Returns list of ProvisionResult, all of them invalid/skipped if at least one config is invalid.
+
+            :param configs: iterable of configs or (uuid, config) tuples
+        """
+        items = [(index,) + self._split(item) for index, item in enumerate(configs)]
+        validated = list(self._report(bulk_map(lambda index, uuid, config: self._validate(index, config), items,
+                                               concurrency=self.concurrency)))
+        if self.dry_run:
+            return validated
+        if not all(result.ok for result in validated):
+            return [result._replace(status=ProvisionResult.SKIPPED) if result.ok else result
+                    for result in validated]
+        return list(self._report(bulk_map(self._submit, items, concurrency=self.concurrency)))
+
+    @staticmethod
+    def summary(results):
+        """
+        Amount of results per status
+
+            :param results: iterable of ProvisionResult
+        """
+        return dict(Counter(result.status for result in results))
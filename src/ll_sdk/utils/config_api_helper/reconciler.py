@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['Reconciler', 'PlanAction', 'ApplyResult', 'ReconcilerException', 'load_desired_state']
+__docformat__ = 'restructuredtext'
+
+import json
+import os
+from collections import Counter, namedtuple
+from ll_sdk.utils.client_helper.dag import run_dag
+from ll_sdk.utils.config_api_helper.cert_inventory import parse_certificate
+from ll_sdk.utils.config_api_helper.diff import has_changes
+from ll_sdk.utils.config_api_helper.mirror import ConfigMirror, object_uuid, object_version
+
+FAMILIES = ('certificate', 'delivery', 'httpcs', 'edgerule')
+SERVICE_FAMILIES = ('delivery', 'httpcs')
+READ_ONLY_FAMILIES = ('edgerule',)
+
+# Secrets are never returned by config-api, so they can't be compared
+_SECRET_FIELDS = frozenset(['certKey'])
+
+
+class PlanAction(namedtuple('PlanAction', ['action', 'family', 'key', 'uuid', 'config', 'version'])):
+    """
+    Single step of reconciliation plan
+
+        :param action: create, update, delete, rollback or drift (change of read-only object). str
+        :param family: certificate, delivery, httpcs or edgerule. str
+        :param key: natural key of object (e.g. published hostname and path). tuple
+        :param uuid: uuid of existing object
+        :param config: desired config
+        :param version: version to roll back to. int
+    """
+    __slots__ = ()
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ROLLBACK = 'rollback'
+    DRIFT = 'drift'
+
+
+class ApplyResult(namedtuple('ApplyResult', ['action', 'status', 'uuid', 'error'])):
+    """
+    Outcome of applied plan action
+
+        :param action: PlanAction
+        :param status: done, failed, skipped (dependency failed or read-only). str
+        :param uuid: uuid of created/changed object
+        :param error: error
+    """
+    __slots__ = ()
+
+    DONE = 'done'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+
+def family_of(config, default=None):
+    """
+    Family of config object by its structure: httpcs, delivery, certificate or ``default``
+    """
+    body = config.get('body', {})
+    if 'httpcsSvcInstance' in body:
+        return 'httpcs'
+    if body.get('serviceKey', {}).get('name') == 'delivery':
+        return 'delivery'
+    if 'certName' in body:
+        return 'certificate'
+    return config.get('family', default)
+
+
+def natural_key(family, config):
+    """
+    Identity of object independent of uuid: published hostname and path for service instances,
+    certName for certificates, name (or uuid) for edge rules
+    """
+    body = config.get('body', {})
+    if family in SERVICE_FAMILIES:
+        service = body.get('httpcsSvcInstance', body)
+        return family, (service.get('publishedHostname') or '').lower(), service.get('publishedUrlPath') or ''
+    if family == 'certificate':
+        return family, body.get('certName')
+    return family, config.get('name') or body.get('name') or object_uuid(config)
+
+
+def load_desired_state(path):
+    """
+    Load desired state from JSON file or directory of JSON files (recursively). Every file holds one
+    object or list of objects. Family of object is derived from its structure, ``family`` field or name
+    of the directory containing the file.
+
+        :param path: str
+    """
+    paths = [path]
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(root, name) for root, _, names in os.walk(path)
+                       for name in names if name.endswith('.json'))
+    desired = []
+    for file_path in paths:
+        with open(file_path) as file:
+            payload = json.load(file)
+        directory = os.path.basename(os.path.dirname(file_path))
+        for config in payload if isinstance(payload, list) else [payload]:
+            family = family_of(config, directory if directory in FAMILIES else None)
+            if family not in FAMILIES:
+                raise ValueError(f'Unable to determine family of object in [{file_path}]')
+            desired.append((family, config))
+    return desired
+
+
+def _strip(config):
+    return {key: value for key, value in config.items() if key not in ('family', 'rollbackTo')}
+
+
+def _certificate_names(config):
+    """
+    Lower case hostnames certificate config may serve: SANs, common name and certName
+    """
+    body = config.get('body', config)
+    parsed = parse_certificate(body)
+    names = list(parsed.sans) + [parsed.subject, body.get('certName')]
+    return {name.lower().rstrip('.') for name in names if isinstance(name, str) and name}
+
+
+def _service_hostnames(hostname):
+    """
+    Names of certificates which may serve published hostname: hostname itself and its wildcard
+    """
+    hostname = (hostname or '').lower().rstrip('.')
+    return [hostname, '*.' + hostname.split('.', 1)[1]] if '.' in hostname else [hostname]
+
+
+def _changed(family, desired, actual):
+    if family in SERVICE_FAMILIES:
+        return has_changes(desired, actual)
+    desired_body, actual_body = desired.get('body', desired), actual.get('body', actual)
+    return any(desired_body.get(key) != actual_body.get(key) for key in desired_body if key not in _SECRET_FIELDS)
+
+
+class Reconciler(object):
+    """
+    Desired-state reconciler for certificates, delivery and httpcs service instances (edge rules are read-only).
+
+    Actual state is read concurrently through ConfigMirror, desired objects are matched with actual ones by uuid
+    or natural key. plan() computes creates, updates (only real changes), rollbacks (desired service instance
+    with ``rollbackTo`` version which differs from current state) and, with ``prune``, deletes of objects
+    missing in desired state.
+    apply() runs the plan concurrently: certificates are created/updated before service instances using them
+    and deleted after service instances.
+
+        :param client: ConfigApiClient
+        :param shortname: str
+        :param concurrency: (optional) Default 8. int
+        :param prune: (optional) Default False. Delete objects missing in desired state. bool
+        :param mirror: (optional) ConfigMirror to read actual state from, in-memory mirror by default
+    """
+
+    def __init__(self, client, shortname, concurrency=8, prune=False, mirror=None):
+        self.client = client
+        self.shortname = shortname
+        self.concurrency = concurrency
+        self.prune = prune
+        self.mirror = mirror or ConfigMirror(client, shortname, families=FAMILIES, concurrency=concurrency)
+
+    def actual_state(self):
+        """
+        Sync mirror and return dict family -> {natural key: object}
+        """
+        self.mirror.sync()
+        return {family: {natural_key(family, obj): obj for obj in self.mirror.list(family)} for family in FAMILIES}
+
+    def plan(self, desired):
+        """
+        Plan of actions turning actual state into desired state
+
+            :param desired: list of (family, config), e.g. from load_desired_state()
+        """
+        actual = self.actual_state()
+        by_uuid = {family: {object_uuid(obj): obj for obj in objects.values()} for family, objects in actual.items()}
+        keys = Counter(natural_key(family, config) for family, config in desired)
+        duplicated = [key for key, count in keys.items() if count > 1]
+        if duplicated:
+            raise ValueError(f'Desired state contains duplicated objects: {duplicated}')
+
+        actions = []
+        matched = set()
+        for family, config in desired:
+            key = natural_key(family, config)
+            current = by_uuid[family].get(object_uuid(config)) or actual[family].get(key)
+            uuid = object_uuid(current) if current is not None else None
+            matched.add((family, uuid))
+            if family in READ_ONLY_FAMILIES:
+                if current is None or _changed(family, _strip(config), current):
+                    actions.append(PlanAction(PlanAction.DRIFT, family, key, uuid, config, None))
+            elif config.get('rollbackTo') is not None:
+                if family not in SERVICE_FAMILIES:
+                    raise ValueError(f'rollbackTo is supported only for {SERVICE_FAMILIES}, not for {family} {key}')
+                if current is None:
+                    raise ValueError(f'Unable to roll back {family} {key}, it does not exist')
+                version = int(config['rollbackTo'])
+                if not self._at_version(family, current, version):
+                    actions.append(PlanAction(PlanAction.ROLLBACK, family, key, uuid, config, version))
+            elif current is None:
+                actions.append(PlanAction(PlanAction.CREATE, family, key, None, _strip(config), None))
+            elif _changed(family, _strip(config), current):
+                actions.append(PlanAction(PlanAction.UPDATE, family, key, uuid, _strip(config), None))
+        if self.prune:
+            for family in FAMILIES:
+                if family in READ_ONLY_FAMILIES:
+                    continue
+                for key, obj in actual[family].items():
+                    if (family, object_uuid(obj)) not in matched:
+                        actions.append(PlanAction(PlanAction.DELETE, family, key, object_uuid(obj), None, None))
+        return actions
+
+    def _at_version(self, family, current, version):
+        """
+        True if current service instance already is at (or equal to) historical version, so rollback would
+        only create another version with the same content
+        """
+        if object_version(current) == version:
+            return True
+        response = getattr(self.client, f'get_{family}_service_instance_version')(
+            self.shortname, object_uuid(current), version)
+        if response.status_code != 200:
+            # Unknown target, let rollback report the problem
+            return False
+        return not has_changes(response.json(), current)
+
+    @staticmethod
+    def dependencies(actions):
+        """
+        Dependency graph of plan (action index -> indexes it depends on): service instances are created,
+        updated and rolled back after certificates covering their published hostname (by SAN, common name
+        or certName, wildcards included), certificates are deleted after service instances
+        """
+        certificates = {}
+        for idx, action in enumerate(actions):
+            if action.family == 'certificate' and action.action != PlanAction.DELETE and action.config:
+                for name in _certificate_names(action.config):
+                    certificates.setdefault(name, []).append(idx)
+        service_deletes = [idx for idx, action in enumerate(actions)
+                           if action.family in SERVICE_FAMILIES and action.action == PlanAction.DELETE]
+        graph = {}
+        for idx, action in enumerate(actions):
+            if action.family in SERVICE_FAMILIES and action.action != PlanAction.DELETE:
+                graph[idx] = sorted({dep for name in _service_hostnames(action.key[1])
+                                     for dep in certificates.get(name, ())})
+            elif action.family == 'certificate' and action.action == PlanAction.DELETE:
+                graph[idx] = service_deletes
+            else:
+                graph[idx] = []
+        return graph
+
+    def _call(self, action):
+        if action.family == 'certificate':
+            methods = {PlanAction.CREATE: ('create_customer_certificate', action.config),
+                       PlanAction.UPDATE: ('update_customer_certificate', action.uuid, action.config),
+                       PlanAction.DELETE: ('delete_customer_certificate', action.uuid)}
+        else:
+            service = action.family
+            methods = {PlanAction.CREATE: (f'create_{service}_service_instance', action.config),
+                       PlanAction.UPDATE: (f'update_{service}_service_instance', action.uuid, action.config),
+                       PlanAction.DELETE: (f'delete_{service}_service_instance', action.uuid),
+                       PlanAction.ROLLBACK: (f'rollback_{service}_service_instance', action.uuid, action.version)}
+        if action.action not in methods:
+            raise ValueError(f'Action [{action.action}] is not supported for [{action.family}]')
+        method, *args = methods[action.action]
+        return getattr(self.client, method)(*args)
+
+    def _apply_one(self, action):
+        response = self._call(action)
+        if not 200 <= response.status_code < 300:
+            raise ReconcilerException(action, response.status_code, response.text)
+        payload = response.json() if response.content else None
+        return action.uuid or (object_uuid(payload) if isinstance(payload, dict) else None)
+
+    def apply(self, actions, fail_fast=False):
+        """
+        Apply plan with bounded parallelism and dependency ordering, returns list of ApplyResult in plan order
+
+            :param actions: list of PlanAction
+            :param fail_fast: (optional) Default False. Stop starting actions after first failure. bool
+        """
+        runnable = {idx: deps for idx, deps in self.dependencies(actions).items()
+                    if actions[idx].action != PlanAction.DRIFT}
+        runnable = {idx: [dep for dep in deps if dep in runnable] for idx, deps in runnable.items()}
+        self.client.transport.ensure_concurrency(self.concurrency)
+        outcome = run_dag(lambda idx: self._apply_one(actions[idx]), runnable, concurrency=self.concurrency,
+                          fail_fast=fail_fast)
+        results = []
+        for idx, action in enumerate(actions):
+            result = outcome.get(idx)
+            if result is None:
+                results.append(ApplyResult(action, ApplyResult.SKIPPED, action.uuid, None))
+            elif result.error is not None:
+                results.append(ApplyResult(action, ApplyResult.FAILED, action.uuid, result.error))
+            else:
+                results.append(ApplyResult(action, ApplyResult.DONE, result.result, None))
+        return results
+
+    def reconcile(self, desired, fail_fast=False):
+        """
+        plan() and apply() in one call
+
+            :param desired: list of (family, config) or path to desired state
+            :param fail_fast: (optional) Default False. bool
+        """
+        if isinstance(desired, str):
+            desired = load_desired_state(desired)
+        return self.apply(self.plan(desired), fail_fast=fail_fast)
+
+
+class ReconcilerException(BaseException):
+    __module__ = 'builtins'
+
+    def __init__(self, action, status_code, body):
+        self.action = action
+        self.status_code = status_code
+        self.body = body
+        super(ReconcilerException, self).__init__(
+            f'{action.action} of {action.family} {action.key} failed with [{status_code}]: {body}')
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['SlotMonitor', 'SlotEvent', 'slot_state']
+__docformat__ = 'restructuredtext'
+
+import json
+import threading
+import time
+from collections import namedtuple
+
+SlotEvent = namedtuple('SlotEvent', ['kind', 'shortname', 'slot_id', 'old_state', 'new_state', 'status', 'time'])
+
+_Kind = namedtuple('_Kind', ['name', 'list_slots', 'get_status'])
+
+_KINDS = (
+    _Kind('live',
+          lambda client, shortname: client.list_live_video_slot(shortname),
+          lambda client, shortname, slot_id: client.get_live_video_slot_status(shortname, slot_id)),
+    # webrtc slots have no status endpoint, slot itself carries the state
+    _Kind('webrtc',
+          lambda client, shortname: client.list_webrtc_video_slot(shortname),
+          lambda client, shortname, slot_id: client.get_webrtc_video_slot(shortname, slot_id)),
+)
+
+_SLOT_ID_KEYS = ('id', 'slotId', 'uuid')
+_STATE_KEYS = ('state', 'status', 'streamStatus', 'slotState')
+ACTIVE_STATES = frozenset(['active', 'live', 'streaming', 'publishing', 'running', 'connected', 'online', 'started'])
+
+
+class _Slot(object):
+    __slots__ = ('kind', 'shortname', 'slot_id', 'state', 'interval', 'due')
+
+    def __init__(self, kind, shortname, slot_id, interval, due):
+        self.kind = kind
+        self.shortname = shortname
+        self.slot_id = slot_id
+        self.state = None
+        self.interval = interval
+        self.due = due
+
+
+def _slots_of(payload):
+    if isinstance(payload, dict):
+        for key in ('slots', 'content', 'items'):
+            if isinstance(payload.get(key), list):
+                return payload[key]
+        return []
+    return payload if isinstance(payload, list) else []
+
+
+def slot_state(status):
+    """
+    State of slot from status payload: value of state/status field or digest of the whole payload
+    """
+    if isinstance(status, dict):
+        for key in _STATE_KEYS:
+            value = status.get(key)
+            if isinstance(value, str):
+                return value
+            if isinstance(value, dict):
+                nested = slot_state(value)
+                if nested is not None:
+                    return nested
+    return json.dumps(status, sort_keys=True) if status is not None else None
+
+
+class SlotMonitor(object):
+    """
+    Concurrent status monitor of live and webrtc video slots with adaptive per-slot polling interval.
+
+    Slots are discovered with list_live_video_slot/list_webrtc_video_slot. Every slot is polled when it is due,
+    all due slots are fetched concurrently. Active or changed slots are polled every ``min_interval`` seconds,
+    the interval of idle unchanged slots grows by ``backoff`` up to ``max_interval``.
+    State changes are published to subscribers as SlotEvent.
+
+        :param client: ConfigApiClient
+        :param shortnames: list of str
+        :param kinds: (optional) Default live and webrtc
+        :param concurrency: (optional) Default 16. int
+        :param min_interval: (optional) Default 2. seconds. float
+        :param max_interval: (optional) Default 60. seconds. float
+        :param backoff: (optional) Default 2. Interval multiplier for idle slots. float
+        :param active_states: (optional) states polled with min_interval, compared case-insensitive
+        :param clock: (optional) Default time.monotonic
+        :param sleep: (optional) Default waits interruptible by stop()
+    """
+
+    def __init__(self, client, shortnames, kinds=('live', 'webrtc'), concurrency=16, min_interval=2, max_interval=60,
+                 backoff=2, active_states=ACTIVE_STATES, clock=None, sleep=None):
+        self.client = client
+        self.shortnames = list(shortnames)
+        self.kinds = [kind for kind in _KINDS if kind.name in kinds]
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.active_states = frozenset(state.lower() for state in active_states)
+        self._clock = clock or time.monotonic
+        self._stop = threading.Event()
+        self._sleep = sleep or self._stop.wait
+        self._slots = {}
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """
+        Call listener(SlotEvent) on every state change (the first poll of a slot is reported too)
+
+            :param listener: callable
+        """
+        self._listeners.append(listener)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def states(self):
+        """
+        Current state per (kind, shortname, slot_id)
+        """
+        return {key: slot.state for key, slot in self._slots.items()}
+
+    def discover(self):
+        """
+        Refresh slot list of all shortnames, new slots are due immediately, removed slots are dropped
+        """
+        pairs = [(kind, shortname) for kind in self.kinds for shortname in self.shortnames]
+        now = self._clock()
+        found = set()
+        for result in self.client.map(lambda kind, shortname: kind.list_slots(self.client, shortname), pairs,
+                                      concurrency=self.concurrency):
+            kind, shortname = result.item
+            if result.error is not None or result.result.status_code != 200:
+                self.client.logger.warning(f'Unable to list {kind.name} slots of [{shortname}]')
+                found.update(key for key in self._slots if key[:2] == (kind.name, shortname))
+                continue
+            for item in _slots_of(result.result.json()):
+                slot_id = next((item[key] for key in _SLOT_ID_KEYS if item.get(key) is not None), None)
+                if slot_id is None:
+                    continue
+                key = (kind.name, shortname, slot_id)
+                found.add(key)
+                if key not in self._slots:
+                    self._slots[key] = _Slot(kind, shortname, slot_id, self.min_interval, now)
+        for key in set(self._slots).difference(found):
+            del self._slots[key]
+
+    def _is_active(self, state):
+        return state is not None and state.lower() in self.active_states
+
+    def poll(self):
+        """
+        Fetch status of all due slots concurrently, adapt their intervals and publish changes.
+        Returns list of SlotEvent.
+        """
+        now = self._clock()
+        due = [slot for slot in self._slots.values() if slot.due <= now]
+        events = []
+        for result in self.client.map(lambda slot: slot.kind.get_status(self.client, slot.shortname, slot.slot_id),
+                                      due, concurrency=self.concurrency):
+            slot = result.item
+            if result.error is not None or result.result.status_code != 200:
+                slot.interval = min(slot.interval * self.backoff, self.max_interval)
+            else:
+                status = result.result.json()
+                state = slot_state(status)
+                if state != slot.state:
+                    events.append(SlotEvent(slot.kind.name, slot.shortname, slot.slot_id, slot.state, state, status,
+                                            time.time()))
+                    slot.state = state
+                    slot.interval = self.min_interval
+                elif self._is_active(state):
+                    slot.interval = self.min_interval
+                else:
+                    slot.interval = min(slot.interval * self.backoff, self.max_interval)
+            slot.due = self._clock() + slot.interval
+        for event in events:
+            for listener in self._listeners:
+                listener(event)
+        return events
+
+    def next_due(self):
+        """
+        Seconds until the next slot is due
+        """
+        if not self._slots:
+            return self.max_interval
+        return max(0, min(slot.due for slot in self._slots.values()) - self._clock())
+
+    def run(self, rediscover_interval=300):
+        """
+        Poll until stop() is called, slots are rediscovered every ``rediscover_interval`` seconds
+
+            :param rediscover_interval: (optional) Default 300. seconds. float
+        """
+        self._stop.clear()
+        discovered = None
+        while not self._stop.is_set():
+            if discovered is None or self._clock() - discovered >= rediscover_interval:
+                self.discover()
+                discovered = self._clock()
+            self.poll()
+            delay = min(self.next_due(), max(0, discovered + rediscover_interval - self._clock()))
+            if delay:
+                self._sleep(delay)
+
+    def stop(self):
+        self._stop.set()
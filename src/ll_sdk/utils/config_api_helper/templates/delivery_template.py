@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-__all__ = ['_deliver_service_instance_template', '_protocol_set_template']
+__all__ = ['_deliver_service_instance_template', '_protocol_set_template',
+           '_new_deliver_service_instance', '_new_protocol_set']
+
+from ll_sdk.utils.config_api_helper.templates.factory import compile_template
 
 _deliver_service_instance_template = {
     "body": {"serviceKey": {"name": "delivery"},
@@ -18,3 +21,6 @@ _deliver_service_instance_template = {
 _protocol_set_template = {"publishedProtocol": "https",
                           "sourceProtocol": "https",
                           "options": []}
+
+_new_deliver_service_instance = compile_template(_deliver_service_instance_template)
+_new_protocol_set = compile_template(_protocol_set_template)
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-__all__ = ['_http_cs_service_instance_template', '_protocol_set_temp', '_child_temp', '_service_root_instance_template']
+__all__ = ['_http_cs_service_instance_template', '_protocol_set_temp', '_child_temp', '_service_root_instance_template',
+           '_new_http_cs_service_instance', '_new_protocol_set', '_new_child']
+
+from ll_sdk.utils.config_api_helper.templates.factory import compile_template
 
 _http_cs_service_instance_template = {
     "body": {
@@ -53,3 +56,7 @@ _service_root_instance_template = {
     "serviceKey": {
         "name": "httpcs"
     }}
+
+_new_http_cs_service_instance = compile_template(_http_cs_service_instance_template)
+_new_protocol_set = compile_template(_protocol_set_temp)
+_new_child = compile_template(_child_temp)
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-__all__ = ['_ssl_cert_template']
+__all__ = ['_ssl_cert_template', '_new_ssl_cert']
+
+from ll_sdk.utils.config_api_helper.templates.factory import compile_template
 
 _ssl_cert_template = {
     "body": {
@@ -16,3 +18,5 @@ _ssl_cert_template = {
         }
     ]
 }
+
+_new_ssl_cert = compile_template(_ssl_cert_template)
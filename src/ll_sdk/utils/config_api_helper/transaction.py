@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['BatchTransaction', 'TransactionResult', 'TransactionException']
+__docformat__ = 'restructuredtext'
+
+import threading
+from collections import namedtuple
+import requests
+from ll_sdk.utils.config_api_helper.provisioning import service_of
+from ll_sdk.utils.config_api_helper.version_cache import versions_of
+
+
+class TransactionResult(namedtuple('TransactionResult', ['committed', 'versions', 'updates', 'rollbacks'])):
+    """
+    Outcome of batch transaction
+
+        :param committed: True if every update succeeded. bool
+        :param versions: recorded pre-change version per uuid. dict
+        :param updates: BulkResult of update call per input item, result is None for updates not started
+                        after failure. list
+        :param rollbacks: BulkResult of rollback call per rolled back uuid, empty if committed. list
+    """
+    __slots__ = ()
+
+    @property
+    def rolled_back(self):
+        """
+        True if all applied updates were rolled back
+        """
+        return not self.committed and all(result.error is None and 200 <= result.result.status_code < 300
+                                          for result in self.rollbacks)
+
+
+def _is_success(response):
+    return 200 <= response.status_code < 300
+
+
+# Transport errors raised before the request reached config-api
+_NOT_SENT_ERRORS = (requests.exceptions.ConnectTimeout, requests.exceptions.SSLError, requests.exceptions.ProxyError,
+                    requests.exceptions.InvalidURL, requests.exceptions.MissingSchema,
+                    requests.exceptions.InvalidSchema, requests.exceptions.InvalidHeader)
+
+
+def _maybe_applied(error):
+    """
+    True if update failed with error after the request was sent (e.g. read timeout, dropped connection),
+    so the change might have been applied. SDK errors (open circuit, rate limiter) happen before sending.
+    """
+    return isinstance(error, requests.exceptions.RequestException) and not isinstance(error, _NOT_SENT_ERRORS)
+
+
+class BatchTransaction(object):
+    """
+    All-or-nothing batch update of delivery and httpcs service instances.
+
+    The latest version of every instance is recorded with list_*_service_instance_version before anything
+    is changed, then updates run concurrently. When an update fails, no further updates are started
+    (with ``fail_fast``) and every instance which was (or may have been, e.g. after timeout) updated is
+    returned to the recorded version with parallel rollback_*_service_instance calls, so recovery takes
+    about as long as the slowest rollback, not the sum of them.
+
+        :param client: ConfigApiClient
+        :param shortname: str
+        :param concurrency: (optional) Default 8. int
+        :param rollback_concurrency: (optional) Default ``concurrency``. int
+        :param fail_fast: (optional) Default True. Don't start updates after the first failure. bool
+    """
+
+    def __init__(self, client, shortname, concurrency=8, rollback_concurrency=None, fail_fast=True):
+        self.client = client
+        self.shortname = shortname
+        self.concurrency = concurrency
+        self.rollback_concurrency = rollback_concurrency or concurrency
+        self.fail_fast = fail_fast
+
+    def _latest_version(self, uuid, service):
+        response = getattr(self.client, f'list_{service}_service_instance_version')(self.shortname, uuid)
+        if response.status_code != 200:
+            raise TransactionException(uuid, response.status_code, response.text)
+        versions = versions_of(response.json())
+        if not versions:
+            raise TransactionException(uuid, response.status_code, 'No versions to roll back to')
+        return max(versions)
+
+    def record(self, updates):
+        """
+        Latest version of every updated instance, dict uuid -> version.
+        Raises TransactionException if any version can't be recorded.
+
+            :param updates: list of (uuid, config)
+        """
+        versions = {}
+        for result in self.client.map(self._latest_version, [(uuid, service_of(config)) for uuid, config in updates],
+                                      concurrency=self.concurrency):
+            if result.error is not None:
+                raise result.error
+            versions[result.item[0]] = result.result
+        return versions
+
+    def rollback(self, versions, services):
+        """
+        Roll instances back to recorded versions concurrently, returns list of BulkResult
+
+            :param versions: dict uuid -> version
+            :param services: dict uuid -> delivery or httpcs
+        """
+        items = [(uuid, version) for uuid, version in versions.items()]
+        return list(self.client.map(
+            lambda uuid, version: getattr(self.client, f'rollback_{services[uuid]}_service_instance')(uuid, version),
+            items, concurrency=self.rollback_concurrency, ordered=False))
+
+    def apply(self, updates):
+        """
+        Record versions, apply updates concurrently and roll back on failure
+
+            :param updates: iterable of (uuid, config)
+        """
+        updates = list(updates)
+        uuids = [uuid for uuid, _ in updates]
+        if len(set(uuids)) != len(uuids):
+            raise ValueError('Every service instance can be updated only once in transaction')
+        versions = self.record(updates)
+        services = {uuid: service_of(config) for uuid, config in updates}
+        failed = threading.Event()
+
+        def update(uuid, config):
+            if failed.is_set():
+                return None
+            try:
+                response = getattr(self.client, f'update_{services[uuid]}_service_instance')(uuid, config)
+            except BaseException:
+                # SDK errors derive from BaseException, client.map() reports the re-raised error
+                if self.fail_fast:
+                    failed.set()
+                raise
+            if not _is_success(response) and self.fail_fast:
+                failed.set()
+            return response
+
+        results = list(self.client.map(update, updates, concurrency=self.concurrency))
+        if all(result.error is None and result.result is not None and _is_success(result.result)
+               for result in results):
+            return TransactionResult(True, versions, results, [])
+
+        # Rejected updates and updates which failed before sending changed nothing,
+        # updates which failed after sending might have been applied
+        applied = [result.item[0] for result in results
+                   if _maybe_applied(result.error) or (result.result is not None and _is_success(result.result))]
+        self.client.logger.warning(f'Batch update failed, rolling back {len(applied)} service instance(s)')
+        rollbacks = self.rollback({uuid: versions[uuid] for uuid in applied}, services)
+        return TransactionResult(False, versions, results, rollbacks)
+
+
+class TransactionException(BaseException):
+    __module__ = 'builtins'
+
+    def __init__(self, uuid, status_code, body):
+        self.uuid = uuid
+        self.status_code = status_code
+        self.body = body
+        super(TransactionException, self).__init__(
+            f'Unable to record version of service instance [{uuid}] with [{status_code}]: {body}')
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['OfflineValidator', 'ValidationResult']
+__docformat__ = 'restructuredtext'
+
+import threading
+from collections import Counter, namedtuple
+from ll_sdk.utils.client_helper.bulk import bulk_map
+from ll_sdk.utils.config_api_helper.provisioning import service_of
+
+PROTOCOLS = frozenset(['http', 'https'])
+
+_TYPES = {
+    'int': int, 'integer': int, 'long': int, 'number': (int, float), 'float': (int, float), 'double': (int, float),
+    'string': str, 'str': str, 'boolean': bool, 'bool': bool,
+}
+
+
+class ValidationResult(namedtuple('ValidationResult', ['valid', 'errors', 'remote'])):
+    """
+    Outcome of validation
+
+        :param valid: bool
+        :param errors: list of error messages (or remote validate response payload)
+        :param remote: True if result comes from remote validate_*_service_instance. bool
+    """
+    __slots__ = ()
+
+
+class _OptionRule(namedtuple('_OptionRule', ['name', 'min_params', 'max_params', 'types', 'protocols',
+                                             'repeatable'])):
+    """
+    Compiled configuration option: parameter count bounds, per-position types (None if unknown),
+    allowed published protocols (None if any) and whether option may repeat in protocol set (None if unknown)
+    """
+    __slots__ = ()
+
+
+def _first(item, keys):
+    return next((item[key] for key in keys if item.get(key) is not None), None)
+
+
+def _catalog_items(payload):
+    if isinstance(payload, dict):
+        for key in ('configOptions', 'options', 'content', 'items'):
+            if isinstance(payload.get(key), list):
+                return payload[key]
+        return []
+    return payload if isinstance(payload, list) else []
+
+
+def _compile_option(item):
+    parameters = _first(item, ('parameters', 'params', 'parameterDefinitions'))
+    if not isinstance(parameters, list):
+        # Without parameter definitions only the option name can be checked
+        min_params, max_params, types = 0, None, None
+    else:
+        required = [parameter for parameter in parameters if not isinstance(parameter, dict)
+                    or (parameter.get('required', not parameter.get('optional', False)))]
+        variadic = any(isinstance(parameter, dict) and (parameter.get('repeatable') or parameter.get('multiValue'))
+                       for parameter in parameters)
+        min_params = len(required)
+        max_params = None if variadic else len(parameters)
+        types = tuple(_TYPES.get(str(parameter.get('type', '')).lower()) if isinstance(parameter, dict) else None
+                      for parameter in parameters)
+    protocols = _first(item, ('protocols', 'allowedProtocols', 'publishedProtocols'))
+    repeatable = _first(item, ('repeatable', 'allowMultiple', 'multiple'))
+    return _OptionRule(item['name'], min_params, max_params, types,
+                       frozenset(protocol.lower() for protocol in protocols) if protocols else None,
+                       bool(repeatable) if repeatable is not None else None)
+
+
+def _matches_type(value, expected):
+    """
+    Parameters are often sent as strings, e.g. ['3600'] for integer parameter
+    """
+    if expected is None:
+        return True
+    if expected is bool:
+        return isinstance(value, bool) or str(value).lower() in ('true', 'false')
+    if expected is str:
+        return isinstance(value, str)
+    if isinstance(value, bool):
+        return False
+    if expected is int and isinstance(value, float):
+        return value.is_integer()
+    try:
+        (int if expected is int else float)(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _services(config):
+    body = config.get('body', {})
+    if 'httpcsSvcInstance' in body:
+        return [('root', body['httpcsSvcInstance'])] + [
+            (f'child[{idx}]', child) for idx, child in enumerate(body.get('childHttpcsSvcInstances', []))]
+    return [('root', body)]
+
+
+# Responses of list_configuration_options which are cached, others are retried
+_DEFINITIVE_STATUSES = (200, 404)
+
+
+class OfflineValidator(object):
+    """
+    Local validator of delivery and httpcs service instances against configuration option catalogs.
+
+    Catalog of every (shortname, serviceProfileName) is fetched with list_configuration_options once and
+    compiled into rules: known option names, parameter counts and types, allowed protocols and repetition.
+    Protocol sets are checked for supported and unique protocol pairs. Configs with local errors are reported
+    invalid without network round trip. Configs passing local checks are valid, except when the catalog is not
+    available, in which case remote validate_*_service_instance decides (if ``remote_fallback``).
+
+        :param client: ConfigApiClient
+        :param remote_fallback: (optional) Default True. bool
+    """
+
+    def __init__(self, client, remote_fallback=True):
+        self.client = client
+        self.remote_fallback = remote_fallback
+        self._catalogs = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def rules(self, shortname, profile_name):
+        """
+        Compiled rules of profile: dict option name -> rule, None if catalog is not available.
+        Catalogs and their definitive absence (empty catalog, 404) are cached, failed requests are not.
+        """
+        key = (shortname, profile_name)
+        with self._lock:
+            if key in self._catalogs:
+                return self._catalogs[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._catalogs:
+                response = self.client.list_configuration_options(shortname, profile_name)
+                if response.status_code not in _DEFINITIVE_STATUSES:
+                    # Transient failure (5xx, 429, ...), ask again next time
+                    return None
+                rules = None
+                if response.status_code == 200:
+                    items = [item for item in _catalog_items(response.json()) if isinstance(item, dict)
+                             and item.get('name')]
+                    rules = {item['name']: _compile_option(item) for item in items} if items else None
+                with self._lock:
+                    self._catalogs[key] = rules
+            return self._catalogs[key]
+
+    def check(self, config):
+        """
+        Local checks only, returns (errors, decided). decided is False when catalog is not available.
+
+            :param config: DeliverServiceInstanceObj, HttpCsServiceInstanceObj or dict
+        """
+        errors = []
+        services = _services(config)
+        root = services[0][1]
+        shortname = (config.get('accounts') or [{}])[0].get('shortname')
+        profile_name = root.get('serviceProfileName')
+        if not shortname:
+            errors.append('accounts[0].shortname is empty')
+        if not profile_name:
+            errors.append('serviceProfileName is empty')
+        if not root.get('publishedHostname'):
+            errors.append('publishedHostname is empty')
+        if not root.get('sourceHostname'):
+            errors.append('sourceHostname is empty')
+        rules = self.rules(shortname, profile_name) if shortname and profile_name else None
+
+        for scope, service in services:
+            protocol_sets = service.get('protocolSets', [])
+            if scope == 'root' and not protocol_sets:
+                errors.append(f'{scope}: no protocol sets')
+            pairs = Counter((protocol_set.get('publishedProtocol'), protocol_set.get('sourceProtocol'))
+                            for protocol_set in protocol_sets)
+            for (published, source), count in pairs.items():
+                if published not in PROTOCOLS or source not in PROTOCOLS:
+                    errors.append(f'{scope}: unsupported protocol set {published}/{source}')
+                if count > 1:
+                    errors.append(f'{scope}: duplicated protocol set {published}/{source}')
+            if rules is None:
+                continue
+            for protocol_set in protocol_sets:
+                where = f"{scope} {protocol_set.get('publishedProtocol')}/{protocol_set.get('sourceProtocol')}"
+                names = Counter(option.get('name') for option in protocol_set.get('options', []))
+                for option in protocol_set.get('options', []):
+                    errors.extend(f'{where}: {error}' for error in
+                                  self._check_option(option, rules, protocol_set, names))
+        return list(dict.fromkeys(errors)), rules is not None
+
+    @staticmethod
+    def _check_option(option, rules, protocol_set, names):
+        name = option.get('name')
+        rule = rules.get(name)
+        if rule is None:
+            return [f'unknown option [{name}]']
+        errors = []
+        parameters = option.get('parameters') or []
+        if len(parameters) < rule.min_params or (rule.max_params is not None and len(parameters) > rule.max_params):
+            expected = rule.min_params if rule.max_params == rule.min_params else \
+                f'{rule.min_params}..{"" if rule.max_params is None else rule.max_params}'
+            errors.append(f'option [{name}] expects {expected} parameters, got {len(parameters)}')
+        for position, (value, expected) in enumerate(zip(parameters, rule.types or ())):
+            if not _matches_type(value, expected):
+                errors.append(f'option [{name}] parameter {position} has invalid value [{value}]')
+        if rule.protocols is not None and str(protocol_set.get('publishedProtocol')).lower() not in rule.protocols:
+            errors.append(f'option [{name}] is not allowed for {protocol_set.get("publishedProtocol")}')
+        if rule.repeatable is False and names[name] > 1:
+            errors.append(f'option [{name}] is used {names[name]} times')
+        return errors
+
+    def validate(self, config):
+        """
+        Validate config locally, falling back to remote validate only when local checks cannot decide
+
+            :param config: DeliverServiceInstanceObj, HttpCsServiceInstanceObj or dict
+        """
+        errors, decided = self.check(config)
+        if errors:
+            return ValidationResult(False, errors, False)
+        if decided or not self.remote_fallback:
+            return ValidationResult(True, [], False)
+        response = getattr(self.client, f'validate_{service_of(config)}_service_instance')(config)
+        payload = response.json() if response.content else {}
+        success = response.status_code == 200 and isinstance(payload, dict) and \
+            (payload.get('Success') or payload.get('success')) is True
+        return ValidationResult(success, [] if success else payload, True)
+
+    def validate_many(self, configs, concurrency=8):
+        """
+        Validate configs concurrently, returns list of ValidationResult in input order
+
+            :param configs: iterable of configs
+            :param concurrency: (optional) Default 8. int
+        """
+        results = []
+        for result in bulk_map(self.validate, ((config,) for config in configs), concurrency=concurrency):
+            if result.error is not None:
+                raise result.error
+            results.append(result.result)
+        return results
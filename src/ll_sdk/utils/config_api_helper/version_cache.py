@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['VersionCache', 'versions_of']
+__docformat__ = 'restructuredtext'
+
+import json
+import sqlite3
+import hashlib
+import zlib
+from collections import namedtuple
+from ll_sdk.config_api import ConfigApiBaseException
+
+_Family = namedtuple('_Family', ['name', 'list_versions', 'get_version'])
+
+_FAMILIES = {family.name: family for family in (
+    _Family('delivery',
+            lambda client, shortname, uuid: client.list_delivery_service_instance_version(shortname, uuid),
+            lambda client, shortname, uuid, version: client.get_delivery_service_instance_version(shortname, uuid,
+                                                                                                 version)),
+    _Family('httpcs',
+            lambda client, shortname, uuid: client.list_httpcs_service_instance_version(shortname, uuid),
+            lambda client, shortname, uuid, version: client.get_httpcs_service_instance_version(shortname, uuid,
+                                                                                               version)),
+    _Family('certificate',
+            lambda client, shortname, uuid: client.list_customer_certificate_versions(uuid),
+            lambda client, shortname, uuid, version: client.get_customer_certificate_versions(uuid, version)),
+)}
+
+_VERSION_KEYS = ('versionNumber', 'version', 'revisionNumber')
+
+
+def _version_number(item):
+    """
+    Version number of item of list_*_version response
+    """
+    if isinstance(item, int):
+        return item
+    if isinstance(item, dict):
+        revision = item.get('revision')
+        for source in (item, revision if isinstance(revision, dict) else {}):
+            for key in _VERSION_KEYS:
+                if source.get(key) is not None:
+                    return int(source[key])
+    return None
+
+
+def versions_of(payload):
+    """
+    Version numbers of list_*_version payload (list or paged dict of versions)
+
+        :param payload: json
+    """
+    if isinstance(payload, dict):
+        for key in ('versions', 'content', 'items'):
+            if isinstance(payload.get(key), list):
+                payload = payload[key]
+                break
+    if not isinstance(payload, list):
+        return []
+    return [number for number in (_version_number(item) for item in payload) if number is not None]
+
+
+class VersionCache(object):
+    """
+    Persistent cache of historical versions of delivery/httpcs service instances and customer certificates.
+
+    Historical versions never change, so once fetched with get_*_version they are served from SQLite.
+    Payloads are stored content-addressed (by SHA-256 of canonical JSON), identical versions share one blob,
+    optionally compressed with zlib. history() lists versions and fetches only versions missing in the cache.
+
+        :param client: ConfigApiClient
+        :param path: (optional) Default ':memory:'. SQLite database file. str
+        :param compress: (optional) Default False. Store payloads zlib compressed. bool
+        :param concurrency: (optional) Default 8. Parallel get_*_version calls in history(). int
+    """
+    FAMILIES = tuple(_FAMILIES)
+
+    def __init__(self, client, path=':memory:', compress=False, concurrency=8):
+        self.client = client
+        self.compress = compress
+        self.concurrency = concurrency
+        self._db = sqlite3.connect(path)
+        self._db.execute('CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, compressed INTEGER, data BLOB)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS versions (family TEXT, uuid TEXT, version INTEGER, digest TEXT, '
+                         'PRIMARY KEY (family, uuid, version))')
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    # --- Storage ---
+    def _put(self, family, uuid, version, payload):
+        data = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if self.compress:
+            data = zlib.compress(data)
+        self._db.execute('INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)', (digest, int(self.compress), data))
+        self._db.execute('INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?)', (family, uuid, version, digest))
+
+    def _get(self, family, uuid, version):
+        row = self._db.execute('SELECT blobs.compressed, blobs.data FROM versions JOIN blobs USING (digest) '
+                               'WHERE family = ? AND uuid = ? AND version = ?', (family, uuid, version)).fetchone()
+        if row is None:
+            return None
+        compressed, data = row
+        return json.loads(zlib.decompress(data) if compressed else data)
+
+    def cached_versions(self, family, uuid):
+        """
+        Sorted version numbers available in cache
+
+            :param family: delivery, httpcs or certificate
+            :param uuid: str
+        """
+        rows = self._db.execute('SELECT version FROM versions WHERE family = ? AND uuid = ? ORDER BY version',
+                                (family, uuid))
+        return [version for version, in rows]
+
+    def _fetch(self, family, shortname, uuid, version):
+        response = _FAMILIES[family].get_version(self.client, shortname, uuid, version)
+        if response.status_code != 200:
+            raise ConfigApiBaseException(response.status_code, response.text)
+        return response.json()
+
+    # --- Reads ---
+    def get_version(self, family, uuid, version, shortname=None):
+        """
+        Historical version payload, fetched from config-api only on cache miss
+
+            :param family: delivery, httpcs or certificate
+            :param uuid: str
+            :param version: int
+            :param shortname: (optional) required for delivery and httpcs. str
+        """
+        payload = self._get(family, uuid, int(version))
+        if payload is None:
+            payload = self._fetch(family, shortname, uuid, version)
+            self._put(family, uuid, int(version), payload)
+            self._db.commit()
+        return payload
+
+    def history(self, family, uuid, shortname=None, since=None):
+        """
+        Full version history as dict version -> payload. Versions are listed with list_*_version(s) and only
+        versions missing in the cache are fetched, concurrently.
+
+            :param family: delivery, httpcs or certificate
+            :param uuid: str
+            :param shortname: (optional) required for delivery and httpcs. str
+            :param since: (optional) return only versions newer than this one. int
+        """
+        response = _FAMILIES[family].list_versions(self.client, shortname, uuid)
+        if response.status_code != 200:
+            raise ConfigApiBaseException(response.status_code, response.text)
+        listed = sorted(set(versions_of(response.json())))
+        if since is not None:
+            listed = [version for version in listed if version > since]
+        missing = sorted(set(listed).difference(self.cached_versions(family, uuid)))
+        for result in self.client.map(lambda version: self._fetch(family, shortname, uuid, version), missing,
+                                      concurrency=self.concurrency):
+            if result.error is not None:
+                self._db.commit()
+                raise result.error
+            self._put(family, uuid, result.item, result.result)
+        self._db.commit()
+        return {version: self._get(family, uuid, version) for version in listed}
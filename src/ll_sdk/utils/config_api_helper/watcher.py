@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__all__ = ['ServiceInstanceWatcher', 'ChangeEvent']
+__docformat__ = 'restructuredtext'
+
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+from ll_sdk.utils.config_api_helper.mirror import object_uuid, object_version
+
+
+class ChangeEvent(namedtuple('ChangeEvent', ['kind', 'service', 'shortname', 'uuid', 'version', 'config', 'time'])):
+    """
+    Change of service instance
+
+        :param kind: added, modified or deleted. str
+        :param service: delivery or httpcs. str
+        :param shortname: str
+        :param uuid: str
+        :param version: version from revision data (digest of listed object if it has none). str
+        :param config: full service instance, None when deleted
+        :param time: epoch seconds of detection. float
+    """
+    __slots__ = ()
+
+    ADDED = 'added'
+    MODIFIED = 'modified'
+    DELETED = 'deleted'
+
+
+class _Target(object):
+    __slots__ = ('service', 'shortname', 'etag', 'versions')
+
+    def __init__(self, service, shortname):
+        self.service = service
+        self.shortname = shortname
+        self.etag = None
+        self.versions = None
+
+
+def _listed_version(item):
+    version = object_version(item)
+    if version is None:
+        version = hashlib.sha1(json.dumps(item, sort_keys=True).encode('utf-8')).hexdigest()
+    return version
+
+
+class ServiceInstanceWatcher(object):
+    """
+    Change watcher of delivery and httpcs service instances of many shortnames.
+
+    Every poll lists service instances of all shortnames concurrently. Listings are requested with
+    If-None-Match, so unchanged listings cost a bodyless 304 when config-api returns ETag. Changed listings
+    are compared with known revisions per uuid and only added/modified service instances are fetched
+    in full (concurrently). The first poll records the baseline without events unless ``emit_initial``.
+
+    Events are delivered to subscribers (callback) or with ``async for event in watcher.stream()``.
+
+        :param client: ConfigApiClient
+        :param shortnames: list of str
+        :param services: (optional) Default delivery and httpcs
+        :param interval: (optional) Default 5. seconds between polls. float
+        :param concurrency: (optional) Default 16. int
+        :param page_size: (optional) Default 1000. Listing page size, bigger listings are paginated. int
+        :param emit_initial: (optional) Default False. Report existing instances as added on the first poll. bool
+    """
+
+    def __init__(self, client, shortnames, services=('delivery', 'httpcs'), interval=5, concurrency=16,
+                 page_size=1000, emit_initial=False):
+        self.client = client
+        self.interval = interval
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.emit_initial = emit_initial
+        self._targets = [_Target(service, shortname) for shortname in shortnames for service in services]
+        self._listeners = []
+        self._stop = threading.Event()
+
+    def subscribe(self, listener):
+        """
+        Call listener(ChangeEvent) on every change
+
+            :param listener: callable
+        """
+        self._listeners.append(listener)
+
+    def _list(self, target):
+        """
+        Listing of target, None when it is not modified since the last poll
+        """
+        list_method = getattr(self.client, f'list_{target.service}_service_instances')
+        headers = {'If-None-Match': target.etag} if target.etag else None
+        response = list_method(target.shortname, size=self.page_size, page=1, headers=headers)
+        if response.status_code == 304:
+            return None
+        items = self.client.page_items(response)
+        if len(items) < self.page_size:
+            target.etag = response.headers.get('ETag')
+        else:
+            # ETag covers the first page only, changes on other pages would be answered with 304
+            target.etag = None
+            items = list(getattr(self.client, f'iter_{target.service}_service_instances')(
+                target.shortname, size=self.page_size))
+        return items
+
+    def _changes(self, target, items):
+        versions = {object_uuid(item): _listed_version(item) for item in items}
+        known, target.versions = target.versions, versions
+        if known is None and not self.emit_initial:
+            return []
+        known = known or {}
+        changes = [(ChangeEvent.ADDED if uuid not in known else ChangeEvent.MODIFIED, uuid, version)
+                   for uuid, version in versions.items() if known.get(uuid) != version]
+        changes.extend((ChangeEvent.DELETED, uuid, version) for uuid, version in known.items() if uuid not in versions)
+        return changes
+
+    def poll(self):
+        """
+        Single polling round, returns list of ChangeEvent (also delivered to subscribers)
+        """
+        changes = []
+        for result in self.client.map(self._list, self._targets, concurrency=self.concurrency):
+            if result.error is not None:
+                target = result.item
+                self.client.logger.warning(f'Unable to list {target.service} instances of [{target.shortname}]: '
+                                           f'{result.error!r}')
+            elif result.result is not None:
+                changes.extend((result.item,) + change for change in self._changes(result.item, result.result))
+
+        fetch = [(target, kind, uuid) for target, kind, uuid, _ in changes if kind != ChangeEvent.DELETED]
+        configs = {}
+        for result in self.client.map(
+                lambda target, kind, uuid: getattr(self.client, f'get_{target.service}_service_instance')(uuid),
+                fetch, concurrency=self.concurrency):
+            target, kind, uuid = result.item
+            if result.error is None and result.result.status_code == 200:
+                configs[(target.service, uuid)] = result.result.json()
+                continue
+            # Forget version and ETag, so the change is reported again by the next poll
+            if kind == ChangeEvent.ADDED:
+                del target.versions[uuid]
+            else:
+                target.versions[uuid] = None
+            target.etag = None
+
+        now = time.time()
+        events = []
+        for target, kind, uuid, version in changes:
+            config = configs.get((target.service, uuid))
+            if kind != ChangeEvent.DELETED and config is None:
+                continue
+            events.append(ChangeEvent(kind, target.service, target.shortname, uuid, version, config, now))
+        for event in events:
+            for listener in self._listeners:
+                listener(event)
+        return events
+
+    def run(self):
+        """
+        Poll every ``interval`` seconds until stop() is called
+        """
+        self._stop.clear()
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll()
+            self._stop.wait(max(0, self.interval - (time.monotonic() - started)))
+
+    async def stream(self):
+        """
+        Asynchronous iterator of ChangeEvent, polls run in default executor until stop() is called
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        self._stop.clear()
+        while not self._stop.is_set():
+            started = time.monotonic()
+            for event in await loop.run_in_executor(None, self.poll):
+                yield event
+            await asyncio.sleep(max(0, self.interval - (time.monotonic() - started)))
+
+    def stop(self):
+        self._stop.set()